@@ -24,10 +24,14 @@ import uvicorn
 # Import your modules
 from src.core.config import settings, setup_logging_level, get_uvicorn_config
 from src.data.database import db_manager
+from src.data.executor import db_executor
+from src.data.write_behind import write_behind
+from src.data.menu_store import menu_store
+from src.data.order_store import order_service
 from src.ai.ai_engine import ai_engine
-from src.data.peewee_models import create_tables
-from src.api.routes import contacts, messages, feedback, health
-from src.routers import menu
+from src.data.peewee_models import create_tables, close_db_connection
+from src.api.routes import contacts, messages, feedback, health, account
+from src.routers import menu, orders
 from src.core.exceptions import AppException, ValidationException
 from src.data.schemas import HealthCheck, ErrorResponse
 
@@ -81,7 +85,16 @@ async def lifespan(app: FastAPI):
         create_tables()
         logger.info("✅ Database initialized")
 
-        # AI engine ready
+        if settings.WRITE_BEHIND_ENABLED:
+            write_behind.start()
+
+        if os.getenv("SUPABASE_URL"):
+            menu_store.start()
+            order_service.start()
+            logger.info("🍽️ Menu snapshot refresher and order queue started")
+
+        # AI engine ready; open the OpenRouter connection now instead of on the first request
+        asyncio.create_task(ai_engine.warm_up_connection())
         logger.info("✅ AI engine ready")
 
         # Start prewarming in background
@@ -100,6 +113,13 @@ async def lifespan(app: FastAPI):
         try:
             await ai_engine.cleanup()
             logger.info("✅ AI engine cleaned up")
+            await order_service.stop()
+            await menu_store.stop()
+            await write_behind.drain()
+            logger.info("✅ Pending writes flushed")
+            db_executor.shutdown(on_thread_exit=close_db_connection)
+            close_db_connection()
+            logger.info("✅ Database executor stopped and connections closed")
         except Exception as e:
             logger.error(f"⚠️ Cleanup error: {e}")
 
@@ -132,6 +152,7 @@ app.add_middleware(
     allow_credentials=True,  # Can enable now that you're not using wildcard
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Keyset pagination cursor on list endpoints
 )
 
 if settings.is_production:
@@ -186,10 +207,12 @@ async def general_exception_handler(request: Request, exc: Exception):
 # ------------------------
 # app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(menu.router, prefix="/api/menu", tags=["Menu"])
+app.include_router(orders.router, prefix="/api/orders", tags=["Orders"])
 app.include_router(contacts.router, prefix="/api/contacts", tags=["Contacts"])
 app.include_router(messages.router, prefix="/api/messages", tags=["Messages"])
 app.include_router(feedback.router, prefix="/api/feedback", tags=["Feedback"])
 app.include_router(health.router, prefix="/api/health", tags=["Health"])
+app.include_router(account.router, prefix="/api/account", tags=["Account"])
 
 # ------------------------
 # Root endpoint
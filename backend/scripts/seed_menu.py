@@ -4,19 +4,32 @@
 
 """
 Seed Script for Sip & Sing Menu
-Run: python scripts/seed_menu.py
+Syncs MENU_DATA into Supabase by diffing against the current menu (keyed by item code),
+so the menu stays online while seeding and only changed rows are written.
+
+Run: python scripts/seed_menu.py [--dry-run]
 """
 
+import argparse
 import os
-from supabase import create_client, Client
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Fields compared/written for menu items. `available` is only set on insert so that
+# items staff have marked as sold out stay that way across re-seeds.
+ITEM_FIELDS = ("name", "category", "description", "base_price")
+OPTION_FIELDS = ("price", "sort_order")
+
+
 # --- CONFIGURATION ---
-url = os.getenv("SUPABASE_URL")
-key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-supabase: Client = create_client(url, key)
+def get_client():
+    from supabase import create_client
+
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+    return create_client(url, key)
 # ---------------------
 
 # Menu data structure
@@ -605,53 +618,143 @@ MENU_DATA = [
 ]
 
 
-def seed_menu():
-    """Seed the menu items into Supabase"""
-    print("🌱 Seeding menu items...")
-    
-    # Clear existing menu (optional - comment out if you want to keep existing data)
-    print("🧹 Clearing existing menu...")
+def _desired_item(item_data):
+    return {
+        "code": item_data["code"],
+        "name": item_data["name"],
+        "category": item_data["category"],
+        "description": item_data.get("description", ""),
+        "base_price": item_data["base_price"],
+    }
+
+
+def _desired_options(item_data):
+    return {
+        opt["label"]: {"label": opt["label"], "price": opt["price"], "sort_order": opt.get("sort_order", 0)}
+        for opt in item_data.get("options", [])
+    }
+
+
+def _changed(current, desired, fields):
+    return any(current.get(field) != desired[field] for field in fields)
+
+
+def plan_menu_sync(menu_data, current_items, current_options):
+    """
+    Work out the minimal set of writes to turn the current menu into menu_data.
+
+    current_items / current_options are the rows already in Supabase. Items are matched by code,
+    options by (item code, label). Returns a dict of row lists, one per bulk operation.
+    """
+    items_by_code = {item["code"]: item for item in current_items}
+    options_by_item = {}
+    for option in current_options:
+        options_by_item.setdefault(option["menu_item_id"], {})[option["label"]] = option
+
+    plan = {
+        "insert_items": [],     # new items (with their options, inserted once the items have ids)
+        "update_items": [],     # changed items, including their id
+        "delete_items": [],     # ids of items no longer in the menu
+        "insert_options": [],   # options for existing items
+        "update_options": [],   # changed options, including their id
+        "delete_options": [],   # ids of options no longer in the menu
+    }
+
+    desired_codes = set()
+    for item_data in menu_data:
+        desired = _desired_item(item_data)
+        desired_options = _desired_options(item_data)
+        desired_codes.add(desired["code"])
+        current = items_by_code.get(desired["code"])
+
+        if current is None:
+            plan["insert_items"].append({**desired, "available": True, "options": list(desired_options.values())})
+            continue
+
+        if _changed(current, desired, ITEM_FIELDS):
+            plan["update_items"].append({"id": current["id"], **desired})
+
+        existing_options = options_by_item.get(current["id"], {})
+        for label, option in desired_options.items():
+            existing = existing_options.get(label)
+            if existing is None:
+                plan["insert_options"].append({"menu_item_id": current["id"], **option})
+            elif _changed(existing, option, OPTION_FIELDS):
+                plan["update_options"].append({"id": existing["id"], "menu_item_id": current["id"], **option})
+        plan["delete_options"].extend(
+            existing["id"] for label, existing in existing_options.items() if label not in desired_options
+        )
+
+    for code, current in items_by_code.items():
+        if code not in desired_codes:
+            plan["delete_items"].append(current["id"])
+            plan["delete_options"].extend(option["id"] for option in options_by_item.get(current["id"], {}).values())
+
+    return plan
+
+
+def apply_menu_sync(supabase, plan):
+    """Apply a plan with a handful of bulk calls: additions and updates first, deletions last"""
+    if plan["insert_items"]:
+        new_items = [{k: v for k, v in item.items() if k != "options"} for item in plan["insert_items"]]
+        result = supabase.table("menu_items").insert(new_items).execute()
+        ids_by_code = {row["code"]: row["id"] for row in result.data}
+        for item in plan["insert_items"]:
+            plan["insert_options"].extend(
+                {"menu_item_id": ids_by_code[item["code"]], **option} for option in item["options"]
+            )
+
+    if plan["update_items"]:
+        supabase.table("menu_items").upsert(plan["update_items"], on_conflict="id").execute()
+    if plan["insert_options"]:
+        supabase.table("menu_item_options").insert(plan["insert_options"]).execute()
+    if plan["update_options"]:
+        supabase.table("menu_item_options").upsert(plan["update_options"], on_conflict="id").execute()
+    if plan["delete_options"]:
+        supabase.table("menu_item_options").delete().in_("id", plan["delete_options"]).execute()
+    if plan["delete_items"]:
+        supabase.table("menu_items").delete().in_("id", plan["delete_items"]).execute()
+
+
+def seed_menu(dry_run=False):
+    """Sync the menu items into Supabase"""
+    started = time.perf_counter()
+    print("🌱 Syncing menu items..." + (" (dry run)" if dry_run else ""))
     # NOTE: These tables must exist in your Supabase project!
-    supabase.table("menu_item_options").delete().gte("created_at", "1970-01-01").execute()
-    supabase.table("menu_items").delete().gte("created_at", "1970-01-01").execute()
-    
-    for item_data in MENU_DATA:
-        options = item_data.pop("options", [])
-        
-        # Insert menu item
-        result = supabase.table("menu_items").insert({
-            "code": item_data["code"],
-            "name": item_data["name"],
-            "category": item_data["category"],
-            "description": item_data.get("description", ""),
-            "base_price": item_data["base_price"],
-            "available": True
-        }).execute()
-        
-        # Check if insertion was successful before trying to get the ID
-        if result.data:
-            menu_item_id = result.data[0]["id"]
-            print(f"✅ Added {item_data['code']} - {item_data['name']}")
-            
-            # Insert options if any
-            if options:
-                # Prepare all options for batch insertion (more efficient)
-                options_to_insert = [
-                    {
-                        "menu_item_id": menu_item_id,
-                        "label": opt["label"],
-                        "price": opt["price"],
-                        "sort_order": opt.get("sort_order", 0)
-                    } for opt in options
-                ]
-                
-                supabase.table("menu_item_options").insert(options_to_insert).execute()
-                print(f"   ↳ Added {len(options)} options")
-        else:
-            print(f"❌ Failed to add item: {item_data['code']} - {item_data['name']}")
-    
-    print(f"\n🎉 Successfully seeded {len(MENU_DATA)} menu items!")
+    supabase = get_client()
+
+    current_items = supabase.table("menu_items").select("id, code, " + ", ".join(ITEM_FIELDS)).execute().data
+    current_options = (
+        supabase.table("menu_item_options").select("id, menu_item_id, label, " + ", ".join(OPTION_FIELDS))
+        .execute().data
+    )
+    loaded = time.perf_counter()
+    print(f"📥 Loaded {len(current_items)} items and {len(current_options)} options in {loaded - started:.2f}s")
+
+    plan = plan_menu_sync(MENU_DATA, current_items, current_options)
+    new_option_count = len(plan["insert_options"]) + sum(len(item["options"]) for item in plan["insert_items"])
+    print(f"   ➕ {len(plan['insert_items'])} new items, {new_option_count} new options")
+    print(f"   ✏️  {len(plan['update_items'])} changed items, {len(plan['update_options'])} changed options")
+    print(f"   ➖ {len(plan['delete_items'])} removed items, {len(plan['delete_options'])} removed options")
+    for item in plan["insert_items"]:
+        print(f"      + {item['code']} - {item['name']}")
+    for item in plan["update_items"]:
+        print(f"      ~ {item['code']} - {item['name']}")
+
+    if dry_run:
+        print(f"\n🔎 Dry run complete in {time.perf_counter() - started:.2f}s, nothing written")
+        return plan
+
+    apply_menu_sync(supabase, plan)
+    finished = time.perf_counter()
+    print(f"\n🎉 Menu synced ({len(MENU_DATA)} items) in {finished - started:.2f}s "
+          f"(writes {finished - loaded:.2f}s)")
+    print("ℹ️  Running backends pick this up on their next refresh, or immediately via POST /api/menu/refresh")
+    return plan
 
 
 if __name__ == "__main__":
-    seed_menu()
+    parser = argparse.ArgumentParser(description="Sync the Sip & Sing menu into Supabase")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would change without writing")
+    args = parser.parse_args()
+    seed_menu(dry_run=args.dry_run)
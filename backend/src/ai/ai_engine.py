@@ -9,17 +9,113 @@ Added Backend Identification support
 """
 
 import hashlib
+import importlib.util
+import inspect
 import json
 import httpx
 from enum import Enum
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, AsyncIterator
 from datetime import datetime
 import asyncio
+import re
+import time
 
 # Update imports
 from ..core.config import settings
 from ..data.schemas import MessageType, ContextType, SentimentType
 from ..data.crud import MessageCRUD, CacheCRUD
+from ..data.executor import run_in_db_executor
+from ..data.memory_cache import ai_response_l1, ai_response_key
+from ..data.cache_payload import unpack_payload
+from .model_health import ModelHealthTracker
+from .sanitizer import message_sanitizer
+from .json_extract import TRUNCATED, extract_json
+from .prompt_budget import OutputLengthTracker, estimate_tokens, fit_message
+
+
+# Top-level string fields surfaced to streaming clients as soon as their closing quote arrives
+STREAMED_PARTIAL_FIELDS = ("transformed_message", "explanation", "subtext")
+
+
+# Markers OpenRouter and upstream providers use when a prompt is rejected by moderation
+CONTENT_FILTER_MARKERS = ("moderation", "flagged", "content_filter", "content filter", "safety", "policy")
+
+
+class ModelFailure(Enum):
+    """Why a model call produced no usable response; drives the retry policy"""
+    RATE_LIMITED = "rate_limited"   # 429: skip this model, sanitizing won't help
+    FILTERED = "filtered"           # content filter rejection: retry with the sanitized prompt
+    SERVER_ERROR = "server_error"   # 5xx
+    TIMEOUT = "timeout"             # network timeout or connection failure
+    PARSE_ERROR = "parse_error"     # 200 without usable content
+    REJECTED = "rejected"           # other 4xx
+    UNAVAILABLE = "unavailable"     # breaker open or no API key; nothing was sent
+
+
+class ModelResult:
+    """Outcome of one _try_model call: the completion payload, or the failure reason"""
+    def __init__(self, data: Optional[dict] = None, failure: Optional[ModelFailure] = None):
+        self.data = data
+        self.failure = failure
+
+    def __bool__(self) -> bool:
+        return self.data is not None
+
+    @property
+    def retry_sanitized(self) -> bool:
+        """Only content-filter rejections are worth another attempt with the sanitized prompt"""
+        return self.failure == ModelFailure.FILTERED
+
+
+class ModelStreamError(Exception):
+    """A streamed completion failed; carries whether any tokens were already sent and why it failed"""
+    def __init__(self, message: str, tokens_sent: bool = False, failure: Optional[ModelFailure] = None):
+        super().__init__(message)
+        self.tokens_sent = tokens_sent
+        self.failure = failure
+
+
+def _is_content_filter(body: str) -> bool:
+    lowered = (body or "").lower()
+    return any(marker in lowered for marker in CONTENT_FILTER_MARKERS)
+
+
+def _classify_status(status_code: int, body: str) -> ModelFailure:
+    """Map a non-200 upstream status (and its error body) to a failure reason"""
+    if status_code == 429:
+        return ModelFailure.RATE_LIMITED
+    if status_code >= 500:
+        return ModelFailure.SERVER_ERROR
+    if status_code == 403 or _is_content_filter(body):
+        return ModelFailure.FILTERED
+    return ModelFailure.REJECTED
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    """
+    One pooled client for all model calls: HTTP/2 when h2 is installed, pool sized for
+    MAX_BACKGROUND_TASKS requests each racing AI_RACE_WIDTH models, and separate phase timeouts
+    so a stalled read fails on its own without a slow connect eating the whole budget.
+    """
+    http2 = settings.AI_HTTP2 and importlib.util.find_spec("h2") is not None
+    if settings.AI_HTTP2 and not http2:
+        print("⚠️ h2 not installed, OpenRouter client falling back to HTTP/1.1")
+
+    max_connections = settings.MAX_BACKGROUND_TASKS * max(1, settings.AI_RACE_WIDTH)
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=httpx.Timeout(
+            connect=settings.AI_CONNECT_TIMEOUT,
+            read=settings.API_TIMEOUT,
+            write=settings.AI_WRITE_TIMEOUT,
+            pool=settings.AI_POOL_TIMEOUT
+        ),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=settings.MAX_BACKGROUND_TASKS,
+            keepalive_expiry=settings.AI_KEEPALIVE_EXPIRY
+        )
+    )
 
 
 class AnalysisDepth(Enum):
@@ -62,6 +158,14 @@ class AIResponse:
         self.relationship_dynamics = relationship_dynamics or []
         self.alternatives = alternatives or []
         self.backend_id = backend_id or settings.BACKEND_ID
+        # Rebuilt from a completion cut off mid-object: served, never cached
+        self.truncated = False
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AIResponse":
+        """Rebuild a response from to_dict() output (e.g. a cached payload)"""
+        fields = inspect.signature(cls.__init__).parameters
+        return cls(**{key: value for key, value in data.items() if key in fields and key != "self"})
 
     def to_dict(self):
         """Convert to dictionary for API responses"""
@@ -98,8 +202,17 @@ class AIEngine:
             {"id": "qwen/qwen-2.5-72b-instruct:free", "name": "Qwen 2.5 72B", "note": "Massive 72B model - excellent for analysis"}
         ]
         
-        # HTTP client for better async performance
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # Shared HTTP client tuned for OpenRouter (see _build_http_client)
+        self.client = _build_http_client()
+        
+        # Per-model circuit breaker and latency tracking
+        self.model_health = ModelHealthTracker()
+
+        # Observed completion lengths, used to size max_tokens per message type and depth
+        self.output_lengths = OutputLengthTracker.from_settings()
+        
+        # Single-flight table: message hash -> upstream task shared by identical requests
+        self._inflight: Dict[str, asyncio.Task] = {}
         
         # Prewarming flag for lazy initialization
         self._prewarmed = False
@@ -113,38 +226,28 @@ class AIEngine:
     
     def _sanitize_message(self, message: str) -> str:
         """Lightly sanitize message to avoid content filtering while preserving meaning"""
-        replacements = {
-            "bitch": "[expletive]",
-            "vagina": "[inappropriate reference]",
-            "deport": "remove from country",
-            "fuck": "[strong expletive]",
-            "shit": "[expletive]",
-            "asshole": "[insult]",
-            "bastard": "[insult]",
-            "kill": "harm",
-            "die": "pass away"
-        }
-        
-        sanitized = message
-        for original, replacement in replacements.items():
-            sanitized = sanitized.replace(original, replacement)
-        
-        return sanitized
+        return message_sanitizer.sanitize(message)
     
     def _create_message_hash(self, message: str, context: str, message_type: str, analysis_depth: str) -> str:
         """Create hash for caching with analysis depth"""
         content = f"{message}:{context}:{message_type}:{analysis_depth}"
         return hashlib.md5(content.encode()).hexdigest()
     
-    async def _try_model(self, model_info: dict, system_prompt: str, user_prompt: str, max_tokens: int = 1000) -> Optional[dict]:
-        """Try a specific model and return the result"""
+    async def _try_model(self, model_info: dict, system_prompt: str, user_prompt: str, max_tokens: int = 1000) -> ModelResult:
+        """Try a specific model; the result carries the completion or a structured failure reason"""
         model_id = model_info["id"]
-        print(f"🤖 Trying model: {model_info['name']} ({model_id}) on backend {settings.BACKEND_ID}")
         api_key = settings.OPENROUTER_API_KEY
         
         if not api_key:
             print("❌ ERROR: No OpenRouter API key found!")
-            return None
+            return ModelResult(failure=ModelFailure.UNAVAILABLE)
+        
+        if not self.model_health.allow_request(model_id):
+            print(f"⏭️ Skipping {model_info['name']}: circuit breaker open")
+            return ModelResult(failure=ModelFailure.UNAVAILABLE)
+        
+        print(f"🤖 Trying model: {model_info['name']} ({model_id}) on backend {settings.BACKEND_ID}")
+        started = time.monotonic()
             
         try:
             response = await self.client.post(
@@ -167,17 +270,57 @@ class AIEngine:
             print(f"📡 Status: {response.status_code}")
             if response.status_code == 200:
                 result = response.json()
-                if "choices" in result and result["choices"]:
-                    return result
-            print(f"❌ Model {model_info['name']} failed: Status {response.status_code}")
+                choices = result.get("choices") or []
+                if choices and choices[0].get("finish_reason") == "content_filter":
+                    # The model ran but moderation withheld the answer
+                    self.model_health.release(model_id)
+                    print(f"🚫 {model_info['name']} output withheld by content filter")
+                    return ModelResult(failure=ModelFailure.FILTERED)
+                if choices:
+                    self.model_health.record_success(model_id, time.monotonic() - started)
+                    return ModelResult(data=result)
+                self.model_health.release(model_id)
+                print(f"❌ Model {model_info['name']} returned no choices")
+                return ModelResult(failure=ModelFailure.PARSE_ERROR)
+            
+            failure = _classify_status(response.status_code, response.text)
+            if failure == ModelFailure.RATE_LIMITED:
+                self.model_health.record_failure(model_id, "rate_limited", trip=True)
+            elif failure == ModelFailure.SERVER_ERROR:
+                self.model_health.record_failure(model_id, f"server_error_{response.status_code}")
+            else:
+                # Prompt-specific rejections say nothing about the model's health
+                self.model_health.release(model_id)
+            
+            print(f"❌ Model {model_info['name']} failed ({failure.value}): Status {response.status_code}")
             print(f"   Error details: {response.text[:300] if response.text else 'No response'}")
-            return None
+            return ModelResult(failure=failure)
+        except asyncio.CancelledError:
+            self.model_health.release(model_id)
+            raise
         except httpx.RequestError as e:
+            self.model_health.record_failure(model_id, f"network_error: {type(e).__name__}")
             print(f"❌ Network error with {model_info['name']}: {str(e)}")
-            return None
+            return ModelResult(failure=ModelFailure.TIMEOUT)
         except Exception as e:
+            self.model_health.release(model_id)
             print(f"❌ Unexpected error with {model_info['name']}: {str(e)}")
-            return None
+            return ModelResult(failure=ModelFailure.PARSE_ERROR)
+
+    async def warm_up_connection(self) -> bool:
+        """Open the pooled TLS (and HTTP/2) connection to OpenRouter ahead of the first model call"""
+        started = time.monotonic()
+        try:
+            response = await self.client.get(
+                f"{settings.OPENROUTER_BASE_URL}/auth/key",
+                headers={"Authorization": f"Bearer {settings.OPENROUTER_API_KEY or ''}"}
+            )
+            print(f"🔌 OpenRouter connection warm ({getattr(response, 'http_version', 'HTTP')}, "
+                  f"{(time.monotonic() - started) * 1000:.0f}ms)")
+            return True
+        except Exception as e:
+            print(f"⚠️ OpenRouter connection warm-up failed: {e}")
+            return False
 
     async def lazy_prewarm(self):
         """Lazy prewarming - warm primary model on first use"""
@@ -284,6 +427,8 @@ Respond with JSON:
                             user_id: str,
                             analysis_depth: str = AnalysisDepth.QUICK.value) -> AIResponse:
         """Process message with multiple model fallbacks and caching"""
+        # Routes may pass the AnalysisDepth enum; prompts, budgets and cache keys use its string value
+        analysis_depth = getattr(analysis_depth, "value", analysis_depth)
         print(f"🎙️ Processing message ({analysis_depth}) on backend {settings.BACKEND_ID}: {message[:50]}...")
         
         # Lazy prewarm on first use
@@ -291,111 +436,461 @@ Respond with JSON:
         
         # Check cache first
         message_hash = self._create_message_hash(message, contact_context, message_type, analysis_depth)
-        cached_response = CacheCRUD.get_cached_response(message_hash, contact_id)
-        
-        if cached_response:
-            print("⚡ Using cached response")
-            return AIResponse(
-                transformed_message=cached_response.response,
-                healing_score=cached_response.healing_score or 5,
-                sentiment=cached_response.sentiment or "neutral",
-                emotional_state=cached_response.emotional_state or "understanding",
-                explanation="Cached response",
-                model_used=cached_response.model,
-                model_id=cached_response.model,
-                analysis_depth=analysis_depth,
-                backend_id=settings.BACKEND_ID
+        cached = await self._get_cached_response(message_hash, contact_id, analysis_depth)
+        if cached:
+            return cached
+
+        # Coalesce identical in-flight requests onto one upstream call
+        upstream = self._inflight.get(message_hash)
+        if upstream is not None:
+            print(f"🔗 Joining in-flight request for {message_hash[:8]}")
+        else:
+            upstream = asyncio.create_task(
+                self._generate_response(message, contact_context, message_type,
+                                        contact_id, user_id, analysis_depth, message_hash),
+                name=f"ai-request:{message_hash[:8]}"
             )
+            self._inflight[message_hash] = upstream
+            upstream.add_done_callback(lambda task: self._forget_inflight(message_hash, task))
+
+        # Shield so a disconnecting caller doesn't cancel the call others are waiting on
+        ai_response = await asyncio.shield(upstream)
+        # Each caller gets its own copy of the shared result
+        return AIResponse.from_dict(ai_response.to_dict())
+
+    def _forget_inflight(self, message_hash: str, task: asyncio.Task):
+        """Drop a finished upstream task from the single-flight table"""
+        if self._inflight.get(message_hash) is task:
+            del self._inflight[message_hash]
+
+    async def _generate_response(self,
+                                 message: str,
+                                 contact_context: str,
+                                 message_type: str,
+                                 contact_id: str,
+                                 user_id: str,
+                                 analysis_depth: str,
+                                 message_hash: str) -> AIResponse:
+        """Call the models, cache the winner, or fall back - the shared upstream work behind process_message"""
+        system_prompt, user_prompts, max_tokens = self._get_prompts(message, contact_context, message_type, analysis_depth)
+
+        # Race the models (sequentially, in parallel or hedged per settings)
+        ai_response = await self._race_models(
+            self.model_health.ordered_models(self.models), system_prompt, user_prompts, max_tokens, message_type, analysis_depth
+        )
+
+        if ai_response:
+            await self._cache_ai_response(ai_response, message_hash, contact_id, user_id, contact_context)
+            return ai_response
 
-        # Prepare prompts based on message type and analysis depth
+        # Fallback responses
+        print("💥 All models failed, using intelligent fallback")
+        return self._get_fallback_response(message, message_type, analysis_depth)
+
+    def _build_prompts(self, message: str, contact_context: str, message_type: str,
+                       analysis_depth: str) -> Tuple[str, List[str]]:
         if message_type == MessageType.TRANSFORM.value:
-            system_prompt, user_prompts = self._get_transform_prompts(message, contact_context)
-            max_tokens = 800
-        else:
-            if analysis_depth == AnalysisDepth.DEEP.value:
-                system_prompt, user_prompts = self._get_deep_analysis_prompts(message, contact_context)
-                max_tokens = 1500  # More tokens for deep analysis
-            else:
-                system_prompt, user_prompts = self._get_quick_analysis_prompts(message, contact_context)
-                max_tokens = 1000
+            return self._get_transform_prompts(message, contact_context)
+        if analysis_depth == AnalysisDepth.DEEP.value:
+            return self._get_deep_analysis_prompts(message, contact_context)
+        return self._get_quick_analysis_prompts(message, contact_context)
+
+    def _get_prompts(self, message: str, contact_context: str, message_type: str,
+                     analysis_depth: str) -> Tuple[str, List[str], int]:
+        """
+        Prepare prompts within AI_MAX_PROMPT_TOKENS (an oversized message is trimmed to fit) and
+        pick max_tokens from observed completion lengths for this message type and depth
+        """
+        system_prompt, user_prompts = self._build_prompts(message, contact_context, message_type, analysis_depth)
+        prompt_tokens = estimate_tokens(system_prompt) + max(estimate_tokens(prompt) for prompt in user_prompts)
+
+        if prompt_tokens > settings.AI_MAX_PROMPT_TOKENS:
+            overhead = prompt_tokens - estimate_tokens(message)
+            trimmed = fit_message(message, max(1, settings.AI_MAX_PROMPT_TOKENS - overhead))
+            print(f"✂️ Message trimmed from {len(message)} to {len(trimmed)} chars to fit the prompt budget")
+            system_prompt, user_prompts = self._build_prompts(trimmed, contact_context, message_type, analysis_depth)
+
+        max_tokens = self.output_lengths.max_tokens(message_type, analysis_depth)
+        return system_prompt, user_prompts, max_tokens
+
+    def _record_output_length(self, message_type: str, analysis_depth: str, ai_text: str,
+                              usage: Optional[dict] = None, finish_reason: Optional[str] = None):
+        completion_tokens = (usage or {}).get("completion_tokens") or estimate_tokens(ai_text)
+        self.output_lengths.record(message_type, analysis_depth, completion_tokens, truncated=finish_reason == "length")
+
+    async def _get_cached_response(self, message_hash: str, contact_id: str, analysis_depth: str) -> Optional[AIResponse]:
+        """Look up a cached response and rebuild it as an AIResponse"""
+        # Hot entries come straight from memory; only L1 misses go to SQLite on the DB executor
+        cached_response = ai_response_l1.get(ai_response_key(message_hash, contact_id))
+        if cached_response is None:
+            cached_response = await run_in_db_executor(
+                CacheCRUD.get_cached_response, message_hash, contact_id, check_memory=False
+            )
+        if not cached_response:
+            return None
 
-        # Try each model
-        used_model_id = None
-        used_model_name = None
-        
-        for model_info in self.models:
-            for user_prompt in user_prompts:
-                try:
-                    result = await self._try_model(model_info, system_prompt, user_prompt, max_tokens)
-                    if result:
-                        ai_text = result["choices"][0]["message"]["content"]
-                        print(f"✅ Got response from {model_info['name']}: {ai_text[:50]}...")
-                        used_model_id = model_info["id"]
-                        used_model_name = model_info["name"]
-                        
-                        try:
-                            # Extract JSON from response
-                            start = ai_text.find('{')
-                            end = ai_text.rfind('}') + 1
-                            if start >= 0 and end > start:
-                                ai_data = json.loads(ai_text[start:end])
-                            else:
-                                ai_data = {"explanation": "Could not parse AI response"}
-                        except json.JSONDecodeError:
-                            print(f"⚠️ Failed to parse JSON from {model_info['name']}")
-                            continue
-                        
-                        # Create AI response object with backend identification
-                        ai_response = AIResponse(
-                            transformed_message=ai_data.get("transformed_message", ""),
-                            healing_score=int(ai_data.get("healing_score", 5)),
-                            sentiment=ai_data.get("sentiment", "neutral"),
-                            emotional_state=ai_data.get("emotional_state", "understanding"),
-                            explanation=ai_data.get("explanation", "Providing support"),
-                            subtext=ai_data.get("subtext", ""),
-                            needs=ai_data.get("needs", []),
-                            warnings=ai_data.get("warnings", []),
-                            model_used=used_model_name,
-                            model_id=used_model_id,
-                            analysis_depth=analysis_depth,
-                            suggested_responses=ai_data.get("suggested_responses", []),
-                            communication_patterns=ai_data.get("communication_patterns", []),
-                            relationship_dynamics=ai_data.get("relationship_dynamics", []),
-                            alternatives=ai_data.get("alternatives", []),
-                            backend_id=settings.BACKEND_ID
-                        )
-                        
-                        # For transform responses, ensure we have the main message
-                        if message_type == MessageType.TRANSFORM.value and not ai_response.transformed_message:
-                            alternatives = ai_data.get("alternatives", [])
-                            if alternatives:
-                                ai_response.transformed_message = alternatives[0]
-                        
-                        # Cache the response
-                        try:
-                            CacheCRUD.cache_response(
-                                contact_id=contact_id,
-                                user_id=user_id,
-                                message_hash=message_hash,
-                                context=contact_context,
-                                response=ai_response.transformed_message or ai_response.explanation,
-                                model=used_model_name,
-                                healing_score=ai_response.healing_score,
-                                sentiment=SentimentType(ai_response.sentiment) if ai_response.sentiment in [s.value for s in SentimentType] else None,
-                                emotional_state=ai_response.emotional_state
-                            )
-                        except Exception as cache_error:
-                            print(f"⚠️ Failed to cache response: {cache_error}")
-                        
+        print("⚡ Using cached response")
+        payload = unpack_payload(cached_response.payload)
+        if payload:
+            ai_response = AIResponse.from_dict(payload)
+            ai_response.analysis_depth = analysis_depth
+            ai_response.backend_id = settings.BACKEND_ID
+            return ai_response
+
+        # Rows cached before full payloads were stored only have the summary fields
+        return AIResponse(
+            transformed_message=cached_response.response,
+            healing_score=cached_response.healing_score or 5,
+            sentiment=cached_response.sentiment or "neutral",
+            emotional_state=cached_response.emotional_state or "understanding",
+            explanation="Cached response",
+            model_used=cached_response.model,
+            model_id=cached_response.model,
+            analysis_depth=analysis_depth,
+            backend_id=settings.BACKEND_ID
+        )
+
+    async def _cache_ai_response(self, ai_response: AIResponse, message_hash: str,
+                                 contact_id: str, user_id: str, contact_context: str):
+        """Store a model response in the cache (failures are logged, not raised)"""
+        if ai_response.truncated:
+            print("✂️ Not caching a response repaired from truncated output")
+            return
+        try:
+            await run_in_db_executor(
+                CacheCRUD.cache_response,
+                contact_id=contact_id,
+                user_id=user_id,
+                message_hash=message_hash,
+                context=contact_context,
+                response=ai_response.transformed_message or ai_response.explanation,
+                model=ai_response.model_used,
+                healing_score=ai_response.healing_score,
+                sentiment=SentimentType(ai_response.sentiment) if ai_response.sentiment in [s.value for s in SentimentType] else None,
+                emotional_state=ai_response.emotional_state,
+                payload=ai_response.to_dict()
+            )
+        except Exception as cache_error:
+            print(f"⚠️ Failed to cache response: {cache_error}")
+
+    def _parse_ai_text(self, ai_text: str, message_type: str, analysis_depth: str) -> Optional[Dict[str, Any]]:
+        """Extract the response object from model output (see json_extract); None if it can't be recovered"""
+        return extract_json(ai_text, message_type, analysis_depth)
+
+    def _build_ai_response(self, ai_data: Dict[str, Any], model_info: dict,
+                           message_type: str, analysis_depth: str) -> AIResponse:
+        """Create AI response object with backend identification from parsed model JSON"""
+        ai_response = AIResponse(
+            transformed_message=ai_data.get("transformed_message", ""),
+            healing_score=int(ai_data.get("healing_score", 5)),
+            sentiment=ai_data.get("sentiment", "neutral"),
+            emotional_state=ai_data.get("emotional_state", "understanding"),
+            explanation=ai_data.get("explanation", "Providing support"),
+            subtext=ai_data.get("subtext", ""),
+            needs=ai_data.get("needs", []),
+            warnings=ai_data.get("warnings", []),
+            model_used=model_info["name"],
+            model_id=model_info["id"],
+            analysis_depth=analysis_depth,
+            suggested_responses=ai_data.get("suggested_responses", []),
+            communication_patterns=ai_data.get("communication_patterns", []),
+            relationship_dynamics=ai_data.get("relationship_dynamics", []),
+            alternatives=ai_data.get("alternatives", []),
+            backend_id=settings.BACKEND_ID
+        )
+        ai_response.truncated = bool(ai_data.get(TRUNCATED))
+
+        # For transform responses, ensure we have the main message
+        if message_type == MessageType.TRANSFORM.value and not ai_response.transformed_message:
+            alternatives = ai_data.get("alternatives", [])
+            if alternatives:
+                ai_response.transformed_message = alternatives[0]
+
+        return ai_response
+
+    async def _try_model_prompts(self,
+                                 model_info: dict,
+                                 system_prompt: str,
+                                 user_prompts: List[str],
+                                 max_tokens: int,
+                                 message_type: str,
+                                 analysis_depth: str) -> Optional[AIResponse]:
+        """
+        Try the raw prompt against one model, falling back to the sanitized variant only when the
+        failure was a content-filter rejection (rate limits, 5xx, timeouts move on to the next model)
+        """
+        for user_prompt in user_prompts:
+            try:
+                result = await self._try_model(model_info, system_prompt, user_prompt, max_tokens)
+                if not result:
+                    if result.retry_sanitized:
+                        continue
+                    print(f"⏭️ {model_info['name']}: {result.failure.value}, moving to next model")
+                    return None
+
+                choice = result.data["choices"][0]
+                ai_text = choice["message"]["content"]
+                print(f"✅ Got response from {model_info['name']}: {ai_text[:50]}...")
+                self._record_output_length(message_type, analysis_depth, ai_text,
+                                           result.data.get("usage"), choice.get("finish_reason"))
+
+                ai_data = self._parse_ai_text(ai_text, message_type, analysis_depth)
+                if ai_data is None:
+                    print(f"⚠️ Failed to parse JSON from {model_info['name']}")
+                    return None
+
+                ai_response = self._build_ai_response(ai_data, model_info, message_type, analysis_depth)
+                return ai_response
+
+            except Exception as e:
+                print(f"⚠️ Error with {model_info['name']}: {str(e)}")
+                return None
+
+        return None
+
+    async def _race_models(self,
+                           models: List[dict],
+                           system_prompt: str,
+                           user_prompts: List[str],
+                           max_tokens: int,
+                           message_type: str,
+                           analysis_depth: str) -> Optional[AIResponse]:
+        """
+        Run the model fallback chain according to AI_RACE_MODE and return the first valid response.
+
+        sequential: one model at a time, in order (original behaviour)
+        parallel:   the top AI_RACE_WIDTH models at once
+        hedged:     start the next model after AI_HEDGE_DELAY seconds without an answer,
+                    up to AI_RACE_WIDTH models in flight
+
+        A failed model is replaced by the next one immediately. Losers are cancelled.
+        """
+        mode = settings.AI_RACE_MODE
+        width = 1 if mode == "sequential" else max(1, settings.AI_RACE_WIDTH)
+        initial = width if mode == "parallel" else 1
+
+        queue = list(models)
+        pending = set()
+
+        def launch_next() -> bool:
+            if not queue:
+                return False
+            model_info = queue.pop(0)
+            pending.add(asyncio.create_task(
+                self._try_model_prompts(model_info, system_prompt, user_prompts,
+                                        max_tokens, message_type, analysis_depth),
+                name=f"ai-model:{model_info['id']}"
+            ))
+            return True
+
+        try:
+            for _ in range(initial):
+                launch_next()
+
+            while pending:
+                hedge = mode == "hedged" and queue and len(pending) < width
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=settings.AI_HEDGE_DELAY if hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    ai_response = task.result()
+                    if ai_response:
+                        if pending:
+                            print(f"🏁 {ai_response.model_used} won the race, cancelling {len(pending)} slower model(s)")
                         return ai_response
-                        
-                except Exception as e:
-                    print(f"⚠️ Error with {model_info['name']}: {str(e)}")
+
+                if not done:
+                    print(f"⏱️ No answer after {settings.AI_HEDGE_DELAY}s, hedging to next model")
+                    launch_next()
+                else:
+                    # Replace every failed model so the in-flight count stays up
+                    for _ in done:
+                        if len(pending) < width:
+                            launch_next()
+
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _stream_model(self, model_info: dict, system_prompt: str, user_prompt: str,
+                            max_tokens: int = 1000, outcome: Optional[dict] = None) -> AsyncIterator[str]:
+        """
+        Stream a completion from one model, yielding content deltas; raises ModelStreamError on failure.
+        The last finish_reason and usage seen are stored in outcome when given.
+        """
+        outcome = {} if outcome is None else outcome
+        model_id = model_info["id"]
+        api_key = settings.OPENROUTER_API_KEY
+
+        if not api_key:
+            raise ModelStreamError("No OpenRouter API key configured", failure=ModelFailure.UNAVAILABLE)
+
+        if not self.model_health.allow_request(model_id):
+            raise ModelStreamError(f"{model_info['name']} skipped: circuit breaker open", failure=ModelFailure.UNAVAILABLE)
+
+        print(f"🌊 Streaming model: {model_info['name']} ({model_id}) on backend {settings.BACKEND_ID}")
+        started = time.monotonic()
+        tokens_sent = False
+        finished = False
+
+        try:
+            async with self.client.stream(
+                "POST",
+                f"{settings.OPENROUTER_BASE_URL}/chat/completions",
+                headers={
+                    "Authorization": f"Bearer {api_key}",
+                    "Content-Type": "application/json"
+                },
+                json={
+                    "model": model_id,
+                    "messages": [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    "max_tokens": max_tokens,
+                    "temperature": settings.TEMPERATURE,
+                    "stream": True
+                }
+            ) as response:
+                print(f"📡 Stream status: {response.status_code}")
+                if response.status_code != 200:
+                    body = (await response.aread()).decode("utf-8", errors="replace")
+                    failure = _classify_status(response.status_code, body)
+                    if failure == ModelFailure.RATE_LIMITED:
+                        self.model_health.record_failure(model_id, "rate_limited", trip=True)
+                    elif failure == ModelFailure.SERVER_ERROR:
+                        self.model_health.record_failure(model_id, f"server_error_{response.status_code}")
+                    else:
+                        self.model_health.release(model_id)
+                    finished = True
+                    raise ModelStreamError(f"{model_info['name']} failed ({failure.value}): Status {response.status_code}",
+                                           failure=failure)
+
+                async for line in response.aiter_lines():
+                    # OpenRouter interleaves ": keep-alive" comments with "data: {...}" events
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    try:
+                        chunk = json.loads(data)
+                    except json.JSONDecodeError:
+                        continue
+                    if chunk.get("error"):
+                        if _is_content_filter(json.dumps(chunk["error"])):
+                            failure = ModelFailure.FILTERED
+                            self.model_health.release(model_id)
+                        else:
+                            failure = ModelFailure.SERVER_ERROR
+                            self.model_health.record_failure(model_id, "stream_error")
+                        finished = True
+                        raise ModelStreamError(f"{model_info['name']} stream error: {chunk['error']}", tokens_sent, failure)
+                    if chunk.get("usage"):
+                        outcome["usage"] = chunk["usage"]
+                    choices = chunk.get("choices") or []
+                    if choices and choices[0].get("finish_reason"):
+                        outcome["finish_reason"] = choices[0]["finish_reason"]
+                    if choices and choices[0].get("finish_reason") == "content_filter":
+                        self.model_health.release(model_id)
+                        finished = True
+                        raise ModelStreamError(f"{model_info['name']} output withheld by content filter",
+                                               tokens_sent, ModelFailure.FILTERED)
+                    delta = choices[0].get("delta", {}).get("content") if choices else None
+                    if delta:
+                        tokens_sent = True
+                        yield delta
+
+            self.model_health.record_success(model_id, time.monotonic() - started)
+            finished = True
+        except httpx.RequestError as e:
+            self.model_health.record_failure(model_id, f"network_error: {type(e).__name__}")
+            finished = True
+            raise ModelStreamError(f"Network error with {model_info['name']}: {e}", tokens_sent, ModelFailure.TIMEOUT)
+        finally:
+            if not finished:
+                # Cancelled or abandoned by the consumer
+                self.model_health.release(model_id)
+
+    def _extract_closed_fields(self, partial_text: str, already_sent: set) -> Dict[str, str]:
+        """Pull top-level string fields whose closing quote has arrived out of partial model JSON"""
+        found = {}
+        for field in STREAMED_PARTIAL_FIELDS:
+            if field in already_sent:
+                continue
+            match = re.search(rf'"{field}"\s*:\s*"((?:[^"\\]|\\.)*)"', partial_text)
+            if match:
+                try:
+                    found[field] = json.loads(f'"{match.group(1)}"')
+                except json.JSONDecodeError:
                     continue
+        return found
+
+    async def stream_message(self,
+                             message: str,
+                             contact_context: str,
+                             message_type: str,
+                             contact_id: str,
+                             user_id: str,
+                             analysis_depth: str = AnalysisDepth.QUICK.value) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Streaming variant of process_message yielding (event, data) pairs:
+
+        token:   {"delta": "..."} raw model output as it arrives
+        partial: {"field": value} a top-level string field once it has closed
+        retry:   {"model": "...", "reason": "..."} the current model failed mid-stream, output restarts
+        result:  the final AIResponse.to_dict()
+        """
+        analysis_depth = getattr(analysis_depth, "value", analysis_depth)
+        print(f"🎙️ Streaming message ({analysis_depth}) on backend {settings.BACKEND_ID}: {message[:50]}...")
 
-        # Fallback responses
-        print("💥 All models failed, using intelligent fallback")
-        return self._get_fallback_response(message, message_type, analysis_depth)
+        message_hash = self._create_message_hash(message, contact_context, message_type, analysis_depth)
+        cached = await self._get_cached_response(message_hash, contact_id, analysis_depth)
+        if cached:
+            yield "result", cached.to_dict()
+            return
+
+        system_prompt, user_prompts, max_tokens = self._get_prompts(message, contact_context, message_type, analysis_depth)
+
+        for model_info in self.model_health.ordered_models(self.models):
+            for user_prompt in user_prompts:
+                ai_text = ""
+                sent_fields = set()
+                outcome = {}
+                try:
+                    async for delta in self._stream_model(model_info, system_prompt, user_prompt, max_tokens, outcome):
+                        ai_text += delta
+                        yield "token", {"delta": delta}
+                        for field, value in self._extract_closed_fields(ai_text, sent_fields).items():
+                            sent_fields.add(field)
+                            yield "partial", {field: value}
+                except ModelStreamError as e:
+                    print(f"❌ {e}")
+                    if e.tokens_sent:
+                        yield "retry", {"model": model_info["name"], "reason": str(e)}
+                    if e.failure == ModelFailure.FILTERED:
+                        continue  # Sanitized prompt may get past the filter
+                    break
+
+                self._record_output_length(message_type, analysis_depth, ai_text,
+                                           outcome.get("usage"), outcome.get("finish_reason"))
+                ai_data = self._parse_ai_text(ai_text, message_type, analysis_depth)
+                if ai_data is None:
+                    print(f"⚠️ Failed to parse streamed JSON from {model_info['name']}")
+                    yield "retry", {"model": model_info["name"], "reason": "unparseable response"}
+                    break
+
+                ai_response = self._build_ai_response(ai_data, model_info, message_type, analysis_depth)
+                await self._cache_ai_response(ai_response, message_hash, contact_id, user_id, contact_context)
+                yield "result", ai_response.to_dict()
+                return
+
+        print("💥 All streaming models failed, using intelligent fallback")
+        yield "result", self._get_fallback_response(message, message_type, analysis_depth).to_dict()
 
     def _get_fallback_response(self, message: str, message_type: str, analysis_depth: str) -> AIResponse:
         """Provide intelligent fallback responses with depth consideration"""
@@ -0,0 +1,195 @@
+"""
+JSON Extraction
+Tolerant parsing of model output: strips markdown fences, scans for balanced objects,
+repairs trailing commas and truncated endings, and validates against the schema for the
+message type so a usable response isn't thrown away for a formatting slip.
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_FENCE = re.compile(r"```(?:json|JSON)?\s*\n?(.*?)(?:```|$)", re.DOTALL)
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_DANGLING_KEY = re.compile(r',?\s*"[^"]*"\s*:?\s*$')
+_SCORE = re.compile(r"-?\d+(?:\.\d+)?")
+
+LIST_FIELDS = (
+    "suggested_responses", "alternatives", "needs", "warnings",
+    "communication_patterns", "relationship_dynamics",
+)
+STRING_FIELDS = ("transformed_message", "explanation", "subtext", "sentiment", "emotional_state")
+
+# Set on objects rebuilt from output cut off mid-object: usable, but not worth caching
+TRUNCATED = "_truncated"
+
+# Per response kind: at least one of "any_of" must be present and non-empty
+SCHEMAS: Dict[str, Dict[str, Any]] = {
+    "transform": {"any_of": ("transformed_message", "alternatives")},
+    "interpret": {"any_of": ("explanation", "suggested_responses")},
+    "deep": {"any_of": ("explanation", "suggested_responses", "communication_patterns", "relationship_dynamics")},
+}
+
+
+def schema_key(message_type: str, analysis_depth: str) -> str:
+    """Deep analysis uses its own schema; otherwise transform vs interpret"""
+    if message_type == "transform":
+        return "transform"
+    return "deep" if analysis_depth == "deep" else "interpret"
+
+
+def _candidate_texts(text: str) -> Iterator[str]:
+    """Fenced blocks first (models usually put the answer there), then the raw text"""
+    for match in _FENCE.finditer(text):
+        yield match.group(1)
+    yield text
+
+
+def _scan_objects(text: str) -> Iterator[Tuple[str, bool]]:
+    """
+    Yield each top-level {...} span as (span, complete), tracking strings and escapes so braces
+    inside values don't count. An unterminated final object is yielded with complete=False.
+    """
+    depth = 0
+    start = -1
+    in_string = False
+    escaped = False
+    for index, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            if depth:
+                in_string = True
+        elif char == "{":
+            if depth == 0:
+                start = index
+            depth += 1
+        elif char == "}" and depth:
+            depth -= 1
+            if depth == 0:
+                yield text[start:index + 1], True
+    if depth:
+        yield text[start:], False
+
+
+def _close_truncated(span: str) -> str:
+    """Close an object cut off mid-output (e.g. max_tokens): finish the string, drop a dangling key, close brackets"""
+    stack: List[str] = []
+    in_string = False
+    escaped = False
+    for char in span:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+
+    repaired = span.rstrip()
+    if in_string:
+        repaired = (repaired[:-1] if escaped else repaired) + '"'
+    if stack and stack[-1] == "}" and _ends_with_key(repaired):
+        # A key without a value ("key" or "key":) can't be completed; drop it
+        repaired = _DANGLING_KEY.sub("", repaired)
+    repaired = repaired.rstrip().rstrip(",")
+    return repaired + "".join(reversed(stack))
+
+
+def _ends_with_key(text: str) -> bool:
+    """True when the text ends in an object key rather than a value"""
+    stripped = text.rstrip()
+    if stripped.endswith(":"):
+        return True
+    if not stripped.endswith('"'):
+        return False
+    # Walk back to the opening quote, then see what precedes it: "{" or "," means it's a key
+    index = len(stripped) - 2
+    while index >= 0 and not (stripped[index] == '"' and (index == 0 or stripped[index - 1] != "\\")):
+        index -= 1
+    before = stripped[:index].rstrip()
+    return before.endswith("{") or before.endswith(",")
+
+
+def _loads(span: str) -> Optional[Dict[str, Any]]:
+    for attempt in (span, _TRAILING_COMMA.sub(r"\1", span)):
+        try:
+            data = json.loads(attempt)
+        except json.JSONDecodeError:
+            continue
+        return data if isinstance(data, dict) else None
+    return None
+
+
+def _as_list(value: Any) -> List[str]:
+    if value is None or value == "":
+        return []
+    if isinstance(value, str):
+        lines = [line.strip(" -•*\t").strip() for line in value.splitlines()]
+        return [line for line in lines if line]
+    if isinstance(value, (list, tuple)):
+        return [str(item) if not isinstance(item, str) else item for item in value if item not in (None, "")]
+    return [str(value)]
+
+
+def _as_score(value: Any) -> int:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        score = value
+    else:
+        match = _SCORE.search(str(value or ""))
+        score = float(match.group()) if match else 5
+    return max(1, min(10, int(round(score))))
+
+
+def normalize(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerce field types so AIResponse can be built without surprises ("8/10" -> 8, a string -> [string])"""
+    normalized = dict(data)
+    if "healing_score" in normalized:
+        normalized["healing_score"] = _as_score(normalized["healing_score"])
+    for field in LIST_FIELDS:
+        if field in normalized:
+            normalized[field] = _as_list(normalized[field])
+    for field in STRING_FIELDS:
+        value = normalized.get(field)
+        if value is not None and not isinstance(value, str):
+            normalized[field] = json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+    return normalized
+
+
+def is_valid(data: Dict[str, Any], schema: str) -> bool:
+    return any(data.get(field) for field in SCHEMAS[schema]["any_of"])
+
+
+def extract_json(text: str, message_type: str, analysis_depth: str) -> Optional[Dict[str, Any]]:
+    """
+    Best-effort extraction of the response object from model output.
+    Returns the first candidate object that satisfies the schema (flagged with TRUNCATED when it
+    had to be closed), or None when the output is unusable - including plain prose, which is as
+    likely to be a refusal or a cut-off sentence as an answer, so the next model gets a try.
+    """
+    if not text or not text.strip():
+        return None
+    schema = schema_key(message_type, analysis_depth)
+
+    for candidate in _candidate_texts(text):
+        for span, complete in _scan_objects(candidate):
+            data = _loads(span if complete else _close_truncated(span))
+            if data is None:
+                continue
+            data = normalize(data)
+            if is_valid(data, schema):
+                if not complete:
+                    data[TRUNCATED] = True
+                return data
+    return None
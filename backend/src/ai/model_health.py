@@ -0,0 +1,159 @@
+"""
+Model Health Tracking
+Per-model circuit breaker and latency stats for the OpenRouter fallback chain
+Lets the AI engine skip models that are down and try the fastest ones first
+"""
+
+import time
+from collections import deque
+from enum import Enum
+from typing import Optional, Dict, Any, List
+
+from ..core.config import settings
+
+
+class BreakerState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class ModelHealth:
+    """Rolling health stats and breaker state for a single model"""
+
+    def __init__(self, model_id: str):
+        self.model_id = model_id
+        self.state = BreakerState.CLOSED
+        self.outcomes = deque(maxlen=settings.AI_HEALTH_WINDOW)
+        self.latency_ewma: Optional[float] = None
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.probe_in_flight = False
+        self.last_error: Optional[str] = None
+        self.total_requests = 0
+
+    @property
+    def success_rate(self) -> Optional[float]:
+        if not self.outcomes:
+            return None
+        return sum(self.outcomes) / len(self.outcomes)
+
+    def retry_in(self, now: float) -> float:
+        """Seconds until an open breaker lets a probe through"""
+        if self.state != BreakerState.OPEN or self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + settings.AI_BREAKER_COOLDOWN - now)
+
+    def is_available(self, now: float) -> bool:
+        if self.state == BreakerState.CLOSED:
+            return True
+        if self.state == BreakerState.OPEN:
+            return self.retry_in(now) == 0.0
+        return not self.probe_in_flight
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        success_rate = self.success_rate
+        return {
+            "model_id": self.model_id,
+            "state": self.state.value,
+            "available": self.is_available(now),
+            "success_rate": round(success_rate, 3) if success_rate is not None else None,
+            "latency_ewma_ms": round(self.latency_ewma * 1000) if self.latency_ewma is not None else None,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in_seconds": round(self.retry_in(now), 1),
+            "total_requests": self.total_requests,
+            "last_error": self.last_error
+        }
+
+
+class ModelHealthTracker:
+    """Circuit breaker (closed / open / half-open) and latency-based ordering for all models"""
+
+    def __init__(self):
+        self._models: Dict[str, ModelHealth] = {}
+
+    def _get(self, model_id: str) -> ModelHealth:
+        health = self._models.get(model_id)
+        if health is None:
+            health = self._models[model_id] = ModelHealth(model_id)
+        return health
+
+    def allow_request(self, model_id: str) -> bool:
+        """Check the breaker before calling a model; an expired open breaker becomes a half-open probe"""
+        health = self._get(model_id)
+        now = time.monotonic()
+
+        if not health.is_available(now):
+            return False
+
+        if health.state == BreakerState.OPEN:
+            health.state = BreakerState.HALF_OPEN
+            print(f"🔌 Breaker half-open for {model_id}, sending probe")
+        if health.state == BreakerState.HALF_OPEN:
+            health.probe_in_flight = True
+
+        health.total_requests += 1
+        return True
+
+    def record_success(self, model_id: str, latency: float):
+        health = self._get(model_id)
+        health.outcomes.append(1)
+        health.consecutive_failures = 0
+        health.probe_in_flight = False
+        alpha = settings.AI_LATENCY_EWMA_ALPHA
+        if health.latency_ewma is None:
+            health.latency_ewma = latency
+        else:
+            health.latency_ewma = alpha * latency + (1 - alpha) * health.latency_ewma
+
+        if health.state != BreakerState.CLOSED:
+            print(f"✅ Breaker closed for {model_id}")
+        health.state = BreakerState.CLOSED
+        health.opened_at = None
+
+    def record_failure(self, model_id: str, reason: str, trip: bool = False):
+        """
+        Record an upstream failure (rate limit, 5xx, network).
+        trip=True opens the breaker immediately, e.g. on a 429.
+        """
+        health = self._get(model_id)
+        health.outcomes.append(0)
+        health.consecutive_failures += 1
+        health.last_error = reason
+        health.probe_in_flight = False
+
+        if (trip
+                or health.state == BreakerState.HALF_OPEN
+                or health.consecutive_failures >= settings.AI_BREAKER_FAILURE_THRESHOLD):
+            if health.state != BreakerState.OPEN:
+                print(f"🚫 Breaker open for {model_id} ({reason}), skipping for {settings.AI_BREAKER_COOLDOWN:.0f}s")
+            health.state = BreakerState.OPEN
+            health.opened_at = time.monotonic()
+
+    def release(self, model_id: str):
+        """Forget an in-flight request without an outcome (e.g. cancelled race loser)"""
+        self._get(model_id).probe_in_flight = False
+
+    def ordered_models(self, models: List[dict]) -> List[dict]:
+        """
+        Available models ordered by observed latency, penalised by failure rate.
+        Models without samples score 0 so they get tried (and keep their configured order).
+        """
+        now = time.monotonic()
+
+        def score(model_info: dict) -> float:
+            health = self._get(model_info["id"])
+            if health.latency_ewma is None:
+                return 0.0
+            return health.latency_ewma / max(health.success_rate or 0.0, 0.1)
+
+        available = [m for m in models if self._get(m["id"]).is_available(now)]
+        return sorted(available, key=score)
+
+    def snapshot(self, models: List[dict]) -> List[Dict[str, Any]]:
+        """Health of every configured model for monitoring"""
+        now = time.monotonic()
+        return [
+            {"name": model_info["name"], **self._get(model_info["id"]).to_dict(now)}
+            for model_info in models
+        ]
@@ -0,0 +1,108 @@
+"""
+Prompt Budget
+Token estimates for prompts, trimming of oversized messages, and max_tokens picked from the
+observed completion lengths per message type and depth instead of fixed worst-case values.
+"""
+
+import math
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+from ..core.config import settings
+
+# Rough chars-per-token for English chat text; slightly low so estimates err on the high side
+CHARS_PER_TOKEN = 3.5
+ELISION = " […] "
+
+# Starting max_tokens per (message_type, analysis_depth) until enough completions are observed
+DEFAULT_MAX_TOKENS: Dict[Tuple[str, str], int] = {
+    ("transform", "quick"): 800,
+    ("transform", "deep"): 800,
+    ("interpret", "quick"): 1000,
+    ("interpret", "deep"): 1500,
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (no tokenizer dependency); good enough for budgeting"""
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def fit_message(message: str, max_tokens: int) -> str:
+    """
+    Trim a message to roughly max_tokens, keeping its opening and its ending (where the ask or the
+    sting usually is) and cutting on word boundaries
+    """
+    if estimate_tokens(message) <= max_tokens:
+        return message
+    budget = max(0, int(max_tokens * CHARS_PER_TOKEN) - len(ELISION))
+    head_chars = budget * 2 // 3
+    tail_chars = budget - head_chars
+
+    head = message[:head_chars]
+    if " " in head:
+        head = head[:head.rfind(" ")]
+    tail = message[len(message) - tail_chars:] if tail_chars else ""
+    if " " in tail:
+        tail = tail[tail.find(" ") + 1:]
+    return head.rstrip() + ELISION + tail.lstrip()
+
+
+class OutputLengthTracker:
+    """Rolling completion lengths per (message_type, analysis_depth); max_tokens = high percentile + headroom"""
+
+    def __init__(self, window: int, min_samples: int, percentile: float, headroom: float,
+                 floor: int, ceiling: int):
+        self.window = window
+        self.min_samples = min_samples
+        self.percentile = percentile
+        self.headroom = headroom
+        self.floor = floor
+        self.ceiling = ceiling
+        self._samples: Dict[Tuple[str, str], Deque[int]] = {}
+        self.truncated = 0
+
+    @classmethod
+    def from_settings(cls) -> "OutputLengthTracker":
+        return cls(
+            window=settings.AI_OUTPUT_TOKENS_WINDOW,
+            min_samples=settings.AI_OUTPUT_TOKENS_MIN_SAMPLES,
+            percentile=settings.AI_OUTPUT_TOKENS_PERCENTILE,
+            headroom=settings.AI_OUTPUT_TOKENS_HEADROOM,
+            floor=settings.AI_OUTPUT_TOKENS_FLOOR,
+            ceiling=settings.AI_OUTPUT_TOKENS_CEILING,
+        )
+
+    def record(self, message_type: str, analysis_depth: str, completion_tokens: int, truncated: bool = False):
+        """Record one completion; a truncated one counts as needing more than it was given"""
+        samples = self._samples.setdefault((message_type, analysis_depth), deque(maxlen=self.window))
+        if truncated:
+            self.truncated += 1
+            completion_tokens = min(self.ceiling, int(completion_tokens * self.headroom))
+        samples.append(max(0, completion_tokens))
+
+    @staticmethod
+    def _quantile(samples: Deque[int], percentile: float) -> int:
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, math.ceil(percentile * len(ordered)) - 1)
+        return ordered[max(0, index)]
+
+    def max_tokens(self, message_type: str, analysis_depth: str) -> int:
+        default = DEFAULT_MAX_TOKENS.get((message_type, analysis_depth), settings.MAX_TOKENS)
+        samples = self._samples.get((message_type, analysis_depth))
+        if not samples or len(samples) < self.min_samples:
+            return default
+        budget = int(self._quantile(samples, self.percentile) * self.headroom)
+        return max(self.floor, min(self.ceiling, budget))
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            f"{message_type}/{depth}": {
+                "samples": len(samples),
+                "p50": self._quantile(samples, 0.5),
+                "max_tokens": self.max_tokens(message_type, depth),
+            }
+            for (message_type, depth), samples in self._samples.items()
+        }
@@ -0,0 +1,71 @@
+"""
+Message Sanitizer
+Softens words that trip model content filters before a sanitized retry.
+All lexicon entries are compiled once into a single case-insensitive, word-boundary regex.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from ..core.config import settings
+
+
+# Lexicon keys match whole words, case-insensitively. A trailing "*" also matches any word
+# starting with the key (fuck* -> fucking), a leading "*" any word ending with it.
+# Where several entries match the same word, the one listed first wins.
+DEFAULT_LEXICON: Dict[str, str] = {
+    "*fuck*": "[strong expletive]",
+    "shit*": "[expletive]",
+    "bullshit*": "[expletive]",
+    "bitch*": "[expletive]",
+    "asshole*": "[insult]",
+    "bastard*": "[insult]",
+    "vagina*": "[inappropriate reference]",
+    "deportation*": "removal from country",
+    "deports": "removes from country",
+    "deported": "removed from country",
+    "deporting": "removing from country",
+    "deport*": "remove from country",  # Any other form; after the specific ones so they win
+    "kill": "harm",
+    "kills": "harms",
+    "killed": "harmed",
+    "killing": "harming",
+    "die": "pass away",
+    "dies": "passes away",
+    "died": "passed away",
+    "dying": "passing away",
+}
+
+
+def _entry_pattern(key: str) -> str:
+    prefix = r"\w*" if key.startswith("*") else ""
+    suffix = r"\w*" if key.endswith("*") else ""
+    return prefix + re.escape(key.strip("*")) + suffix
+
+
+class MessageSanitizer:
+    """Single-pass replacement of lexicon words, respecting word boundaries ("diet" and "skill" are left alone)"""
+
+    def __init__(self, lexicon: Dict[str, str]):
+        entries = [(key.lower(), replacement) for key, replacement in lexicon.items() if key.strip("*")]
+        self._replacements: List[str] = [replacement for _, replacement in entries]
+        self._pattern: Optional[re.Pattern] = None
+        if entries:
+            alternation = "|".join(f"({_entry_pattern(key)})" for key, _ in entries)
+            self._pattern = re.compile(rf"\b(?:{alternation})\b", re.IGNORECASE)
+
+    @classmethod
+    def from_settings(cls) -> "MessageSanitizer":
+        """Default lexicon with AI_SANITIZER_LEXICON entries added/overriding (empty replacement removes an entry)"""
+        lexicon = {**DEFAULT_LEXICON, **settings.AI_SANITIZER_LEXICON}
+        return cls({key: value for key, value in lexicon.items() if value})
+
+    def sanitize(self, message: str) -> str:
+        if self._pattern is None or not message:
+            return message
+        # lastindex is the capture group of whichever lexicon entry matched
+        return self._pattern.sub(lambda match: self._replacements[match.lastindex - 1], message)
+
+
+# Built once at import; the engine calls it for every sanitized retry
+message_sanitizer = MessageSanitizer.from_settings()
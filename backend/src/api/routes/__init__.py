@@ -3,12 +3,13 @@
 API routes package
 """
 
-from . import auth, contacts, messages, feedback, health
+from . import auth, contacts, messages, feedback, health, account
 
 __all__ = [
     "auth",
     "contacts", 
     "messages",
     "feedback",
-    "health"
+    "health",
+    "account"
 ]
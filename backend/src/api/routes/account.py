@@ -0,0 +1,91 @@
+"""
+Account API routes for The Third Voice AI
+Personal data export and erasure
+"""
+
+from datetime import datetime
+from typing import Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
+from fastapi.responses import StreamingResponse
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+import logging
+
+from ...auth.auth_manager import get_current_user
+from ...data.schemas import UserResponse
+from ...data.database import get_database_manager, DatabaseManager
+from ...data.export import EXPORT_FORMATS
+from ...data.user_purge import purge_jobs
+
+# Setup
+router = APIRouter()
+limiter = Limiter(key_func=get_remote_address)
+logger = logging.getLogger(__name__)
+
+
+@router.get("/export")
+@limiter.limit("5/hour")
+async def export_my_data(
+    request: Request,
+    current_user: UserResponse = Depends(get_current_user),
+    db: DatabaseManager = Depends(get_database_manager),
+    format: str = Query("ndjson", pattern="^(ndjson|zip)$", description="ndjson stream or zip of NDJSON files")
+) -> StreamingResponse:
+    """
+    Download all contacts, messages and feedback of the current user
+
+    Streamed as it is read, so the size of the history doesn't matter.
+    """
+    try:
+        logger.info(f"Data export ({format}) for user: {current_user.email}")
+        stream = await db.export_user_data(current_user.id, format)
+    except Exception as e:
+        logger.error(f"❌ Error starting data export for {current_user.email}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not export data"
+        )
+
+    _, media_type = EXPORT_FORMATS[format]
+    filename = f"third-voice-export-{datetime.now():%Y%m%d}.{format}"
+    return StreamingResponse(
+        stream,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.delete("/", status_code=status.HTTP_202_ACCEPTED)
+@limiter.limit("3/hour")
+async def delete_my_data(
+    request: Request,
+    current_user: UserResponse = Depends(get_current_user),
+    db: DatabaseManager = Depends(get_database_manager)
+) -> Dict[str, Any]:
+    """
+    Erase all contacts, messages, feedback, cached responses and the account itself
+
+    Runs in the background; poll /purge/{job_id} for progress.
+    """
+    logger.info(f"Data erasure requested by user: {current_user.email}")
+    job = db.start_user_purge(current_user.id)
+    return job.to_dict()
+
+
+@router.get("/purge/{job_id}")
+@limiter.limit("60/minute")
+async def get_purge_status(
+    request: Request,
+    job_id: str,
+    current_user: UserResponse = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """
+    Progress of a data erasure started by the current user
+    """
+    job = purge_jobs.get(job_id)
+    if job is None or job.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Erasure job not found"
+        )
+    return job.to_dict()
@@ -3,7 +3,7 @@ Contacts API routes for The Third Voice AI
 CRUD operations for managing conversation contacts
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from typing import List, Optional
@@ -37,22 +37,33 @@ logger = logging.getLogger(__name__)
 @limiter.limit("30/minute")
 async def get_contacts(
     request: Request,
+    response: Response,
     current_user: UserResponse = Depends(get_current_user),
-    db: DatabaseManager = Depends(get_database_manager)
+    db: DatabaseManager = Depends(get_database_manager),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Page size; omit (with no cursor) for all contacts"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page")
 ) -> List[ContactResponse]:
     """
-    Get all contacts for the current user
+    Get contacts for the current user
     
-    Returns list of contacts ordered by most recently updated
+    Without limit/cursor returns every contact. With them, returns one page newest first and
+    sets the X-Next-Cursor header when more contacts follow.
     """
     try:
         logger.info(f"Fetching contacts for user: {current_user.email}")
         
-        contacts = await db.get_user_contacts(current_user.id)
+        if limit is None and cursor is None:
+            contacts = await db.get_user_contacts(current_user.id)
+        else:
+            contacts, next_cursor = await db.get_contacts_page(current_user.id, limit or 50, cursor)
+            if next_cursor:
+                response.headers["X-Next-Cursor"] = next_cursor
         
         logger.info(f"✅ Retrieved {len(contacts)} contacts for {current_user.email}")
         return contacts
         
+    except ValidationException:
+        raise
     except Exception as e:
         logger.error(f"❌ Error fetching contacts for {current_user.email}: {str(e)}")
         raise HTTPException(
@@ -249,10 +260,13 @@ async def get_contact_messages(
     contact_id: str,
     current_user: UserResponse = Depends(get_current_user),
     db: DatabaseManager = Depends(get_database_manager),
-    limit: int = Query(50, ge=1, le=100, description="Maximum number of messages to return")
+    limit: int = Query(50, ge=1, le=100, description="Maximum number of messages to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page, for older messages")
 ):
     """
-    Get conversation history for a specific contact
+    Get conversation history for a specific contact, newest first
+    
+    Pass the returned next_cursor to fetch the next (older) page; it is null on the last page.
     """
     try:
         logger.info(f"Fetching messages for contact {contact_id}, user: {current_user.email}")
@@ -263,17 +277,18 @@ async def get_contact_messages(
             raise ContactNotFoundException(contact_id)
         
         # Get messages
-        messages = await db.get_conversation_history(contact_id, current_user.id, limit)
+        messages, next_cursor = await db.get_conversation_page(contact_id, current_user.id, limit, cursor)
         
         logger.info(f"✅ Retrieved {len(messages)} messages for contact {contact_id}")
         return {
             "contact": contact,
             "messages": messages,
             "total_messages": len(messages),
-            "limit_applied": limit
+            "limit_applied": limit,
+            "next_cursor": next_cursor
         }
         
-    except ContactNotFoundException:
+    except (ContactNotFoundException, ValidationException):
         raise
     except Exception as e:
         logger.error(f"❌ Error fetching messages for contact {contact_id}: {str(e)}")
@@ -332,37 +347,20 @@ async def get_contact_stats(
         if not contact:
             raise ContactNotFoundException(contact_id)
         
-        # Get conversation history
-        messages = await db.get_conversation_history(contact_id, current_user.id, limit=1000)
-        
-        # Calculate stats
-        total_messages = len(messages)
-        transform_messages = len([m for m in messages if m.type.value == "transform"])
-        interpret_messages = len([m for m in messages if m.type.value == "interpret"])
-        
-        healing_scores = [m.healing_score for m in messages if m.healing_score is not None]
-        avg_healing_score = sum(healing_scores) / len(healing_scores) if healing_scores else 0.0
-        
-        # Sentiment breakdown
-        sentiment_counts = {}
-        for message in messages:
-            if message.sentiment:
-                sentiment = message.sentiment.value
-                sentiment_counts[sentiment] = sentiment_counts.get(sentiment, 0) + 1
-        
-        # Recent activity
-        recent_messages = [m for m in messages[:10]]  # Last 10 messages
+        # Counts and averages are aggregated in SQL; only the 10 most recent messages are loaded
+        message_stats = await db.get_contact_stats(contact_id, current_user.id)
+        recent_messages = await db.get_conversation_history(contact_id, current_user.id, limit=10)
         
         stats = {
             "contact": contact,
-            "total_messages": total_messages,
-            "transform_count": transform_messages,
-            "interpret_count": interpret_messages,
-            "avg_healing_score": round(avg_healing_score, 2),
-            "sentiment_breakdown": sentiment_counts,
-            "messages_with_scores": len(healing_scores),
+            "total_messages": message_stats["total_messages"],
+            "transform_count": message_stats["type_breakdown"].get("transform", 0),
+            "interpret_count": message_stats["type_breakdown"].get("interpret", 0),
+            "avg_healing_score": message_stats["avg_healing_score"],
+            "sentiment_breakdown": message_stats["sentiment_breakdown"],
+            "messages_with_scores": message_stats["messages_with_scores"],
             "recent_activity": recent_messages,
-            "last_message_date": messages[0].created_at if messages else None
+            "last_message_date": message_stats["last_message_date"]
         }
         
         logger.info(f"✅ Generated stats for contact {contact_id}")
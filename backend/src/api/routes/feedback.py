@@ -3,10 +3,10 @@ Feedback API routes for The Third Voice AI
 User feedback collection and analytics
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query
 from slowapi import Limiter
 from slowapi.util import get_remote_address
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
 
 from ...auth.auth_manager import get_current_user
@@ -73,28 +73,29 @@ async def submit_feedback(
 @limiter.limit("30/minute")
 async def get_my_feedback(
     request: Request,
+    response: Response,
     current_user: UserResponse = Depends(get_current_user),
-    db: DatabaseManager = Depends(get_database_manager)
+    db: DatabaseManager = Depends(get_database_manager),
+    limit: int = Query(50, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page")
 ) -> List[FeedbackResponse]:
     """
-    Get all feedback submitted by current user
+    Get feedback submitted by current user, newest first
+    
+    Sets the X-Next-Cursor header when older feedback follows.
     """
     try:
         logger.info(f"Fetching feedback history for user: {current_user.email}")
         
-        # For demo users, get from memory
-        if db._is_demo_user(current_user.id):
-            demo_feedback = db._get_demo_user_data(current_user.id, 'feedback')
-            logger.info(f"✅ Retrieved {len(demo_feedback)} feedback entries for demo user")
-            return demo_feedback
-        
-        # For regular users, get from database
-        # This would need to be implemented in your database layer
-        feedback_list = []  # Placeholder - implement actual database query
+        feedback_list, next_cursor = await db.get_feedback_page(current_user.id, limit, cursor)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         
         logger.info(f"✅ Retrieved {len(feedback_list)} feedback entries for {current_user.email}")
         return feedback_list
         
+    except ValidationException:
+        raise
     except Exception as e:
         logger.error(f"❌ Error fetching feedback for {current_user.email}: {str(e)}")
         raise HTTPException(
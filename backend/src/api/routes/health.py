@@ -16,7 +16,10 @@ from datetime import datetime
 from ...data.schemas import HealthCheck
 from ...data.database import get_database_manager, DatabaseManager
 from ...ai.ai_engine import ai_engine
-from ...core.config import settings
+from ...data.memory_cache import ai_response_l1
+from ...data.executor import db_executor
+from ...data.write_behind import write_behind
+from ...core.config import settings, get_database_config
 
 # Setup
 router = APIRouter()
@@ -46,6 +49,10 @@ async def database_health(
             "database_file_exists": os.path.exists(settings.DATABASE_PATH),
             "database_size_bytes": os.path.getsize(settings.DATABASE_PATH) if os.path.exists(settings.DATABASE_PATH) else 0,
             "database_path": settings.DATABASE_PATH,
+            "ai_cache_l1": ai_response_l1.stats(),
+            "db_executor": db_executor.stats(),
+            "write_behind": write_behind.stats(),
+            "sqlite_pragmas": get_database_config()["pragmas"],
             "demo_data_in_memory": {
                 "contacts": len(db._demo_contacts) if hasattr(db, '_demo_contacts') else 0,
                 "messages": len(db._demo_messages) if hasattr(db, '_demo_messages') else 0,
@@ -98,6 +105,12 @@ async def ai_engine_health(request: Request) -> Dict[str, Any]:
                 } for model in ai_engine.models
             ],
             "primary_model": ai_engine.models[0] if ai_engine.models else None,
+            "model_health": ai_engine.model_health.snapshot(ai_engine.models),
+            "current_model_order": [
+                model["id"] for model in ai_engine.model_health.ordered_models(ai_engine.models)
+            ],
+            "race_mode": settings.AI_RACE_MODE,
+            "output_tokens": ai_engine.output_lengths.stats(),
             "http_client_ready": ai_engine.client is not None,
             "openrouter_key_configured": bool(settings.OPENROUTER_API_KEY),
             "test_response": test_response,
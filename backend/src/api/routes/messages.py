@@ -5,9 +5,10 @@ Authentication removed for MVP simplicity
 """
 
 from fastapi import APIRouter, HTTPException, status, Request, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 import logging
 import json
 from datetime import datetime
@@ -16,7 +17,7 @@ from ...data.schemas import (
     MessageType,
     SentimentType
 )
-from ...ai.ai_engine import ai_engine, AnalysisDepth
+from ...ai.ai_engine import ai_engine, AnalysisDepth, AIResponse
 from ...core.exceptions import (
     ValidationException,
     AIServiceException,
@@ -38,6 +39,85 @@ class QuickMessageRequest(BaseModel):
     use_deep_analysis: bool = False
     mode: Optional[str] = None
 
+
+def _analysis_depth(message_data: QuickMessageRequest) -> str:
+    """Depth as the engine's string value, identical on the blocking and streaming paths (shared cache keys)"""
+    return (AnalysisDepth.DEEP if message_data.use_deep_analysis else AnalysisDepth.QUICK).value
+
+
+def _build_interpret_result(ai_response, message_data: QuickMessageRequest) -> Dict[str, Any]:
+    """Turn an interpret AIResponse into the API payload, filling gaps with contextual defaults"""
+    # Generate suggested responses (what the user should send back)
+    suggested_responses = []
+    
+    # Try to get responses from AI first - but NOT from explanation field
+    if hasattr(ai_response, 'suggested_responses') and ai_response.suggested_responses:
+        if isinstance(ai_response.suggested_responses, list):
+            suggested_responses = [resp for resp in ai_response.suggested_responses if resp and resp.strip() and not resp.startswith("They are")]
+        elif isinstance(ai_response.suggested_responses, str) and not ai_response.suggested_responses.startswith("They are"):
+            suggested_responses = [ai_response.suggested_responses]
+    
+    # If AI didn't provide proper response suggestions, generate contextual ones
+    if not suggested_responses:
+        if message_data.contact_context in ['coparenting', 'co-parent']:
+            suggested_responses = [
+                "I can see this has been frustrating for you. You're right that we both need to be more engaged. How can we set up a better system?",
+                "I hear that you're feeling unsupported, and I want to change that. Our kids deserve better from both of us. What would help?",
+                "You're absolutely right to call this out. I need to be more reliable and communicative. Can we talk about what that looks like?"
+            ]
+        elif message_data.contact_context in ['partner', 'spouse']:
+            suggested_responses = [
+                "I can see how frustrated this has made you, and I understand why. Your feelings are completely valid.",
+                "You're right to bring this up. I haven't been as supportive as I should be. How can we work on this together?",
+                "I hear that you're feeling neglected, and that's not okay. What do you need from me to feel more supported?"
+            ]
+        else:
+            suggested_responses = [
+                "I can see this has been really frustrating for you. Your feelings are completely valid.",
+                "Thank you for sharing this with me. I want to understand better - can you help me see what would be most helpful?",
+                "I hear what you're saying, and I want to work together to make this better."
+            ]
+    
+    
+    # Ensure we have a proper explanation/interpretation
+    interpretation = ""
+    if hasattr(ai_response, 'explanation') and ai_response.explanation and ai_response.explanation.strip():
+        interpretation = ai_response.explanation
+    else:
+        # Generate interpretation based on available data
+        emotional_context = ""
+        if ai_response.emotional_state:
+            emotional_context = f"feeling {ai_response.emotional_state}"
+        elif ai_response.sentiment and ai_response.sentiment != "neutral":
+            emotional_context = f"{ai_response.sentiment}"
+        
+        if message_data.contact_context in ['coparenting', 'co-parent']:
+            interpretation = f"This message reflects concerns about parenting partnership and communication. The sender is expressing {emotional_context} about coordination and shared responsibilities in raising your children together."
+        elif message_data.contact_context in ['partner', 'spouse']:
+            interpretation = f"This message indicates relationship concerns where the sender is {emotional_context} about feeling supported and heard in your partnership."
+        else:
+            interpretation = f"The sender is communicating {emotional_context} and seeking better understanding and connection in your relationship."
+        
+        # Add context about communication patterns if available
+        if ai_response.subtext:
+            interpretation += f" The deeper need appears to be: {ai_response.subtext.lower()}"
+    
+    # Get the full response with backend_id
+    result = ai_response.to_dict()
+    # Add/override specific fields for the interpret response
+    result.update({
+        "original": message_data.message,
+        "interpretation": interpretation,
+        "explanation": interpretation,
+        "suggested_response": suggested_responses[0] if suggested_responses else "",
+        "suggested_responses": suggested_responses,
+        "emotional_needs": ai_response.needs,
+        "context": message_data.contact_context,
+    })
+    
+    return result
+
+
 @router.post("/quick-transform")
 @limiter.limit("50/minute")
 async def quick_transform(
@@ -56,7 +136,7 @@ async def quick_transform(
         validate_message_content(message_data.message)
         
         # Determine analysis depth
-        analysis_depth = AnalysisDepth.DEEP if message_data.use_deep_analysis else AnalysisDepth.QUICK
+        analysis_depth = _analysis_depth(message_data)
         
         # Process with AI
         ai_response = await ai_engine.process_message(
@@ -106,7 +186,7 @@ async def quick_interpret(
         validate_message_content(message_data.message)
         
         # Determine analysis depth
-        analysis_depth = AnalysisDepth.DEEP if message_data.use_deep_analysis else AnalysisDepth.QUICK
+        analysis_depth = _analysis_depth(message_data)
         
         # Process with AI
         ai_response = await ai_engine.process_message(
@@ -118,73 +198,7 @@ async def quick_interpret(
             analysis_depth=analysis_depth
         )
         
-        # Generate suggested responses (what the user should send back)
-        suggested_responses = []
-        
-        # Try to get responses from AI first - but NOT from explanation field
-        if hasattr(ai_response, 'suggested_responses') and ai_response.suggested_responses:
-            if isinstance(ai_response.suggested_responses, list):
-                suggested_responses = [resp for resp in ai_response.suggested_responses if resp and resp.strip() and not resp.startswith("They are")]
-            elif isinstance(ai_response.suggested_responses, str) and not ai_response.suggested_responses.startswith("They are"):
-                suggested_responses = [ai_response.suggested_responses]
-        
-        # If AI didn't provide proper response suggestions, generate contextual ones
-        if not suggested_responses:
-            if message_data.contact_context in ['coparenting', 'co-parent']:
-                suggested_responses = [
-                    "I can see this has been frustrating for you. You're right that we both need to be more engaged. How can we set up a better system?",
-                    "I hear that you're feeling unsupported, and I want to change that. Our kids deserve better from both of us. What would help?",
-                    "You're absolutely right to call this out. I need to be more reliable and communicative. Can we talk about what that looks like?"
-                ]
-            elif message_data.contact_context in ['partner', 'spouse']:
-                suggested_responses = [
-                    "I can see how frustrated this has made you, and I understand why. Your feelings are completely valid.",
-                    "You're right to bring this up. I haven't been as supportive as I should be. How can we work on this together?",
-                    "I hear that you're feeling neglected, and that's not okay. What do you need from me to feel more supported?"
-                ]
-            else:
-                suggested_responses = [
-                    "I can see this has been really frustrating for you. Your feelings are completely valid.",
-                    "Thank you for sharing this with me. I want to understand better - can you help me see what would be most helpful?",
-                    "I hear what you're saying, and I want to work together to make this better."
-                ]
-        
-        
-        # Ensure we have a proper explanation/interpretation
-        interpretation = ""
-        if hasattr(ai_response, 'explanation') and ai_response.explanation and ai_response.explanation.strip():
-            interpretation = ai_response.explanation
-        else:
-            # Generate interpretation based on available data
-            emotional_context = ""
-            if ai_response.emotional_state:
-                emotional_context = f"feeling {ai_response.emotional_state}"
-            elif ai_response.sentiment and ai_response.sentiment != "neutral":
-                emotional_context = f"{ai_response.sentiment}"
-            
-            if message_data.contact_context in ['coparenting', 'co-parent']:
-                interpretation = f"This message reflects concerns about parenting partnership and communication. The sender is expressing {emotional_context} about coordination and shared responsibilities in raising your children together."
-            elif message_data.contact_context in ['partner', 'spouse']:
-                interpretation = f"This message indicates relationship concerns where the sender is {emotional_context} about feeling supported and heard in your partnership."
-            else:
-                interpretation = f"The sender is communicating {emotional_context} and seeking better understanding and connection in your relationship."
-            
-            # Add context about communication patterns if available
-            if ai_response.subtext:
-                interpretation += f" The deeper need appears to be: {ai_response.subtext.lower()}"
-        
-        # Get the full response with backend_id
-        result = ai_response.to_dict()
-        # Add/override specific fields for the interpret response
-        result.update({
-            "original": message_data.message,
-            "interpretation": interpretation,
-            "explanation": interpretation,
-            "suggested_response": suggested_responses[0] if suggested_responses else "",
-            "suggested_responses": suggested_responses,
-            "emotional_needs": ai_response.needs,
-            "context": message_data.contact_context,
-        })
+        result = _build_interpret_result(ai_response, message_data)
         
         logger.info(f"Interpret completed successfully")
         return result
@@ -198,6 +212,82 @@ async def quick_interpret(
             detail="Could not interpret message"
         )
 
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _stream_ai_events(message_data: QuickMessageRequest, message_type: str) -> AsyncIterator[str]:
+    """Relay AI engine stream events as SSE, shaping the final result like the blocking endpoints"""
+    analysis_depth = _analysis_depth(message_data)
+    try:
+        async for event, data in ai_engine.stream_message(
+            message=message_data.message,
+            contact_context=message_data.contact_context,
+            message_type=message_type,
+            contact_id="anonymous",
+            user_id="anonymous",
+            analysis_depth=analysis_depth
+        ):
+            if event == "result":
+                if message_type == MessageType.INTERPRET.value:
+                    data = _build_interpret_result(AIResponse.from_dict(data), message_data)
+                else:
+                    data.update({
+                        "original": message_data.message,
+                        "context": message_data.contact_context,
+                    })
+            yield _sse_event(event, data)
+    except Exception as e:
+        logger.error(f"Error while streaming {message_type}: {str(e)}")
+        yield _sse_event("error", {"detail": f"Could not {message_type} message"})
+
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # Stop nginx/cloudflared from buffering the stream
+}
+
+
+@router.post("/quick-transform/stream")
+@limiter.limit("50/minute")
+async def quick_transform_stream(
+    request: Request,
+    message_data: QuickMessageRequest
+) -> StreamingResponse:
+    """
+    Streaming message transformation over Server-Sent Events
+    
+    Emits token, partial, retry and a final result event
+    """
+    logger.info(f"Streaming transform request: {message_data.message[:50]}... (Deep analysis: {message_data.use_deep_analysis})")
+    validate_message_content(message_data.message)
+    return StreamingResponse(
+        _stream_ai_events(message_data, MessageType.TRANSFORM.value),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
+@router.post("/quick-interpret/stream")
+@limiter.limit("50/minute")
+async def quick_interpret_stream(
+    request: Request,
+    message_data: QuickMessageRequest
+) -> StreamingResponse:
+    """
+    Streaming message interpretation over Server-Sent Events
+    
+    Emits token, partial, retry and a final result event
+    """
+    logger.info(f"Streaming interpret request: {message_data.message[:50]}... (Deep analysis: {message_data.use_deep_analysis})")
+    validate_message_content(message_data.message)
+    return StreamingResponse(
+        _stream_ai_events(message_data, MessageType.INTERPRET.value),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
 @router.get("/health")
 async def messages_health():
     """Simple health check for messages service"""
@@ -7,7 +7,7 @@ import os
 import secrets
 import platform
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field, validator
 import logging
@@ -56,6 +56,23 @@ class Settings(BaseSettings):
     # Database
     DATABASE_PATH: str = Field("thirdvoice.db", description="SQLite database path")
     CACHE_EXPIRY_DAYS: int = Field(7, description="AI response cache expiry in days")
+    DB_JOURNAL_MODE: str = Field("wal", description="SQLite journal_mode pragma (wal lets readers run alongside a writer)")
+    DB_SYNCHRONOUS: str = Field("normal", description="SQLite synchronous pragma: off, normal or full")
+    DB_CACHE_SIZE_KB: int = Field(64000, description="SQLite page cache size per connection in KiB")
+    DB_MMAP_SIZE: int = Field(64 * 1024 * 1024, description="SQLite mmap_size pragma in bytes (0 disables memory-mapped I/O)")
+    DB_BUSY_TIMEOUT_MS: int = Field(5000, description="How long SQLite waits on a locked database before failing, in ms")
+    DB_EXECUTOR_WORKERS: int = Field(4, description="Threads running blocking SQLite queries off the event loop")
+    DB_EXECUTOR_QUEUE_SIZE: int = Field(64, description="Database calls allowed to queue behind busy executor threads")
+    DB_EXECUTOR_QUEUE_TIMEOUT: float = Field(5.0, description="Seconds to wait for a database executor slot before failing")
+    WRITE_BEHIND_ENABLED: bool = Field(True, description="Batch message/cache/feedback/demo inserts off the request path")
+    WRITE_BEHIND_BATCH_SIZE: int = Field(100, description="Buffered rows that trigger an immediate write-behind flush")
+    WRITE_BEHIND_FLUSH_INTERVAL: float = Field(0.5, description="Max seconds a buffered row waits before being written")
+    WRITE_BEHIND_MAX_PENDING: int = Field(10000, description="Buffered rows before writes fall back to direct inserts")
+    EXPORT_BATCH_SIZE: int = Field(500, description="Rows read per database round trip while streaming a data export")
+    PURGE_CHUNK_SIZE: int = Field(5000, description="Accounts with more rows than this are erased in chunks of this many rows per transaction (0: always one transaction)")
+    AI_CACHE_L1_SIZE: int = Field(512, description="Max AI responses kept in the in-process L1 cache (0 disables)")
+    AI_CACHE_L1_TTL_SECONDS: float = Field(3600.0, description="Time-to-live for in-process L1 cache entries")
+    AI_CACHE_COMPRESS_MIN_BYTES: int = Field(512, description="Cached AI payloads at least this large are zlib-compressed")
 
     # AI Configuration
     OPENROUTER_API_KEY: Optional[str] = Field(None, description="OpenRouter API key")
@@ -65,12 +82,52 @@ class Settings(BaseSettings):
     AI_RETRY_ATTEMPTS: int = Field(3, description="Number of retry attempts for AI requests")
     MAX_TOKENS: int = Field(1000, description="Maximum tokens for AI responses")
     TEMPERATURE: float = Field(0.7, description="AI model temperature")
-    API_TIMEOUT: float = Field(30.0, description="Timeout for OpenRouter API calls in seconds")
+    API_TIMEOUT: float = Field(30.0, description="Read timeout for OpenRouter API calls in seconds (max wait between received bytes)")
+    AI_CONNECT_TIMEOUT: float = Field(5.0, description="Seconds to establish a TCP+TLS connection to OpenRouter")
+    AI_WRITE_TIMEOUT: float = Field(10.0, description="Seconds to send a request body to OpenRouter")
+    AI_POOL_TIMEOUT: float = Field(5.0, description="Seconds to wait for a free connection from the pool")
+    AI_HTTP2: bool = Field(True, description="Multiplex OpenRouter requests over HTTP/2 (needs the h2 package)")
+    AI_KEEPALIVE_EXPIRY: float = Field(120.0, description="Seconds an idle OpenRouter connection is kept open for reuse")
+    AI_RACE_MODE: str = Field("hedged", description="Model fallback strategy: sequential, parallel or hedged")
+    AI_RACE_WIDTH: int = Field(2, description="Maximum number of models in flight at once when racing")
+    AI_HEDGE_DELAY: float = Field(4.0, description="Seconds (roughly p95 latency) before hedging to the next model")
+    AI_BREAKER_FAILURE_THRESHOLD: int = Field(3, description="Consecutive failures before a model's circuit breaker opens")
+    AI_BREAKER_COOLDOWN: float = Field(60.0, description="Seconds an open breaker skips a model before a half-open probe")
+    AI_HEALTH_WINDOW: int = Field(20, description="Number of recent calls used for a model's rolling success rate")
+    AI_LATENCY_EWMA_ALPHA: float = Field(0.3, description="Smoothing factor for the per-model latency EWMA")
+    AI_MAX_PROMPT_TOKENS: int = Field(1200, description="Estimated token budget for system + user prompt; longer messages are trimmed to fit")
+    AI_OUTPUT_TOKENS_WINDOW: int = Field(200, description="Recent completions per message type/depth used to size max_tokens")
+    AI_OUTPUT_TOKENS_MIN_SAMPLES: int = Field(20, description="Completions observed before max_tokens adapts from its default")
+    AI_OUTPUT_TOKENS_PERCENTILE: float = Field(0.95, description="Completion-length percentile max_tokens is based on")
+    AI_OUTPUT_TOKENS_HEADROOM: float = Field(1.25, description="Multiplier applied on top of the percentile")
+    AI_OUTPUT_TOKENS_FLOOR: int = Field(256, description="Lowest adaptive max_tokens")
+    AI_OUTPUT_TOKENS_CEILING: int = Field(2000, description="Highest adaptive max_tokens")
+    AI_SANITIZER_LEXICON: Dict[str, str] = Field(
+        default_factory=dict,
+        description="JSON word -> replacement entries added to (or, with an empty value, removed from) the retry sanitizer lexicon"
+    )
 
     # Rate Limiting
     RATE_LIMIT_REQUESTS: int = Field(100, description="Requests per minute per IP")
     RATE_LIMIT_DEMO_REQUESTS: int = Field(50, description="Requests per minute for demo users")
 
+    # Menu (Supabase)
+    MENU_REFRESH_SECONDS: float = Field(300.0, description="How often the in-memory menu snapshot is reloaded from Supabase")
+    MENU_CACHE_MAX_AGE: int = Field(60, description="Cache-Control max-age for menu responses in seconds")
+    MENU_STALE_WHILE_REVALIDATE: int = Field(600, description="Cache-Control stale-while-revalidate window for menu responses in seconds")
+    MENU_GZIP_MIN_BYTES: int = Field(1024, description="Menu responses at least this large are sent gzip-encoded when accepted")
+    MENU_MIN_REFRESH_GAP_SECONDS: float = Field(5.0, description="On-demand menu refreshes closer together than this reuse the current snapshot")
+
+    # Orders (Supabase)
+    ORDERS_BATCH_SIZE: int = Field(50, description="Max orders written to Supabase in one insert")
+    ORDERS_BATCH_LINGER: float = Field(0.02, description="Seconds to wait for more orders before writing a batch")
+    ORDERS_RECENT_LIMIT: int = Field(200, description="Completed/cancelled orders kept in the in-memory queue")
+    ORDERS_RESYNC_SECONDS: float = Field(30.0, description="How often active orders are reconciled with Supabase")
+    ORDERS_STATS_UTC_OFFSET_HOURS: float = Field(0.0, description="Timezone offset used for the order stats business day and hour buckets")
+    ORDER_EVENTS_REPLAY_SIZE: int = Field(1000, description="Recent order events kept so reconnecting dashboards can resume")
+    ORDER_EVENTS_SUBSCRIBER_QUEUE: int = Field(256, description="Undelivered events per dashboard before it is disconnected")
+    ORDER_EVENTS_HEARTBEAT_SECONDS: float = Field(15.0, description="Idle seconds between keep-alive comments on the order stream")
+
     # File Storage
     UPLOAD_MAX_SIZE: int = Field(5 * 1024 * 1024, description="Max upload size in bytes (5MB)")
     ALLOWED_FILE_TYPES: List[str] = Field(
@@ -123,6 +180,19 @@ class Settings(BaseSettings):
             raise ValueError(f'Environment must be one of: {allowed}')
         return v
 
+    @validator('AI_RACE_MODE')
+    def validate_ai_race_mode(cls, v):
+        allowed = ['sequential', 'parallel', 'hedged']
+        if v.lower() not in allowed:
+            raise ValueError(f'AI race mode must be one of: {allowed}')
+        return v.lower()
+
+    @validator('AI_RACE_WIDTH')
+    def validate_ai_race_width(cls, v):
+        if v < 1:
+            raise ValueError('AI_RACE_WIDTH must be at least 1')
+        return v
+
     @validator('LOG_LEVEL')
     def validate_log_level(cls, v):
         allowed = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
@@ -204,6 +274,13 @@ class Settings(BaseSettings):
         
         return str(db_path.absolute())
 
+    @validator('DB_SYNCHRONOUS')
+    def validate_db_synchronous(cls, v):
+        allowed = ['off', 'normal', 'full', 'extra']
+        if v.lower() not in allowed:
+            raise ValueError(f'DB_SYNCHRONOUS must be one of: {allowed}')
+        return v.lower()
+
     @validator('PORT')
     def validate_port(cls, v):
         """Ensure port is in valid range"""
@@ -428,11 +505,13 @@ def get_database_config():
     return {
         "database": settings.DATABASE_PATH,
         "pragmas": {
-            "journal_mode": "wal",
-            "cache_size": -64 * 1000,
+            "journal_mode": settings.DB_JOURNAL_MODE,
+            "cache_size": -settings.DB_CACHE_SIZE_KB,
+            "mmap_size": settings.DB_MMAP_SIZE,
+            "busy_timeout": settings.DB_BUSY_TIMEOUT_MS,
             "foreign_keys": 1,
             "ignore_check_constraints": 0,
-            "synchronous": 0,
+            "synchronous": settings.DB_SYNCHRONOUS,
         }
     }
 
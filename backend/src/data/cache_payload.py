@@ -0,0 +1,33 @@
+# backend/src/data/cache_payload.py
+"""
+Cached AI response payloads for The Third Voice
+The full AIResponse.to_dict() is stored as compact JSON, zlib-compressed above a size threshold;
+a one-byte tag says which, so both kinds decode the same way
+"""
+
+import json
+import zlib
+from typing import Any, Dict, Optional
+
+from ..core.config import settings
+
+
+def pack_payload(payload: Dict[str, Any]) -> bytes:
+    """Serialize a response payload as compact JSON, zlib-compressed above the size threshold"""
+    raw = json.dumps(payload, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+    if len(raw) >= settings.AI_CACHE_COMPRESS_MIN_BYTES:
+        return b'z' + zlib.compress(raw)
+    return b'j' + raw
+
+
+def unpack_payload(blob: Optional[bytes]) -> Optional[Dict[str, Any]]:
+    """Inverse of pack_payload; returns None for rows cached before payloads existed"""
+    if not blob:
+        return None
+    try:
+        blob = bytes(blob)
+        raw = zlib.decompress(blob[1:]) if blob[:1] == b'z' else blob[1:]
+        return json.loads(raw.decode('utf-8'))
+    except Exception as e:
+        print(f"Error decoding cached payload: {e}")
+        return None
@@ -13,6 +13,11 @@ from .peewee_models import (
     User, Contact, Message, AIResponseCache, Feedback, DemoUsage,
     get_db_context
 )
+from .memory_cache import ai_response_l1, ai_response_key
+from .cache_payload import pack_payload
+from .message_stats import MessageStats, contacts_with_rollup, empty_stats
+from .write_behind import write_behind
+from .user_purge import purge_user_data
 from .schemas import (
     ContactCreate, ContactUpdate, ContactResponse,
     MessageCreate, MessageResponse,
@@ -142,7 +147,7 @@ class ContactCRUD:
         try:
             with get_db_context():
                 contacts = list(
-                    Contact.select()
+                    contacts_with_rollup()
                     .where(Contact.user_id == user_id)
                     .order_by(Contact.updated_at.desc())
                 )
@@ -153,7 +158,9 @@ class ContactCRUD:
                         context=ContextType(contact.context),
                         user_id=contact.user_id,
                         created_at=contact.created_at,
-                        updated_at=contact.updated_at
+                        updated_at=contact.updated_at,
+                        message_count=contact.message_count or 0,
+                        last_message_date=contact.last_message_date
                     )
                     for contact in contacts
                 ]
@@ -231,6 +238,8 @@ class ContactCRUD:
     def delete_contact(contact_id: str, user_id: str) -> bool:
         """Delete a contact and all related data"""
         try:
+            # Buffered inserts for this contact must land before the delete, not after it
+            write_behind.flush_now()
             with get_db_context():
                 # Delete in proper order due to foreign key constraints
                 
@@ -256,6 +265,7 @@ class ContactCRUD:
                     .execute()
                 )
                 
+                CacheCRUD.invalidate_memory_cache(contact_id=contact_id, user_id=user_id)
                 return deleted_count > 0
         except Exception as e:
             print(f"Error deleting contact: {e}")
@@ -270,36 +280,36 @@ class MessageCRUD:
                       result: str = None, sentiment: SentimentType = None,
                       emotional_state: str = None, model: str = None,
                       healing_score: int = None) -> Optional[MessageResponse]:
-        """Create a new message"""
+        """Create a new message (inserted by the write-behind queue when it is running)"""
         try:
-            with get_db_context():
-                message = Message.create(
-                    contact_id=message_data.contact_id,
-                    contact_name=message_data.contact_name,
-                    type=message_data.type.value,
-                    original=message_data.original,
-                    result=result,
-                    sentiment=sentiment.value if sentiment else None,
-                    emotional_state=emotional_state,
-                    model=model,
-                    healing_score=healing_score,
-                    user_id=user_id
-                )
-                
-                return MessageResponse(
-                    id=message.id,
-                    contact_id=message.contact_id,
-                    contact_name=message.contact_name,
-                    type=MessageType(message.type),
-                    original=message.original,
-                    result=message.result,
-                    sentiment=SentimentType(message.sentiment) if message.sentiment else None,
-                    emotional_state=message.emotional_state,
-                    model=message.model,
-                    healing_score=message.healing_score,
-                    user_id=message.user_id,
-                    created_at=message.created_at
-                )
+            message = write_behind.write(
+                Message,
+                contact_id=message_data.contact_id,
+                contact_name=message_data.contact_name,
+                type=message_data.type.value,
+                original=message_data.original,
+                result=result,
+                sentiment=sentiment.value if sentiment else None,
+                emotional_state=emotional_state,
+                model=model,
+                healing_score=healing_score,
+                user_id=user_id
+            )
+            
+            return MessageResponse(
+                id=message.id,
+                contact_id=message.contact_id,
+                contact_name=message.contact_name,
+                type=MessageType(message.type),
+                original=message.original,
+                result=message.result,
+                sentiment=SentimentType(message.sentiment) if message.sentiment else None,
+                emotional_state=message.emotional_state,
+                model=message.model,
+                healing_score=message.healing_score,
+                user_id=message.user_id,
+                created_at=message.created_at
+            )
         except Exception as e:
             print(f"Error creating message: {e}")
             return None
@@ -373,51 +383,14 @@ class MessageCRUD:
     
     @staticmethod
     def get_user_message_stats(user_id: str, days: int = 30) -> Dict[str, Any]:
-        """Get message statistics for a user"""
+        """Get message statistics for a user (aggregated in SQL, see MessageStats)"""
         try:
-            with get_db_context():
-                since_date = datetime.now() - timedelta(days=days)
-                
-                # Get all messages in time period
-                messages = list(
-                    Message.select()
-                    .where(
-                        (Message.user_id == user_id) &
-                        (Message.created_at >= since_date)
-                    )
-                )
-                
-                total_messages = len(messages)
-                
-                # Calculate average healing score
-                healing_scores = [
-                    msg.healing_score for msg in messages 
-                    if msg.healing_score is not None
-                ]
-                avg_healing_score = sum(healing_scores) / len(healing_scores) if healing_scores else 0.0
-                
-                # Sentiment breakdown
-                sentiment_counts = {}
-                for msg in messages:
-                    if msg.sentiment:
-                        sentiment_counts[msg.sentiment] = sentiment_counts.get(msg.sentiment, 0) + 1
-                
-                return {
-                    "total_messages": total_messages,
-                    "avg_healing_score": round(avg_healing_score, 2),
-                    "period_days": days,
-                    "messages_with_scores": len(healing_scores),
-                    "sentiment_breakdown": sentiment_counts
-                }
+            stats = MessageStats.aggregate(user_id, since=datetime.now() - timedelta(days=days))
         except Exception as e:
             print(f"Error getting message stats: {e}")
-            return {
-                "total_messages": 0,
-                "avg_healing_score": 0.0,
-                "period_days": days,
-                "messages_with_scores": 0,
-                "sentiment_breakdown": {}
-            }
+            stats = empty_stats()
+        stats["period_days"] = days
+        return stats
 
 
 class CacheCRUD:
@@ -427,32 +400,47 @@ class CacheCRUD:
     def cache_response(contact_id: str, user_id: str, message_hash: str,
                       context: str, response: str, model: str,
                       healing_score: int = None, sentiment: SentimentType = None,
-                      emotional_state: str = None) -> bool:
-        """Cache an AI response"""
+                      emotional_state: str = None, payload: Dict[str, Any] = None) -> bool:
+        """Cache an AI response (written through to the in-process L1 cache)
+        
+        payload is the full AIResponse.to_dict() so cache hits can be rebuilt completely.
+        The SQLite insert goes through the write-behind queue; the L1 entry serves reads meanwhile.
+        """
         try:
-            with get_db_context():
-                expires_at = datetime.now() + timedelta(days=7)
-                
-                AIResponseCache.create(
-                    contact_id=contact_id,
-                    message_hash=message_hash,
-                    context=context,
-                    response=response,
-                    healing_score=healing_score,
-                    model=model,
-                    sentiment=sentiment.value if sentiment else None,
-                    emotional_state=emotional_state,
-                    user_id=user_id,
-                    expires_at=expires_at
-                )
-                return True
+            expires_at = datetime.now() + timedelta(days=7)
+            
+            cache_entry = write_behind.write(
+                AIResponseCache,
+                contact_id=contact_id,
+                message_hash=message_hash,
+                context=context,
+                response=response,
+                healing_score=healing_score,
+                model=model,
+                sentiment=sentiment.value if sentiment else None,
+                emotional_state=emotional_state,
+                payload=pack_payload(payload) if payload else None,
+                user_id=user_id,
+                expires_at=expires_at
+            )
+            CacheCRUD._remember(cache_entry)
+            return True
         except Exception as e:
             print(f"Error caching response: {e}")
             return False
     
     @staticmethod
-    def get_cached_response(message_hash: str, contact_id: str) -> Optional[AIResponseCache]:
-        """Get cached AI response"""
+    def get_cached_response(message_hash: str, contact_id: str,
+                            check_memory: bool = True) -> Optional[AIResponseCache]:
+        """Get cached AI response, checking the in-process L1 cache before SQLite
+        
+        Pass check_memory=False when the caller has already missed the L1 cache
+        """
+        if check_memory:
+            cache_entry = ai_response_l1.get(ai_response_key(message_hash, contact_id))
+            if cache_entry is not None:
+                return cache_entry
+        
         try:
             with get_db_context():
                 cache_entry = AIResponseCache.get(
@@ -460,6 +448,7 @@ class CacheCRUD:
                     (AIResponseCache.contact_id == contact_id) &
                     (AIResponseCache.expires_at > datetime.now())
                 )
+                CacheCRUD._remember(cache_entry)
                 return cache_entry
         except DoesNotExist:
             return None
@@ -467,6 +456,24 @@ class CacheCRUD:
             print(f"Error getting cached response: {e}")
             return None
     
+    @staticmethod
+    def _remember(cache_entry: AIResponseCache):
+        """Put a row into the L1 cache without outliving its SQLite expiry"""
+        remaining = (cache_entry.expires_at - datetime.now()).total_seconds()
+        ai_response_l1.set(ai_response_key(cache_entry.message_hash, cache_entry.contact_id), cache_entry, ttl_seconds=remaining)
+    
+    @staticmethod
+    def invalidate_memory_cache(contact_id: str = None, user_id: str = None) -> int:
+        """Drop L1 entries for a contact and/or user after their SQLite rows are deleted"""
+        def matches(key, entry) -> bool:
+            if contact_id is not None and entry.contact_id != contact_id:
+                return False
+            if user_id is not None and entry.user_id != user_id:
+                return False
+            return True
+        
+        return ai_response_l1.invalidate_where(matches)
+    
     @staticmethod
     def clean_expired_cache(user_id: str = None) -> int:
         """Clean expired cache entries"""
@@ -498,24 +505,24 @@ class FeedbackCRUD:
     
     @staticmethod
     def create_feedback(feedback_data: FeedbackCreate, user_id: str) -> Optional[FeedbackResponse]:
-        """Create user feedback"""
+        """Create user feedback (inserted by the write-behind queue when it is running)"""
         try:
-            with get_db_context():
-                feedback = Feedback.create(
-                    user_id=user_id,
-                    rating=feedback_data.rating,
-                    feedback_text=feedback_data.feedback_text,
-                    feature_context=feedback_data.feature_context
-                )
-                
-                return FeedbackResponse(
-                    id=feedback.id,
-                    rating=feedback.rating,
-                    feedback_text=feedback.feedback_text,
-                    feature_context=feedback.feature_context,
-                    user_id=feedback.user_id,
-                    created_at=feedback.created_at
-                )
+            feedback = write_behind.write(
+                Feedback,
+                user_id=user_id,
+                rating=feedback_data.rating,
+                feedback_text=feedback_data.feedback_text,
+                feature_context=feedback_data.feature_context
+            )
+            
+            return FeedbackResponse(
+                id=feedback.id,
+                rating=feedback.rating,
+                feedback_text=feedback.feedback_text,
+                feature_context=feedback.feature_context,
+                user_id=feedback.user_id,
+                created_at=feedback.created_at
+            )
         except Exception as e:
             print(f"Error creating feedback: {e}")
             return None
@@ -597,14 +604,10 @@ class DemoUsageCRUD:
     
     @staticmethod
     def log_demo_usage(user_email: str, ip_address: str = None) -> bool:
-        """Log demo usage for analytics"""
+        """Log demo usage for analytics (batched by the write-behind queue)"""
         try:
-            with get_db_context():
-                DemoUsage.create(
-                    user_email=user_email,
-                    ip_address=ip_address
-                )
-                return True
+            write_behind.write(DemoUsage, user_email=user_email, ip_address=ip_address)
+            return True
         except Exception as e:
             print(f"Error logging demo usage: {e}")
             return False
@@ -641,56 +644,11 @@ class DemoUsageCRUD:
 
 
 # Utility functions for common operations
-def get_all_user_data(user_id: str) -> Dict[str, Any]:
-    """Get all data for a user (for export/analysis)"""
-    try:
-        contacts = ContactCRUD.get_user_contacts(user_id)
-        
-        all_messages = []
-        for contact in contacts:
-            messages = MessageCRUD.get_conversation_history(contact.id, user_id, limit=1000)
-            all_messages.extend(messages)
-        
-        feedback = FeedbackCRUD.get_user_feedback(user_id)
-        message_stats = MessageCRUD.get_user_message_stats(user_id)
-        
-        return {
-            "user_id": user_id,
-            "contacts": [contact.dict() for contact in contacts],
-            "messages": [msg.dict() for msg in all_messages],
-            "feedback": [fb.dict() for fb in feedback],
-            "stats": message_stats,
-            "export_timestamp": datetime.now()
-        }
-    except Exception as e:
-        print(f"Error getting user data: {e}")
-        return {"error": str(e)}
-
-
 def delete_all_user_data(user_id: str) -> bool:
-    """Delete all data for a user (GDPR compliance)"""
+    """Delete all data for a user (GDPR compliance); set-based, see user_purge.purge_user_data"""
     try:
-        with get_db_context():
-            # Get all contacts first
-            contacts = ContactCRUD.get_user_contacts(user_id)
-            
-            # Delete each contact (which will delete messages and cache)
-            for contact in contacts:
-                ContactCRUD.delete_contact(contact.id, user_id)
-            
-            # Delete feedback
-            Feedback.delete().where(Feedback.user_id == user_id).execute()
-            
-            # Delete any remaining cache entries
-            AIResponseCache.delete().where(AIResponseCache.user_id == user_id).execute()
-            
-            # Delete user if not demo user
-            if not user_id.startswith('demo-user-'):
-                User.delete().where(User.id == user_id).execute()
-            
-            print(f"✅ All data deleted for user: {user_id}")
-            return True
-            
+        purge_user_data(user_id)
+        return True
     except Exception as e:
         print(f"Error deleting user data: {e}")
         return False
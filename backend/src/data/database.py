@@ -5,7 +5,7 @@ Modernized for FastAPI with proper async support and type safety
 """
 
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, AsyncIterator
 import uuid
 import hashlib
 import asyncio
@@ -36,6 +36,13 @@ from .peewee_models import (
     Feedback as PeeweeFeedback,
     get_db_context
 )
+from .crud import CacheCRUD
+from .message_stats import MessageStats, contacts_with_rollup, empty_stats
+from .pagination import decode_cursor, keyset_page, keyset_slice
+from .export import EXPORT_FORMATS, database_batches, export_header, memory_batches
+from .user_purge import PurgeJob, purge_jobs
+from .executor import run_in_db_executor
+from .write_behind import write_behind
 from ..core.config import settings
 
 
@@ -71,47 +78,92 @@ class DatabaseManager:
             return self._get_demo_user_data(user_id, 'contacts')
         
         try:
-            with get_db_context():
-                peewee_contacts = list(PeeweeContact.select().where(PeeweeContact.user_id == user_id))
-                # Convert Peewee models to Pydantic models
-                contacts = [
-                    ContactResponse(
-                        id=contact.id,
-                        name=contact.name,
-                        context=ContextType(contact.context),
-                        user_id=contact.user_id,
-                        created_at=contact.created_at,
-                        updated_at=contact.updated_at
+            def _query():
+                with get_db_context():
+                    # message_count / last_message_date come from the rollup table in the same query
+                    peewee_contacts = list(
+                        contacts_with_rollup()
+                        .where(PeeweeContact.user_id == user_id)
                     )
-                    for contact in peewee_contacts
-                ]
-                return contacts
+                    # Convert Peewee models to Pydantic models
+                    contacts = [
+                        ContactResponse(
+                            id=contact.id,
+                            name=contact.name,
+                            context=ContextType(contact.context),
+                            user_id=contact.user_id,
+                            created_at=contact.created_at,
+                            updated_at=contact.updated_at,
+                            message_count=contact.message_count or 0,
+                            last_message_date=contact.last_message_date
+                        )
+                        for contact in peewee_contacts
+                    ]
+                    return contacts
+            
+            return await run_in_db_executor(_query)
         except Exception as e:
             print(f"Error fetching contacts: {str(e)}")
             return []
     
+    async def get_contacts_page(self, user_id: str, limit: int = 50,
+                                cursor: Optional[str] = None) -> Tuple[List[ContactResponse], Optional[str]]:
+        """One page of contacts, newest first, plus the cursor for the next page"""
+        if cursor:
+            decode_cursor(cursor)
+        if self._is_demo_user(user_id):
+            return keyset_slice(self._get_demo_user_data(user_id, 'contacts'), limit, cursor)
+
+        try:
+            def _query():
+                with get_db_context():
+                    query = contacts_with_rollup().where(PeeweeContact.user_id == user_id)
+                    peewee_contacts, next_cursor = keyset_page(query, PeeweeContact, limit, cursor)
+                    contacts = [
+                        ContactResponse(
+                            id=contact.id,
+                            name=contact.name,
+                            context=ContextType(contact.context),
+                            user_id=contact.user_id,
+                            created_at=contact.created_at,
+                            updated_at=contact.updated_at,
+                            message_count=contact.message_count or 0,
+                            last_message_date=contact.last_message_date
+                        )
+                        for contact in peewee_contacts
+                    ]
+                    return contacts, next_cursor
+
+            return await run_in_db_executor(_query)
+        except Exception as e:
+            print(f"Error fetching contacts: {str(e)}")
+            return [], None
+    
     async def create_contact(self, contact_data: ContactCreate, user_id: str) -> Optional[ContactResponse]:
         """Create a new contact using Pydantic models"""
         if self._is_demo_user(user_id):
             return await self._create_demo_contact(contact_data, user_id)
         
         try:
-            with get_db_context():
-                peewee_contact = PeeweeContact.create(
-                    name=contact_data.name,
-                    context=contact_data.context.value,
-                    user_id=user_id
-                )
+            def _query():
+                with get_db_context():
+                    peewee_contact = PeeweeContact.create(
+                        name=contact_data.name,
+                        context=contact_data.context.value,
+                        user_id=user_id
+                    )
                 
-                # Convert to Pydantic response model
-                return ContactResponse(
-                    id=peewee_contact.id,
-                    name=peewee_contact.name,
-                    context=ContextType(peewee_contact.context),
-                    user_id=peewee_contact.user_id,
-                    created_at=peewee_contact.created_at,
-                    updated_at=peewee_contact.updated_at
-                )
+                    # Convert to Pydantic response model
+                    return ContactResponse(
+                        id=peewee_contact.id,
+                        name=peewee_contact.name,
+                        context=ContextType(peewee_contact.context),
+                        user_id=peewee_contact.user_id,
+                        created_at=peewee_contact.created_at,
+                        updated_at=peewee_contact.updated_at
+                    )
+            
+            return await run_in_db_executor(_query)
         except Exception as e:
             print(f"Error creating contact: {str(e)}")
             return None
@@ -141,34 +193,35 @@ class DatabaseManager:
             return await self._save_demo_message(message_data, user_id, ai_response)
         
         try:
-            with get_db_context():
-                peewee_message = PeeweeMessage.create(
-                    contact_id=message_data.contact_id,
-                    contact_name=message_data.contact_name,
-                    type=message_data.type.value,
-                    original=message_data.original,
-                    result=ai_response.transformed_message,
-                    sentiment=ai_response.sentiment.value,
-                    emotional_state=ai_response.emotional_state,
-                    model=ai_response.model_used or settings.AI_MODEL,
-                    healing_score=ai_response.healing_score,
-                    user_id=user_id
-                )
-                
-                return MessageResponse(
-                    id=peewee_message.id,
-                    contact_id=peewee_message.contact_id,
-                    contact_name=peewee_message.contact_name,
-                    type=MessageType(peewee_message.type),
-                    original=peewee_message.original,
-                    result=peewee_message.result,
-                    sentiment=SentimentType(peewee_message.sentiment) if peewee_message.sentiment else None,
-                    emotional_state=peewee_message.emotional_state,
-                    model=peewee_message.model,
-                    healing_score=peewee_message.healing_score,
-                    user_id=peewee_message.user_id,
-                    created_at=peewee_message.created_at
-                )
+            # Queued for a batched insert; the response doesn't wait on SQLite
+            peewee_message = await write_behind.awrite(
+                PeeweeMessage,
+                contact_id=message_data.contact_id,
+                contact_name=message_data.contact_name,
+                type=message_data.type.value,
+                original=message_data.original,
+                result=ai_response.transformed_message,
+                sentiment=ai_response.sentiment.value,
+                emotional_state=ai_response.emotional_state,
+                model=ai_response.model_used or settings.AI_MODEL,
+                healing_score=ai_response.healing_score,
+                user_id=user_id
+            )
+            
+            return MessageResponse(
+                id=peewee_message.id,
+                contact_id=peewee_message.contact_id,
+                contact_name=peewee_message.contact_name,
+                type=MessageType(peewee_message.type),
+                original=peewee_message.original,
+                result=peewee_message.result,
+                sentiment=SentimentType(peewee_message.sentiment) if peewee_message.sentiment else None,
+                emotional_state=peewee_message.emotional_state,
+                model=peewee_message.model,
+                healing_score=peewee_message.healing_score,
+                user_id=peewee_message.user_id,
+                created_at=peewee_message.created_at
+            )
         except Exception as e:
             print(f"Error saving message: {str(e)}")
             return None
@@ -199,44 +252,50 @@ class DatabaseManager:
     async def get_conversation_history(self, contact_id: str, user_id: str, 
                                      limit: int = 50) -> List[MessageResponse]:
         """Get conversation history with proper Pydantic typing"""
+        messages, _ = await self.get_conversation_page(contact_id, user_id, limit)
+        return messages
+
+    async def get_conversation_page(self, contact_id: str, user_id: str, limit: int = 50,
+                                    cursor: Optional[str] = None) -> Tuple[List[MessageResponse], Optional[str]]:
+        """One page of a conversation, newest first, plus the cursor for the next (older) page"""
+        if cursor:
+            decode_cursor(cursor)  # Reject a malformed cursor before touching the database
         if self._is_demo_user(user_id):
             demo_messages = self._get_demo_user_data(user_id, 'messages')
-            contact_messages = [msg for msg in demo_messages if msg.contact_id == contact_id]
-            return sorted(contact_messages, key=lambda x: x.created_at, reverse=True)[:limit]
+            return keyset_slice([msg for msg in demo_messages if msg.contact_id == contact_id], limit, cursor)
         
         try:
-            with get_db_context():
-                peewee_messages = list(
-                    PeeweeMessage.select()
-                    .where(
+            def _query():
+                with get_db_context():
+                    query = PeeweeMessage.select().where(
                         (PeeweeMessage.contact_id == contact_id) & 
                         (PeeweeMessage.user_id == user_id)
                     )
-                    .order_by(PeeweeMessage.created_at.desc())
-                    .limit(limit)
-                )
+                    peewee_messages, next_cursor = keyset_page(query, PeeweeMessage, limit, cursor)
                 
-                messages = [
-                    MessageResponse(
-                        id=msg.id,
-                        contact_id=msg.contact_id,
-                        contact_name=msg.contact_name,
-                        type=MessageType(msg.type),
-                        original=msg.original,
-                        result=msg.result,
-                        sentiment=SentimentType(msg.sentiment) if msg.sentiment else None,
-                        emotional_state=msg.emotional_state,
-                        model=msg.model,
-                        healing_score=msg.healing_score,
-                        user_id=msg.user_id,
-                        created_at=msg.created_at
-                    )
-                    for msg in peewee_messages
-                ]
-                return messages
+                    messages = [
+                        MessageResponse(
+                            id=msg.id,
+                            contact_id=msg.contact_id,
+                            contact_name=msg.contact_name,
+                            type=MessageType(msg.type),
+                            original=msg.original,
+                            result=msg.result,
+                            sentiment=SentimentType(msg.sentiment) if msg.sentiment else None,
+                            emotional_state=msg.emotional_state,
+                            model=msg.model,
+                            healing_score=msg.healing_score,
+                            user_id=msg.user_id,
+                            created_at=msg.created_at
+                        )
+                        for msg in peewee_messages
+                    ]
+                    return messages, next_cursor
+            
+            return await run_in_db_executor(_query)
         except Exception as e:
             print(f"Error fetching conversation history: {str(e)}")
-            return []
+            return [], None
     
     async def save_feedback(self, feedback_data: FeedbackCreate, user_id: str) -> Optional[FeedbackResponse]:
         """Save user feedback with Pydantic models"""
@@ -244,26 +303,57 @@ class DatabaseManager:
             return await self._save_demo_feedback(feedback_data, user_id)
         
         try:
-            with get_db_context():
-                peewee_feedback = PeeweeFeedback.create(
-                    user_id=user_id,
-                    rating=feedback_data.rating,
-                    feedback_text=feedback_data.feedback_text,
-                    feature_context=feedback_data.feature_context
-                )
-                
-                return FeedbackResponse(
-                    id=peewee_feedback.id,
-                    rating=peewee_feedback.rating,
-                    feedback_text=peewee_feedback.feedback_text,
-                    feature_context=peewee_feedback.feature_context,
-                    user_id=peewee_feedback.user_id,
-                    created_at=peewee_feedback.created_at
-                )
+            peewee_feedback = await write_behind.awrite(
+                PeeweeFeedback,
+                user_id=user_id,
+                rating=feedback_data.rating,
+                feedback_text=feedback_data.feedback_text,
+                feature_context=feedback_data.feature_context
+            )
+            
+            return FeedbackResponse(
+                id=peewee_feedback.id,
+                rating=peewee_feedback.rating,
+                feedback_text=peewee_feedback.feedback_text,
+                feature_context=peewee_feedback.feature_context,
+                user_id=peewee_feedback.user_id,
+                created_at=peewee_feedback.created_at
+            )
         except Exception as e:
             print(f"Error saving feedback: {str(e)}")
             return None
     
+    async def get_feedback_page(self, user_id: str, limit: int = 50,
+                                cursor: Optional[str] = None) -> Tuple[List[FeedbackResponse], Optional[str]]:
+        """One page of a user's feedback, newest first, plus the cursor for the next page"""
+        if cursor:
+            decode_cursor(cursor)
+        if self._is_demo_user(user_id):
+            return keyset_slice(self._get_demo_user_data(user_id, 'feedback'), limit, cursor)
+
+        try:
+            def _query():
+                with get_db_context():
+                    query = PeeweeFeedback.select().where(PeeweeFeedback.user_id == user_id)
+                    entries, next_cursor = keyset_page(query, PeeweeFeedback, limit, cursor)
+                    feedback = [
+                        FeedbackResponse(
+                            id=entry.id,
+                            rating=entry.rating,
+                            feedback_text=entry.feedback_text,
+                            feature_context=entry.feature_context,
+                            user_id=entry.user_id,
+                            created_at=entry.created_at
+                        )
+                        for entry in entries
+                    ]
+                    return feedback, next_cursor
+
+            return await run_in_db_executor(_query)
+        except Exception as e:
+            print(f"Error fetching feedback: {str(e)}")
+            return [], None
+
     async def _save_demo_feedback(self, feedback_data: FeedbackCreate, user_id: str) -> FeedbackResponse:
         """Save demo feedback in memory"""
         feedback = FeedbackResponse(
@@ -291,29 +381,32 @@ class DatabaseManager:
             return await self._check_demo_cache(contact_id, message_hash, user_id)
         
         try:
-            with get_db_context():
-                cache_entry = (
-                    PeeweeAIResponseCache.select()
-                    .where(
-                        (PeeweeAIResponseCache.contact_id == contact_id) &
-                        (PeeweeAIResponseCache.message_hash == message_hash) &
-                        (PeeweeAIResponseCache.user_id == user_id) &
-                        (PeeweeAIResponseCache.expires_at > datetime.now())
+            def _query():
+                with get_db_context():
+                    cache_entry = (
+                        PeeweeAIResponseCache.select()
+                        .where(
+                            (PeeweeAIResponseCache.contact_id == contact_id) &
+                            (PeeweeAIResponseCache.message_hash == message_hash) &
+                            (PeeweeAIResponseCache.user_id == user_id) &
+                            (PeeweeAIResponseCache.expires_at > datetime.now())
+                        )
+                        .first()
                     )
-                    .first()
-                )
                 
-                if cache_entry:
-                    return AIResponse(
-                        transformed_message=cache_entry.response,
-                        healing_score=cache_entry.healing_score or 0,
-                        sentiment=SentimentType(cache_entry.sentiment) if cache_entry.sentiment else SentimentType.UNKNOWN,
-                        emotional_state=cache_entry.emotional_state or "unknown",
-                        explanation="Retrieved from cache",
-                        model_used=cache_entry.model,
-                        model_id=cache_entry.model
-                    )
-                return None
+                    if cache_entry:
+                        return AIResponse(
+                            transformed_message=cache_entry.response,
+                            healing_score=cache_entry.healing_score or 0,
+                            sentiment=SentimentType(cache_entry.sentiment) if cache_entry.sentiment else SentimentType.UNKNOWN,
+                            emotional_state=cache_entry.emotional_state or "unknown",
+                            explanation="Retrieved from cache",
+                            model_used=cache_entry.model,
+                            model_id=cache_entry.model
+                        )
+                    return None
+            
+            return await run_in_db_executor(_query)
         except Exception as e:
             print(f"Error checking cache: {str(e)}")
             return None
@@ -351,22 +444,25 @@ class DatabaseManager:
             return await self._save_to_demo_cache(contact_id, message_hash, context, user_id, ai_response)
         
         try:
-            with get_db_context():
-                expires_at = datetime.now() + timedelta(days=getattr(settings, 'CACHE_EXPIRY_DAYS', 7))
+            def _query():
+                with get_db_context():
+                    expires_at = datetime.now() + timedelta(days=getattr(settings, 'CACHE_EXPIRY_DAYS', 7))
                 
-                PeeweeAIResponseCache.create(
-                    contact_id=contact_id,
-                    message_hash=message_hash,
-                    context=context,
-                    response=ai_response.transformed_message,
-                    healing_score=ai_response.healing_score,
-                    model=ai_response.model_used or settings.AI_MODEL,
-                    sentiment=ai_response.sentiment.value,
-                    emotional_state=ai_response.emotional_state,
-                    user_id=user_id,
-                    expires_at=expires_at
-                )
-                return True
+                    PeeweeAIResponseCache.create(
+                        contact_id=contact_id,
+                        message_hash=message_hash,
+                        context=context,
+                        response=ai_response.transformed_message,
+                        healing_score=ai_response.healing_score,
+                        model=ai_response.model_used or settings.AI_MODEL,
+                        sentiment=ai_response.sentiment.value,
+                        emotional_state=ai_response.emotional_state,
+                        user_id=user_id,
+                        expires_at=expires_at
+                    )
+                    return True
+            
+            return await run_in_db_executor(_query)
         except Exception as e:
             print(f"Error saving to cache: {str(e)}")
             return False
@@ -401,41 +497,44 @@ class DatabaseManager:
             return await self._update_demo_contact(contact_id, contact_update, user_id)
         
         try:
-            with get_db_context():
-                # Build update data from non-None fields
-                update_data = {}
-                if contact_update.name is not None:
-                    update_data['name'] = contact_update.name
-                if contact_update.context is not None:
-                    update_data['context'] = contact_update.context.value
+            def _query():
+                with get_db_context():
+                    # Build update data from non-None fields
+                    update_data = {}
+                    if contact_update.name is not None:
+                        update_data['name'] = contact_update.name
+                    if contact_update.context is not None:
+                        update_data['context'] = contact_update.context.value
                 
-                if update_data:
-                    update_data['updated_at'] = datetime.now()
+                    if update_data:
+                        update_data['updated_at'] = datetime.now()
                     
-                    updated_count = (
-                        PeeweeContact.update(**update_data)
-                        .where(
-                            (PeeweeContact.id == contact_id) & 
-                            (PeeweeContact.user_id == user_id)
+                        updated_count = (
+                            PeeweeContact.update(**update_data)
+                            .where(
+                                (PeeweeContact.id == contact_id) & 
+                                (PeeweeContact.user_id == user_id)
+                            )
+                            .execute()
                         )
-                        .execute()
-                    )
                     
-                    if updated_count > 0:
-                        # Fetch and return updated contact
-                        updated_contact = PeeweeContact.get(
-                            (PeeweeContact.id == contact_id) & 
-                            (PeeweeContact.user_id == user_id)
-                        )
-                        return ContactResponse(
-                            id=updated_contact.id,
-                            name=updated_contact.name,
-                            context=ContextType(updated_contact.context),
-                            user_id=updated_contact.user_id,
-                            created_at=updated_contact.created_at,
-                            updated_at=updated_contact.updated_at
-                        )
-                return None
+                        if updated_count > 0:
+                            # Fetch and return updated contact
+                            updated_contact = PeeweeContact.get(
+                                (PeeweeContact.id == contact_id) & 
+                                (PeeweeContact.user_id == user_id)
+                            )
+                            return ContactResponse(
+                                id=updated_contact.id,
+                                name=updated_contact.name,
+                                context=ContextType(updated_contact.context),
+                                user_id=updated_contact.user_id,
+                                created_at=updated_contact.created_at,
+                                updated_at=updated_contact.updated_at
+                            )
+                    return None
+            
+            return await run_in_db_executor(_query)
         except Exception as e:
             print(f"Error updating contact: {str(e)}")
             return None
@@ -462,27 +561,34 @@ class DatabaseManager:
             return await self._delete_demo_contact(contact_id, user_id)
         
         try:
-            with get_db_context():
-                # Delete in proper order due to foreign key constraints
-                PeeweeMessage.delete().where(
-                    (PeeweeMessage.contact_id == contact_id) & 
-                    (PeeweeMessage.user_id == user_id)
-                ).execute()
+            def _query():
+                # Buffered inserts for this contact must land before the delete, not after it
+                write_behind.flush_now()
+                with get_db_context():
+                    # Delete in proper order due to foreign key constraints
+                    PeeweeMessage.delete().where(
+                        (PeeweeMessage.contact_id == contact_id) & 
+                        (PeeweeMessage.user_id == user_id)
+                    ).execute()
                 
-                PeeweeAIResponseCache.delete().where(
-                    (PeeweeAIResponseCache.contact_id == contact_id) & 
-                    (PeeweeAIResponseCache.user_id == user_id)
-                ).execute()
+                    PeeweeAIResponseCache.delete().where(
+                        (PeeweeAIResponseCache.contact_id == contact_id) & 
+                        (PeeweeAIResponseCache.user_id == user_id)
+                    ).execute()
                 
-                deleted_count = (
-                    PeeweeContact.delete()
-                    .where(
-                        (PeeweeContact.id == contact_id) & 
-                        (PeeweeContact.user_id == user_id)
+                    deleted_count = (
+                        PeeweeContact.delete()
+                        .where(
+                            (PeeweeContact.id == contact_id) & 
+                            (PeeweeContact.user_id == user_id)
+                        )
+                        .execute()
                     )
-                    .execute()
-                )
-                return deleted_count > 0
+                
+                    CacheCRUD.invalidate_memory_cache(contact_id=contact_id, user_id=user_id)
+                    return deleted_count > 0
+            
+            return await run_in_db_executor(_query)
         except Exception as e:
             print(f"Error deleting contact: {str(e)}")
             return False
@@ -516,116 +622,125 @@ class DatabaseManager:
             return None
         
         try:
-            with get_db_context():
-                peewee_contact = (
-                    PeeweeContact.select()
-                    .where(
-                        (PeeweeContact.id == contact_id) & 
-                        (PeeweeContact.user_id == user_id)
+            def _query():
+                with get_db_context():
+                    peewee_contact = (
+                        contacts_with_rollup()
+                        .where(
+                            (PeeweeContact.id == contact_id) & 
+                            (PeeweeContact.user_id == user_id)
+                        )
+                        .first()
                     )
-                    .first()
-                )
                 
-                if peewee_contact:
-                    return ContactResponse(
-                        id=peewee_contact.id,
-                        name=peewee_contact.name,
-                        context=ContextType(peewee_contact.context),
-                        user_id=peewee_contact.user_id,
-                        created_at=peewee_contact.created_at,
-                        updated_at=peewee_contact.updated_at
-                    )
-                return None
+                    if peewee_contact:
+                        return ContactResponse(
+                            id=peewee_contact.id,
+                            name=peewee_contact.name,
+                            context=ContextType(peewee_contact.context),
+                            user_id=peewee_contact.user_id,
+                            created_at=peewee_contact.created_at,
+                            updated_at=peewee_contact.updated_at,
+                            message_count=peewee_contact.message_count or 0,
+                            last_message_date=peewee_contact.last_message_date
+                        )
+                    return None
+            
+            return await run_in_db_executor(_query)
         except Exception as e:
             print(f"Error fetching contact: {str(e)}")
             return None
     
     async def get_message_stats(self, user_id: str, days: int = 30) -> Dict[str, Any]:
-        """Get message statistics with proper typing"""
+        """Get message statistics for the last `days` days (one GROUP BY query)"""
+        since_date = datetime.now() - timedelta(days=days)
         if self._is_demo_user(user_id):
-            return await self._get_demo_message_stats(user_id, days)
-        
+            demo_messages = self._get_demo_user_data(user_id, 'messages')
+            stats = MessageStats.from_messages(msg for msg in demo_messages if msg.created_at >= since_date)
+        else:
+            try:
+                stats = await run_in_db_executor(MessageStats.aggregate, user_id, since=since_date)
+            except Exception as e:
+                print(f"Error getting message stats: {str(e)}")
+                stats = empty_stats()
+        stats["period_days"] = days
+        return stats
+
+    async def get_contact_stats(self, contact_id: str, user_id: str) -> Dict[str, Any]:
+        """All-time message statistics for one contact (a single contact rollup row)"""
+        if self._is_demo_user(user_id):
+            demo_messages = self._get_demo_user_data(user_id, 'messages')
+            return MessageStats.from_messages(msg for msg in demo_messages if msg.contact_id == contact_id)
         try:
-            with get_db_context():
-                since_date = datetime.now() - timedelta(days=days)
-                
-                total_messages = (
-                    PeeweeMessage.select()
-                    .where(
-                        (PeeweeMessage.user_id == user_id) &
-                        (PeeweeMessage.created_at >= since_date)
-                    )
-                    .count()
-                )
-                
-                # Calculate average healing score
-                messages_with_scores = list(
-                    PeeweeMessage.select()
-                    .where(
-                        (PeeweeMessage.user_id == user_id) &
-                        (PeeweeMessage.created_at >= since_date) &
-                        (PeeweeMessage.healing_score.is_null(False))
-                    )
-                )
-                
-                if messages_with_scores:
-                    avg_healing_score = sum(msg.healing_score for msg in messages_with_scores) / len(messages_with_scores)
-                else:
-                    avg_healing_score = 0.0
-                
-                return {
-                    "total_messages": total_messages,
-                    "avg_healing_score": round(avg_healing_score, 2),
-                    "period_days": days,
-                    "messages_with_scores": len(messages_with_scores)
-                }
+            return await run_in_db_executor(MessageStats.aggregate, user_id, contact_id=contact_id)
         except Exception as e:
-            print(f"Error getting message stats: {str(e)}")
-            return {"total_messages": 0, "avg_healing_score": 0.0, "period_days": days}
+            print(f"Error getting contact stats: {str(e)}")
+            return empty_stats()
     
-    async def _get_demo_message_stats(self, user_id: str, days: int) -> Dict[str, Any]:
-        """Get demo message statistics"""
-        demo_messages = self._get_demo_user_data(user_id, 'messages')
-        since_date = datetime.now() - timedelta(days=days)
-        
-        recent_messages = [
-            msg for msg in demo_messages 
-            if msg.created_at >= since_date
-        ]
-        
-        total_messages = len(recent_messages)
-        
-        healing_scores = [
-            msg.healing_score for msg in recent_messages 
-            if msg.healing_score is not None
-        ]
-        
-        avg_healing_score = sum(healing_scores) / len(healing_scores) if healing_scores else 0.0
-        
-        return {
-            "total_messages": total_messages,
-            "avg_healing_score": round(avg_healing_score, 2),
-            "period_days": days,
-            "messages_with_scores": len(healing_scores)
+    async def export_user_data(self, user_id: str, export_format: str = "ndjson") -> AsyncIterator[bytes]:
+        """
+        Everything the user owns as a byte stream (see data/export.py); the header is built up front
+        so a broken database fails the request instead of truncating the download
+        """
+        stream, _ = EXPORT_FORMATS[export_format]
+        batch_size = settings.EXPORT_BATCH_SIZE
+        if self._is_demo_user(user_id):
+            header = {
+                "user_id": user_id,
+                "export_timestamp": datetime.now(),
+                "stats": MessageStats.from_messages(self._get_demo_user_data(user_id, 'messages')),
+            }
+            batches = memory_batches({
+                "contact": self._get_demo_user_data(user_id, 'contacts'),
+                "message": self._get_demo_user_data(user_id, 'messages'),
+                "feedback": self._get_demo_user_data(user_id, 'feedback'),
+            }, batch_size)
+        else:
+            header = await export_header(user_id)
+            batches = database_batches(user_id, batch_size)
+        return stream(header, batches)
+
+    def start_user_purge(self, user_id: str) -> PurgeJob:
+        """Erase everything the user owns in the background; poll the returned job for progress"""
+        if self._is_demo_user(user_id):
+            return purge_jobs.start(user_id, self._purge_demo_user)
+        return purge_jobs.start(user_id)
+
+    def _purge_demo_user(self, user_id: str, progress=None) -> Dict[str, int]:
+        """Drop a demo user's in-memory data"""
+        deleted = {
+            name: len(store.pop(user_id, None) or ())
+            for name, store in (
+                ("contacts", self._demo_contacts),
+                ("messages", self._demo_messages),
+                ("feedback", self._demo_feedback),
+                ("ai_response_cache", self._demo_cache),
+            )
         }
-    
+        if progress is not None:
+            progress(deleted, dict(deleted))
+        return deleted
+
     async def clean_expired_cache(self, user_id: Optional[str] = None) -> int:
         """Clean expired cache entries and return count of cleaned entries"""
         if user_id and self._is_demo_user(user_id):
             return await self._clean_demo_expired_cache(user_id)
         
         try:
-            with get_db_context():
-                query = PeeweeAIResponseCache.delete().where(
-                    PeeweeAIResponseCache.expires_at < datetime.now()
-                )
+            def _query():
+                with get_db_context():
+                    query = PeeweeAIResponseCache.delete().where(
+                        PeeweeAIResponseCache.expires_at < datetime.now()
+                    )
                 
-                if user_id:
-                    query = query.where(PeeweeAIResponseCache.user_id == user_id)
+                    if user_id:
+                        query = query.where(PeeweeAIResponseCache.user_id == user_id)
                 
-                deleted_count = query.execute()
-                print(f"🧹 Cleaned {deleted_count} expired cache entries")
-                return deleted_count
+                    deleted_count = query.execute()
+                    print(f"🧹 Cleaned {deleted_count} expired cache entries")
+                    return deleted_count
+            
+            return await run_in_db_executor(_query)
         except Exception as e:
             print(f"Error cleaning expired cache: {str(e)}")
             return 0
@@ -658,14 +773,17 @@ class DatabaseManager:
     async def health_check(self) -> Dict[str, Any]:
         """Check database health"""
         try:
-            with get_db_context():
-                # Simple query to test database connectivity
-                PeeweeContact.select().limit(1).execute()
-                return {
-                    "database": True,
-                    "demo_users": len(self._demo_contacts),
-                    "timestamp": datetime.now()
-                }
+            def _query():
+                with get_db_context():
+                    # Simple query to test database connectivity
+                    PeeweeContact.select().limit(1).execute()
+                    return {
+                        "database": True,
+                        "demo_users": len(self._demo_contacts),
+                        "timestamp": datetime.now()
+                    }
+            
+            return await run_in_db_executor(_query)
         except Exception as e:
             print(f"Database health check failed: {str(e)}")
             return {
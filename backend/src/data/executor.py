@@ -0,0 +1,96 @@
+# backend/src/data/executor.py
+"""
+Database executor for The Third Voice AI
+Runs blocking Peewee/SQLite calls on a dedicated thread pool so they never stall the event loop
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from ..core.config import settings
+from ..core.exceptions import DatabaseException
+
+
+class DatabaseExecutor:
+    """Bounded thread pool for synchronous database work"""
+
+    def __init__(self, max_workers: int, max_queue: int, queue_timeout: float):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # Running + queued calls; callers beyond this wait (up to queue_timeout) instead of piling onto the pool
+        self._slots = asyncio.Semaphore(max_workers + max_queue)
+        self.in_flight = 0
+        self.rejected = 0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="db")
+        return self._pool
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) on the database pool and await its result"""
+        if self._slots.locked():
+            try:
+                await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise DatabaseException("Database is busy, please retry", operation=getattr(fn, "__name__", "query"))
+        else:
+            await self._slots.acquire()
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), functools.partial(fn, *args, **kwargs))
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "queue_size": self.max_queue,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected
+        }
+
+    def shutdown(self, wait: bool = True, on_thread_exit: Optional[Callable[[], Any]] = None):
+        """Stop the pool (called from the app lifespan on shutdown)
+        
+        on_thread_exit runs once on every worker thread first, e.g. to close its SQLite connection
+        """
+        if self._pool is None:
+            return
+        if on_thread_exit is not None:
+            barrier = threading.Barrier(self.max_workers)
+
+            def run_on_each_thread():
+                try:
+                    barrier.wait(timeout=1.0)
+                except threading.BrokenBarrierError:
+                    pass
+                on_thread_exit()
+
+            for _ in range(self.max_workers):
+                self._pool.submit(run_on_each_thread)
+        self._pool.shutdown(wait=wait)
+        self._pool = None
+
+
+# Global database executor
+db_executor = DatabaseExecutor(
+    max_workers=settings.DB_EXECUTOR_WORKERS,
+    max_queue=settings.DB_EXECUTOR_QUEUE_SIZE,
+    queue_timeout=settings.DB_EXECUTOR_QUEUE_TIMEOUT
+)
+
+
+async def run_in_db_executor(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Await a blocking database call without blocking the event loop"""
+    return await db_executor.run(fn, *args, **kwargs)
+
@@ -0,0 +1,138 @@
+# backend/src/data/export.py
+"""
+Streaming user data export for The Third Voice
+Each table is walked in keyset-ordered batches on the database executor and written out as
+NDJSON (or NDJSON files inside a zip) chunk by chunk, so memory stays flat however much
+history a user has.
+"""
+
+import json
+import zipfile
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from peewee import ModelSelect
+
+from .executor import run_in_db_executor
+from .message_stats import MessageStats, contacts_with_rollup
+from .pagination import keyset_page
+from .peewee_models import Contact, Feedback, Message, get_db_context
+from .write_behind import write_behind
+
+# Tables in export order: (record type, file name inside the zip)
+EXPORT_TABLES = (("contact", "contacts.ndjson"), ("message", "messages.ndjson"), ("feedback", "feedback.ndjson"))
+
+Batch = Tuple[str, List[Dict[str, Any]]]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return getattr(value, "value", str(value))
+
+
+def _line(record: Dict[str, Any]) -> bytes:
+    return (json.dumps(record, default=_json_default, separators=(",", ":")) + "\n").encode()
+
+
+def _contact_record(contact: Contact) -> Dict[str, Any]:
+    return {
+        **contact.__data__,
+        "message_count": getattr(contact, "message_count", None) or 0,
+        "last_message_date": getattr(contact, "last_message_date", None),
+    }
+
+
+def _table_queries(user_id: str) -> Dict[str, Tuple[Callable[[], ModelSelect], Any, Callable[[Any], Dict[str, Any]]]]:
+    return {
+        "contact": (lambda: contacts_with_rollup().where(Contact.user_id == user_id), Contact, _contact_record),
+        "message": (lambda: Message.select().where(Message.user_id == user_id), Message, lambda row: dict(row.__data__)),
+        "feedback": (lambda: Feedback.select().where(Feedback.user_id == user_id), Feedback, lambda row: dict(row.__data__)),
+    }
+
+
+async def export_header(user_id: str) -> Dict[str, Any]:
+    """First record of an export: who, when, and the all-time stats (one rollup lookup)"""
+    # Make queued write-behind rows part of the export
+    await run_in_db_executor(write_behind.flush_now)
+    stats = await run_in_db_executor(MessageStats.aggregate, user_id)
+    return {"user_id": user_id, "export_timestamp": datetime.now(), "stats": stats}
+
+
+async def database_batches(user_id: str, batch_size: int) -> AsyncIterator[Batch]:
+    """Every row the user owns, table by table, batch_size rows per executor job (newest first)"""
+    for record_type, (make_query, model, to_record) in _table_queries(user_id).items():
+        cursor: Optional[str] = None
+        while True:
+            def _fetch(cursor=cursor):
+                with get_db_context():
+                    rows, next_cursor = keyset_page(make_query(), model, batch_size, cursor)
+                    return [to_record(row) for row in rows], next_cursor
+
+            records, cursor = await run_in_db_executor(_fetch)
+            if records:
+                yield record_type, records
+            if cursor is None:
+                break
+
+
+async def memory_batches(tables: Dict[str, List[Any]], batch_size: int) -> AsyncIterator[Batch]:
+    """Same batches from in-memory Pydantic rows (demo users)"""
+    for record_type, _ in EXPORT_TABLES:
+        rows = tables.get(record_type) or []
+        for start in range(0, len(rows), batch_size):
+            yield record_type, [row.model_dump() for row in rows[start:start + batch_size]]
+
+
+async def ndjson_stream(header: Dict[str, Any], batches: AsyncIterator[Batch]) -> AsyncIterator[bytes]:
+    """One JSON object per line: an "export" header, then {"type": ..., "data": {...}} per row"""
+    yield _line({"type": "export", "data": header})
+    async for record_type, records in batches:
+        yield b"".join(_line({"type": record_type, "data": record}) for record in records)
+
+
+class _ChunkSink:
+    """Write-only file object collecting zip output until the stream hands it to the client"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+async def zip_stream(header: Dict[str, Any], batches: AsyncIterator[Batch]) -> AsyncIterator[bytes]:
+    """manifest.json plus one NDJSON file per table, compressed on the fly (no seeking, so no buffering)"""
+    file_names = dict(EXPORT_TABLES)
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("manifest.json", json.dumps(header, default=_json_default, indent=2))
+        yield sink.drain()
+
+        current_type, member = None, None
+        async for record_type, records in batches:
+            if record_type != current_type:
+                if member is not None:
+                    member.close()
+                current_type = record_type
+                member = archive.open(file_names[record_type], "w", force_zip64=True)
+            member.write(b"".join(_line(record) for record in records))
+            yield sink.drain()
+        if member is not None:
+            member.close()
+    yield sink.drain()
+
+
+# format -> (stream function, media type)
+EXPORT_FORMATS = {
+    "ndjson": (ndjson_stream, "application/x-ndjson"),
+    "zip": (zip_stream, "application/zip"),
+}
@@ -0,0 +1,172 @@
+# backend/src/data/menu_store.py
+"""
+Menu snapshot store for Sip & Sing
+Keeps one Supabase client and an in-memory, versioned copy of the menu with lookup indexes,
+so menu requests never wait on a remote query
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional
+
+from ..core.config import settings
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+
+@lru_cache(maxsize=1)
+def get_supabase() -> "Client":
+    """Long-lived Supabase client shared by every request"""
+    from supabase import create_client
+
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_KEY")
+    return create_client(url, key)
+
+
+class MenuSnapshot:
+    """Immutable copy of the menu with precomputed indexes"""
+
+    def __init__(self, items: List[Dict[str, Any]], version: int):
+        self.items = sorted(items, key=lambda item: item.get("code") or "")
+        self.version = version
+        self.loaded_at = datetime.now()
+        self.by_id: Dict[str, Dict[str, Any]] = {item["id"]: item for item in self.items}
+        self.by_code: Dict[str, Dict[str, Any]] = {item["code"].upper(): item for item in self.items if item.get("code")}
+        self.by_category: Dict[str, List[Dict[str, Any]]] = {}
+        self.options_by_id: Dict[str, Dict[str, Any]] = {}
+        for item in self.items:
+            self.by_category.setdefault(item["category"], []).append(item)
+            for option in item.get("options") or []:
+                self.options_by_id[option["id"]] = {**option, "menu_item_id": item["id"]}
+        self.categories = sorted(self.by_category)
+        self.digest = self.compute_digest(self.items)
+        self._memo: Dict[Hashable, Any] = {}
+
+    @staticmethod
+    def compute_digest(items: List[Dict[str, Any]]) -> str:
+        """Content hash, used to bump the version only when the menu actually changed"""
+        encoded = json.dumps(items, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()[:16]
+
+    def filter(self, category: Optional[str] = None, available: Optional[bool] = None) -> List[Dict[str, Any]]:
+        items = self.by_category.get(category, []) if category else self.items
+        if available is not None:
+            items = [item for item in items if item.get("available", True) == available]
+        return items
+
+    def memo(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Compute something derived from this snapshot once (e.g. an encoded response body)"""
+        value = self._memo.get(key)
+        if value is None:
+            value = self._memo[key] = factory()
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "digest": self.digest,
+            "items": len(self.items),
+            "categories": len(self.categories),
+            "loaded_at": self.loaded_at.isoformat()
+        }
+
+
+class MenuStore:
+    """Loads the menu from Supabase and refreshes it periodically or on demand"""
+
+    def __init__(self, refresh_seconds: float, min_refresh_gap: float):
+        self.refresh_seconds = refresh_seconds
+        self.min_refresh_gap = min_refresh_gap
+        self.snapshot: Optional[MenuSnapshot] = None
+        self._refreshed_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self.refresh_errors = 0
+
+    def _fetch_items(self) -> List[Dict[str, Any]]:
+        """Blocking Supabase query, run off the event loop"""
+        response = (
+            get_supabase().table("menu_items")
+            .select("*, options:menu_item_options (id, label, price, sort_order)")
+            .order("code")
+            .execute()
+        )
+        return response.data or []
+
+    async def get(self) -> MenuSnapshot:
+        """Current snapshot, loading it on first use or when the periodic refresher isn't running"""
+        if self.snapshot is None or (self._is_stale() and not self.running):
+            return await self.refresh()
+        return self.snapshot
+
+    async def refresh(self, force: bool = False) -> MenuSnapshot:
+        """Reload the menu; concurrent callers share one query and a failed reload keeps the old snapshot"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            recent = time.monotonic() - self._refreshed_at < self.min_refresh_gap
+            if self.snapshot is not None and (recent or (not force and not self._is_stale())):
+                return self.snapshot
+
+            try:
+                items = await asyncio.to_thread(self._fetch_items)
+            except Exception as e:
+                self.refresh_errors += 1
+                if self.snapshot is None:
+                    raise
+                print(f"⚠️ Menu refresh failed, serving snapshot v{self.snapshot.version}: {e}")
+                return self.snapshot
+
+            self._refreshed_at = time.monotonic()
+            current = self.snapshot
+            candidate = MenuSnapshot(items, version=(current.version + 1) if current else 1)
+            if current is not None and candidate.digest == current.digest:
+                return current
+
+            self.snapshot = candidate
+            print(f"🍽️ Menu snapshot v{self.snapshot.version} loaded ({len(self.snapshot.items)} items)")
+            return self.snapshot
+
+    def _is_stale(self) -> bool:
+        return time.monotonic() - self._refreshed_at >= self.refresh_seconds
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start periodic background refreshes (app lifespan)"""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh(force=True)
+            except Exception as e:
+                print(f"⚠️ Menu refresh error: {e}")
+            await asyncio.sleep(self.refresh_seconds)
+
+
+# Global menu store
+menu_store = MenuStore(
+    refresh_seconds=settings.MENU_REFRESH_SECONDS,
+    min_refresh_gap=settings.MENU_MIN_REFRESH_GAP_SECONDS
+)
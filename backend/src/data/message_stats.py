@@ -0,0 +1,149 @@
+# backend/src/data/message_stats.py
+"""
+Message statistics for The Third Voice
+All-time stats are read from the rollup tables (one row, O(1)); windowed stats are computed
+by SQLite in one GROUP BY query, so stats stay fast no matter how much history a user has
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from peewee import JOIN, ModelSelect, fn
+
+from .peewee_models import Contact, ContactRollup, Message, UserRollup, get_db_context
+
+
+def _value(field: Any) -> Any:
+    """Enum members (demo data) and plain strings (database rows) alike"""
+    return getattr(field, "value", field)
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+ROLLUP_TYPES = ("transform", "interpret")
+ROLLUP_SENTIMENTS = ("positive", "neutral", "negative", "unknown")
+
+
+def contacts_with_rollup() -> ModelSelect:
+    """Contact select with message_count / last_message_date joined from the rollup table (no N+1)"""
+    return (
+        Contact.select(Contact, ContactRollup.message_count, ContactRollup.last_message_date)
+        .join(ContactRollup, JOIN.LEFT_OUTER, on=(
+            (ContactRollup.contact_id == Contact.id) & (ContactRollup.user_id == Contact.user_id)
+        ))
+        .objects()
+    )
+
+
+def empty_stats() -> Dict[str, Any]:
+    return {
+        "total_messages": 0,
+        "avg_healing_score": 0.0,
+        "messages_with_scores": 0,
+        "sentiment_breakdown": {},
+        "type_breakdown": {},
+        "last_message_date": None,
+    }
+
+
+class MessageStats:
+    """Message statistics per user (optionally per contact and time window)"""
+
+    @staticmethod
+    def _fold(groups: Iterable[Tuple[Any, Any, int, int, Optional[float], Any]]) -> Dict[str, Any]:
+        """Combine (type, sentiment, count, scored, score_total, last_created) groups into the stats dict"""
+        stats = empty_stats()
+        score_total = 0.0
+        for message_type, sentiment, count, scored, group_score_total, last_created in groups:
+            stats["total_messages"] += count
+            stats["messages_with_scores"] += scored
+            score_total += group_score_total or 0
+            if message_type:
+                stats["type_breakdown"][message_type] = stats["type_breakdown"].get(message_type, 0) + count
+            if sentiment:
+                stats["sentiment_breakdown"][sentiment] = stats["sentiment_breakdown"].get(sentiment, 0) + count
+            last_created = _as_datetime(last_created)
+            if last_created and (stats["last_message_date"] is None or last_created > stats["last_message_date"]):
+                stats["last_message_date"] = last_created
+
+        if stats["messages_with_scores"]:
+            stats["avg_healing_score"] = round(score_total / stats["messages_with_scores"], 2)
+        return stats
+
+    @staticmethod
+    def from_rollup(rollup: Optional[Any]) -> Dict[str, Any]:
+        """Stats dict from a ContactRollup/UserRollup row (None: no messages yet)"""
+        stats = empty_stats()
+        if rollup is None:
+            return stats
+        stats["total_messages"] = rollup.message_count
+        stats["messages_with_scores"] = rollup.scored_count
+        if rollup.scored_count:
+            stats["avg_healing_score"] = round(rollup.healing_score_sum / rollup.scored_count, 2)
+        stats["type_breakdown"] = {
+            name: getattr(rollup, f"{name}_count") for name in ROLLUP_TYPES if getattr(rollup, f"{name}_count")
+        }
+        stats["sentiment_breakdown"] = {
+            name: getattr(rollup, f"{name}_count") for name in ROLLUP_SENTIMENTS if getattr(rollup, f"{name}_count")
+        }
+        stats["last_message_date"] = _as_datetime(rollup.last_message_date)
+        return stats
+
+    @staticmethod
+    def aggregate(user_id: str, contact_id: Optional[str] = None,
+                  since: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Stats straight from SQLite, never loading the messages: all-time stats are a single rollup
+        row lookup, a time window is one row per (type, sentiment) pair
+        """
+        if since is None:
+            with get_db_context():
+                if contact_id is not None:
+                    rollup = ContactRollup.get_or_none(
+                        (ContactRollup.user_id == user_id) & (ContactRollup.contact_id == contact_id)
+                    )
+                else:
+                    rollup = UserRollup.get_or_none(UserRollup.user_id == user_id)
+            return MessageStats.from_rollup(rollup)
+
+        query = (
+            Message.select(
+                Message.type,
+                Message.sentiment,
+                fn.COUNT(Message.id),
+                fn.COUNT(Message.healing_score),
+                fn.SUM(Message.healing_score),
+                fn.MAX(Message.created_at)
+            )
+            .where(Message.user_id == user_id)
+        )
+        if contact_id is not None:
+            query = query.where(Message.contact_id == contact_id)
+        if since is not None:
+            query = query.where(Message.created_at >= since)
+
+        with get_db_context():
+            groups = list(query.group_by(Message.type, Message.sentiment).tuples())
+        return MessageStats._fold(groups)
+
+    @staticmethod
+    def from_messages(messages: Iterable[Any]) -> Dict[str, Any]:
+        """Same stats over in-memory messages (demo users)"""
+        return MessageStats._fold(
+            (
+                _value(message.type),
+                _value(message.sentiment),
+                1,
+                1 if message.healing_score is not None else 0,
+                message.healing_score,
+                message.created_at,
+            )
+            for message in messages
+        )
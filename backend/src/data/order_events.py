@@ -0,0 +1,116 @@
+# backend/src/data/order_events.py
+"""
+Order event broadcaster for Sip & Sing
+Sequenced order diffs fanned out to every connected staff device, with a replay buffer
+so a reconnecting client can resume from its last sequence number
+"""
+
+import asyncio
+import uuid
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from ..core.config import settings
+
+
+class OrderEventSubscription:
+    """One connected client: a bounded queue of events published after it subscribed"""
+
+    def __init__(self, max_queue: int):
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_queue)
+        self.overflowed = False
+
+    async def next(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Next event, or None if nothing arrived within timeout (time for a heartbeat)"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class OrderEventBroadcaster:
+    """In-process pub/sub with monotonic sequence numbers and a bounded replay log"""
+
+    def __init__(self, replay_size: int, subscriber_queue_size: int):
+        self.seq = 0
+        # Sequence numbers restart with the process (and differ per worker); the epoch tells cursors apart
+        self.epoch = uuid.uuid4().hex[:8]
+        self.subscriber_queue_size = subscriber_queue_size
+        self._log: "deque[Dict[str, Any]]" = deque(maxlen=replay_size)
+        self._subscribers: Set[OrderEventSubscription] = set()
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self.dropped_subscribers = 0
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        """Register an in-process callback run synchronously for every event (e.g. stats aggregation)"""
+        self._listeners.append(listener)
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        self.seq += 1
+        event = {"seq": self.seq, "type": event_type, "data": data}
+        self._log.append(event)
+
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                print(f"⚠️ Order event listener failed: {e}")
+
+        for subscription in list(self._subscribers):
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A stalled client must not hold up the others; it resumes from its cursor on reconnect
+                subscription.overflowed = True
+                self._subscribers.discard(subscription)
+                self.dropped_subscribers += 1
+        return event
+
+    def event_id(self, seq: int) -> str:
+        """SSE id for an event: "<epoch>:<seq>", handed back by the client as its resume cursor"""
+        return f"{self.epoch}:{seq}"
+
+    @staticmethod
+    def parse_event_id(value: str) -> Optional[Tuple[Optional[str], int]]:
+        """(epoch, seq) from an event id; a bare "<seq>" has no epoch. None if malformed"""
+        epoch, _, seq = value.strip().rpartition(":")
+        if not seq.isdigit():
+            return None
+        return epoch or None, int(seq)
+
+    def replay_since(self, cursor: int, epoch: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Events after cursor, or None when the client must resync: the cursor comes from another
+        process (epoch mismatch, or ahead of our seq after a restart) or is older than the replay log
+        """
+        if (epoch is not None and epoch != self.epoch) or cursor > self.seq:
+            return None
+        if cursor == self.seq:
+            return []
+        oldest = self._log[0]["seq"] if self._log else self.seq + 1
+        if cursor + 1 < oldest:
+            return None
+        return [event for event in self._log if event["seq"] > cursor]
+
+    def subscribe(self) -> OrderEventSubscription:
+        subscription = OrderEventSubscription(self.subscriber_queue_size)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: OrderEventSubscription):
+        self._subscribers.discard(subscription)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "seq": self.seq,
+            "subscribers": len(self._subscribers),
+            "replay_buffer": len(self._log),
+            "dropped_subscribers": self.dropped_subscribers
+        }
+
+
+# Global order event broadcaster
+order_events = OrderEventBroadcaster(
+    replay_size=settings.ORDER_EVENTS_REPLAY_SIZE,
+    subscriber_queue_size=settings.ORDER_EVENTS_SUBSCRIBER_QUEUE
+)
@@ -0,0 +1,174 @@
+# backend/src/data/order_stats.py
+"""
+Incremental order statistics for Sip & Sing
+Running counters per status, hour and menu category, updated from order events in O(1)
+instead of re-scanning every order on each change
+"""
+
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from .menu_store import menu_store
+
+FINISHED_STATUSES = ("completed", "cancelled")
+
+
+def _new_totals() -> Dict[str, float]:
+    return {"orders": 0, "revenue": 0.0}
+
+
+class OrderStatsAggregator:
+    """
+    Keeps today's counters up to date from order.created / order.updated / order.removed events.
+    Each order's contribution is remembered so a status change (e.g. cancellation) can be undone exactly.
+    """
+
+    def __init__(self, utc_offset_hours: float = 0.0):
+        self.tz = timezone(timedelta(hours=utc_offset_hours))
+        self.day: Optional[str] = None
+        self._contributions: Dict[str, Dict[str, Any]] = {}
+        self.by_status: Counter = Counter()
+        self.today = _new_totals()
+        self.hourly: Dict[int, Dict[str, float]] = defaultdict(_new_totals)
+        self.categories: Dict[str, Dict[str, float]] = defaultdict(lambda: {"quantity": 0, "revenue": 0.0})
+
+    def day_start(self) -> datetime:
+        """Midnight of the current business day, as an aware datetime"""
+        return datetime.now(self.tz).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def _local_time(self, created_at: Any) -> datetime:
+        if isinstance(created_at, str):
+            try:
+                created = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+            except ValueError:
+                created = datetime.now(timezone.utc)
+        elif isinstance(created_at, datetime):
+            created = created_at
+        else:
+            created = datetime.now(timezone.utc)
+        if created.tzinfo is None:
+            created = created.replace(tzinfo=timezone.utc)
+        return created.astimezone(self.tz)
+
+    def _roll_day(self, day: str):
+        """Start a new business day: reset the day's totals and forget finished orders from earlier days"""
+        if self.day is not None and day <= self.day:
+            return
+        self.day = day
+        self.today = _new_totals()
+        self.hourly.clear()
+        self.categories.clear()
+        for order_id in [oid for oid, c in self._contributions.items() if c["day"] < day]:
+            contribution = self._contributions[order_id]
+            contribution["counted"] = False  # Its revenue belonged to the previous day's totals
+            if contribution["status"] in FINISHED_STATUSES:
+                self._forget(order_id)
+
+    def _category_lines(self, order: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+        snapshot = menu_store.snapshot
+        lines: Dict[str, Dict[str, float]] = {}
+        for line in order.get("items") or []:
+            item = snapshot.by_id.get(line.get("item_id")) if snapshot else None
+            category = item["category"] if item else "other"
+            quantity = line.get("quantity") or 0
+            bucket = lines.setdefault(category, {"quantity": 0, "revenue": 0.0})
+            bucket["quantity"] += quantity
+            bucket["revenue"] += float(line.get("price") or 0) * quantity
+        return lines
+
+    def _apply_revenue(self, contribution: Dict[str, Any], sign: int):
+        total = contribution["total"] * sign
+        self.today["orders"] += sign
+        self.today["revenue"] += total
+        hour = self.hourly[contribution["hour"]]
+        hour["orders"] += sign
+        hour["revenue"] += total
+        for category, line in contribution["categories"].items():
+            bucket = self.categories[category]
+            bucket["quantity"] += line["quantity"] * sign
+            bucket["revenue"] += line["revenue"] * sign
+
+    def _counts_toward_today(self, contribution: Dict[str, Any]) -> bool:
+        return contribution["day"] == self.day and contribution["status"] != "cancelled"
+
+    def _forget(self, order_id: str):
+        contribution = self._contributions.pop(order_id, None)
+        if contribution is None:
+            return
+        if contribution["status"]:
+            self.by_status[contribution["status"]] -= 1
+        if contribution["counted"]:
+            self._apply_revenue(contribution, -1)
+
+    def add(self, order: Dict[str, Any]):
+        """Count a new (or re-synced) order"""
+        self._forget(order["id"])
+        created = self._local_time(order.get("created_at"))
+        day = created.date().isoformat()
+        self._roll_day(day)
+
+        contribution = {
+            "status": order.get("status") or "pending",
+            "day": day,
+            "hour": created.hour,
+            "total": float(order.get("total") or 0),
+            "categories": self._category_lines(order),
+            "counted": False,
+        }
+        if day < self.day and contribution["status"] in FINISHED_STATUSES:
+            return  # Finished before today: nothing to show
+
+        self._contributions[order["id"]] = contribution
+        self.by_status[contribution["status"]] += 1
+        if self._counts_toward_today(contribution):
+            contribution["counted"] = True
+            self._apply_revenue(contribution, 1)
+
+    def set_status(self, order_id: str, status: str):
+        contribution = self._contributions.get(order_id)
+        if contribution is None or contribution["status"] == status:
+            return
+        if contribution["status"]:
+            self.by_status[contribution["status"]] -= 1
+        self.by_status[status] += 1
+        contribution["status"] = status
+
+        counts = self._counts_toward_today(contribution)
+        if counts != contribution["counted"]:
+            contribution["counted"] = counts
+            self._apply_revenue(contribution, 1 if counts else -1)
+
+    def remove(self, order_id: str):
+        """Order left the active set without us seeing its final status: stop counting its status only"""
+        contribution = self._contributions.get(order_id)
+        if contribution is not None and contribution["status"]:
+            self.by_status[contribution["status"]] -= 1
+            contribution["status"] = None
+
+    def handle(self, event: Dict[str, Any]):
+        """Order event listener (see OrderEventBroadcaster.add_listener)"""
+        data = event["data"]
+        if event["type"] == "order.created":
+            self.add(data)
+        elif event["type"] == "order.updated" and "status" in data:
+            self.set_status(data["id"], data["status"])
+        elif event["type"] == "order.removed":
+            self.remove(data["id"])
+
+    def snapshot(self) -> Dict[str, Any]:
+        self._roll_day(datetime.now(self.tz).date().isoformat())
+        return {
+            "day": self.day,
+            "by_status": {status: count for status, count in self.by_status.items() if count > 0},
+            "today": {"orders": self.today["orders"], "revenue": round(self.today["revenue"], 2)},
+            "hourly": {
+                hour: {"orders": totals["orders"], "revenue": round(totals["revenue"], 2)}
+                for hour, totals in sorted(self.hourly.items()) if totals["orders"]
+            },
+            "categories": {
+                category: {"quantity": totals["quantity"], "revenue": round(totals["revenue"], 2)}
+                for category, totals in sorted(self.categories.items()) if totals["quantity"]
+            },
+        }
+
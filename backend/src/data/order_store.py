@@ -0,0 +1,302 @@
+# backend/src/data/order_store.py
+"""
+Order store for Sip & Sing
+In-memory kitchen queue indexed by status, backed by the Supabase orders table.
+New orders are group-committed in batches; active orders are reconciled periodically.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .menu_store import get_supabase
+from .order_events import OrderEventBroadcaster, order_events
+from .order_stats import OrderStatsAggregator
+from ..core.config import settings
+
+ORDER_STATUSES = ("pending", "preparing", "ready", "completed", "cancelled")
+ACTIVE_STATUSES = ("pending", "preparing", "ready")
+
+# Allowed kitchen workflow moves (mirrors the staff dashboard buttons)
+STATUS_TRANSITIONS = {
+    "pending": {"preparing", "cancelled"},
+    "preparing": {"ready", "cancelled"},
+    "ready": {"completed"},
+    "completed": set(),
+    "cancelled": set(),
+}
+
+
+class OrderQueue:
+    """Orders bucketed by status; finished orders are trimmed to the most recent few"""
+
+    def __init__(self, recent_limit: int):
+        self.recent_limit = recent_limit
+        self._by_status: Dict[str, "OrderedDict[str, Dict[str, Any]]"] = {
+            status: OrderedDict() for status in ORDER_STATUSES
+        }
+        self._status_of: Dict[str, str] = {}
+        self._touched_at: Dict[str, float] = {}
+
+    def get(self, order_id: str) -> Optional[Dict[str, Any]]:
+        status = self._status_of.get(order_id)
+        return self._by_status[status].get(order_id) if status else None
+
+    def put(self, order: Dict[str, Any]):
+        """Insert or move an order into its status bucket"""
+        order_id = order["id"]
+        self._discard(order_id)
+        status = order["status"] if order.get("status") in self._by_status else "pending"
+        bucket = self._by_status[status]
+        bucket[order_id] = order
+        self._status_of[order_id] = status
+        self._touched_at[order_id] = time.monotonic()
+
+        if status not in ACTIVE_STATUSES:
+            while len(bucket) > self.recent_limit:
+                stale_id, _ = bucket.popitem(last=False)
+                self._status_of.pop(stale_id, None)
+                self._touched_at.pop(stale_id, None)
+
+    def _discard(self, order_id: str):
+        status = self._status_of.pop(order_id, None)
+        if status:
+            self._by_status[status].pop(order_id, None)
+        self._touched_at.pop(order_id, None)
+
+    def list(self, statuses: Iterable[str] = ACTIVE_STATUSES) -> List[Dict[str, Any]]:
+        """Orders in the given statuses, newest first"""
+        orders = [order for status in statuses for order in self._by_status.get(status, {}).values()]
+        return sorted(orders, key=lambda order: str(order.get("created_at") or ""), reverse=True)
+
+    def counts(self) -> Dict[str, int]:
+        return {status: len(bucket) for status, bucket in self._by_status.items()}
+
+    def reconcile_active(self, rows: List[Dict[str, Any]], started_at: float) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Replace active orders with a fresh read from Supabase and return the resulting diffs.
+        Orders changed locally after the read started are left alone.
+        """
+        changes = []
+        fresh_ids = {row["id"] for row in rows}
+        for status in ACTIVE_STATUSES:
+            for order_id in list(self._by_status[status]):
+                if order_id not in fresh_ids and self._touched_at.get(order_id, 0) < started_at:
+                    self._discard(order_id)
+                    changes.append(("order.removed", {"id": order_id}))
+        for row in rows:
+            if self._touched_at.get(row["id"], 0) >= started_at:
+                continue
+            existing = self.get(row["id"])
+            if existing is None:
+                changes.append(("order.created", row))
+            else:
+                changed = {key: value for key, value in row.items() if existing.get(key) != value}
+                if not changed:
+                    continue
+                changes.append(("order.updated", {"id": row["id"], **changed}))
+            self.put(row)
+        return changes
+
+
+class OrderWriter:
+    """Group commit: orders submitted close together are inserted with one Supabase call"""
+
+    def __init__(self, batch_size: int, linger: float):
+        self.batch_size = batch_size
+        self.linger = linger
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.rows = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if not self.running:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._pending:
+            await self._flush()
+
+    def _insert(self, rows: List[Dict[str, Any]]):
+        get_supabase().table("orders").insert(rows).execute()
+
+    async def submit(self, row: Dict[str, Any]):
+        """Queue an order row and wait until the batch containing it is stored"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((row, future))
+        if self.running:
+            self._wake.set()
+        else:
+            await self._flush()
+        await future
+
+    async def _run(self):
+        while True:
+            await self._wake.wait()
+            if len(self._pending) < self.batch_size and self.linger > 0:
+                await asyncio.sleep(self.linger)
+            self._wake.clear()
+            while self._pending:
+                await self._flush()
+
+    async def _flush(self):
+        batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+        if not batch:
+            return
+        try:
+            await asyncio.to_thread(self._insert, [row for row, _ in batch])
+        except Exception as e:
+            print(f"❌ Failed to store {len(batch)} orders: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.rows += len(batch)
+        for _, future in batch:
+            if not future.done():
+                future.set_result(True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"pending": len(self._pending), "batches": self.batches, "rows": self.rows}
+
+
+class OrderService:
+    """Creates orders, moves them through the kitchen workflow and keeps the queue in sync"""
+
+    def __init__(self, writer: OrderWriter, queue: OrderQueue, resync_seconds: float,
+                 events: Optional[OrderEventBroadcaster] = None,
+                 aggregator: Optional[OrderStatsAggregator] = None):
+        self.writer = writer
+        self.queue = queue
+        self.events = events or OrderEventBroadcaster(replay_size=100, subscriber_queue_size=100)
+        self.aggregator = aggregator or OrderStatsAggregator()
+        self.events.add_listener(self.aggregator.handle)
+        self._loaded = False
+        self.resync_seconds = resync_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._status_locks: Dict[str, asyncio.Lock] = {}
+
+    def _fetch_active(self) -> List[Dict[str, Any]]:
+        response = (
+            get_supabase().table("orders")
+            .select("*")
+            .in_("status", list(ACTIVE_STATUSES))
+            .order("created_at")
+            .execute()
+        )
+        return response.data or []
+
+    def _fetch_since(self, since: datetime) -> List[Dict[str, Any]]:
+        response = (
+            get_supabase().table("orders")
+            .select("*")
+            .gte("created_at", since.isoformat())
+            .order("created_at")
+            .execute()
+        )
+        return response.data or []
+
+    def _update_status(self, order_id: str, status: str):
+        get_supabase().table("orders").update({"status": status}).eq("id", order_id).execute()
+
+    async def create_order(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        """Persist a validated order (batched) and add it to the kitchen queue"""
+        order.setdefault("status", "pending")
+        order.setdefault("created_at", datetime.now(timezone.utc).isoformat())
+        await self.writer.submit(order)
+        self.queue.put(order)
+        self.events.publish("order.created", order)
+        print(f"🧾 Order {order['id'][:8]} queued for {order.get('customer_name')}")
+        return order
+
+    async def set_status(self, order_id: str, status: str) -> Dict[str, Any]:
+        """Move an order to a new status; raises KeyError if unknown, ValueError if the move isn't allowed"""
+        lock = self._status_locks.setdefault(order_id, asyncio.Lock())
+        async with lock:
+            order = self.queue.get(order_id)
+            if order is None:
+                raise KeyError(order_id)
+            if status not in STATUS_TRANSITIONS.get(order["status"], set()):
+                raise ValueError(f"Cannot move order from {order['status']} to {status}")
+
+            await asyncio.to_thread(self._update_status, order_id, status)
+            updated = {**order, "status": status}
+            self.queue.put(updated)
+            self.events.publish("order.updated", {"id": order_id, "status": status})
+
+        if status not in ACTIVE_STATUSES:
+            self._status_locks.pop(order_id, None)
+        return updated
+
+    async def load_today(self):
+        """Seed the queue and stats with today's orders once at startup (finished ones included)"""
+        rows = await asyncio.to_thread(self._fetch_since, self.aggregator.day_start())
+        for row in rows:
+            if self.queue.get(row["id"]) is None:
+                self.queue.put(row)
+                self.aggregator.add(row)
+        self._loaded = True
+        print(f"🧾 Loaded {len(rows)} orders from today")
+
+    async def resync(self):
+        """Reload active orders (also picks up orders written to Supabase directly)"""
+        started_at = time.monotonic()
+        rows = await asyncio.to_thread(self._fetch_active)
+        for event_type, data in self.queue.reconcile_active(rows, started_at):
+            self.events.publish(event_type, data)
+
+    def start(self):
+        self.writer.start()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.writer.stop()
+
+    async def _run(self):
+        while True:
+            try:
+                if not self._loaded:
+                    await self.load_today()
+                await self.resync()
+            except Exception as e:
+                print(f"⚠️ Order resync failed: {e}")
+            await asyncio.sleep(self.resync_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"queue": self.queue.counts(), "writer": self.writer.stats(), "events": self.events.stats()}
+
+
+# Global order service
+order_service = OrderService(
+    writer=OrderWriter(batch_size=settings.ORDERS_BATCH_SIZE, linger=settings.ORDERS_BATCH_LINGER),
+    queue=OrderQueue(recent_limit=settings.ORDERS_RECENT_LIMIT),
+    resync_seconds=settings.ORDERS_RESYNC_SECONDS,
+    events=order_events,
+    aggregator=OrderStatsAggregator(utc_offset_hours=settings.ORDERS_STATS_UTC_OFFSET_HOURS)
+)
@@ -0,0 +1,59 @@
+# backend/src/data/pagination.py
+"""
+Keyset (cursor) pagination for The Third Voice
+Pages are ordered newest first on (created_at, id); the cursor encodes the last row of a page,
+so fetching page N reads one page of index entries instead of skipping N * limit rows.
+"""
+
+import base64
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple, TypeVar
+
+from peewee import ModelSelect, Tuple as SqlTuple
+
+from ..core.exceptions import ValidationException
+
+T = TypeVar("T")
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """Opaque cursor for the position just after (created_at, id)"""
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of encode_cursor; raises ValidationException for anything it didn't produce"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), row_id
+    except (ValueError, UnicodeDecodeError):
+        raise ValidationException("Invalid pagination cursor", field="cursor")
+
+
+def keyset_page(query: ModelSelect, model: Any, limit: int,
+                cursor: Optional[str] = None) -> Tuple[List[Any], Optional[str]]:
+    """Run one page of a query newest-first; returns (rows, next_cursor or None on the last page)"""
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(SqlTuple(model.created_at, model.id) < SqlTuple(created_at, row_id))
+    # One extra row tells us whether another page exists without a COUNT
+    rows = list(query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1))
+    return _split_page(rows, limit)
+
+
+def keyset_slice(items: Sequence[T], limit: int, cursor: Optional[str] = None) -> Tuple[List[T], Optional[str]]:
+    """Same paging over in-memory rows (demo users) so cursors behave identically"""
+    ordered = sorted(items, key=lambda item: (item.created_at, item.id), reverse=True)
+    if cursor:
+        position = decode_cursor(cursor)
+        ordered = [item for item in ordered if (item.created_at, item.id) < position]
+    return _split_page(ordered[:limit + 1], limit)
+
+
+def _split_page(rows: List[T], limit: int) -> Tuple[List[T], Optional[str]]:
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(page[-1].created_at, page[-1].id)
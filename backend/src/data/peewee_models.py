@@ -6,15 +6,21 @@ SQLite-based models with proper foreign key relationships
 
 from datetime import datetime, timedelta
 from peewee import *
+from playhouse.migrate import SqliteMigrator, migrate
 from contextlib import contextmanager
 import uuid
 import os
 
-from ..core.config import settings
+from ..core.config import settings, get_database_config
 
 
-# Initialize database
-database = SqliteDatabase(settings.DATABASE_PATH)
+# Initialize database with tuned pragmas (WAL, synchronous, cache/mmap size, busy timeout).
+# Peewee keeps connection state per thread, so every thread gets its own SQLite connection.
+database = SqliteDatabase(
+    settings.DATABASE_PATH,
+    pragmas=get_database_config()["pragmas"],
+    timeout=settings.DB_BUSY_TIMEOUT_MS / 1000
+)
 
 
 class BaseModel(Model):
@@ -72,7 +78,8 @@ class Message(BaseModel):
         table_name = 'messages'
         indexes = (
             # Composite indexes for common queries
-            (('contact_id', 'user_id'), False),
+            # created_at last so a contact's history pages straight off the index (keyset pagination)
+            (('contact_id', 'user_id', 'created_at'), False),
             (('user_id', 'created_at'), False),
         )
 
@@ -88,6 +95,7 @@ class AIResponseCache(BaseModel):
     model = TextField()
     sentiment = CharField(null=True)
     emotional_state = TextField(null=True)
+    payload = BlobField(null=True)  # Full AIResponse as compact JSON, zlib-compressed when large
     user_id = CharField(index=True)
     created_at = DateTimeField(default=datetime.now)
     expires_at = DateTimeField(default=lambda: datetime.now() + timedelta(days=7), index=True)
@@ -113,6 +121,9 @@ class Feedback(BaseModel):
     
     class Meta:
         table_name = 'feedback'
+        indexes = (
+            (('user_id', 'created_at'), False),
+        )
 
 
 class DemoUsage(BaseModel):
@@ -126,35 +137,180 @@ class DemoUsage(BaseModel):
         table_name = 'demo_usage'
 
 
+class ContactRollup(BaseModel):
+    """Running message totals per contact, maintained by triggers on messages (see ROLLUP_TRIGGERS)"""
+    user_id = CharField()
+    contact_id = CharField()
+    message_count = IntegerField(default=0)
+    scored_count = IntegerField(default=0)
+    healing_score_sum = IntegerField(default=0)
+    transform_count = IntegerField(default=0)
+    interpret_count = IntegerField(default=0)
+    positive_count = IntegerField(default=0)
+    neutral_count = IntegerField(default=0)
+    negative_count = IntegerField(default=0)
+    unknown_count = IntegerField(default=0)
+    last_message_date = DateTimeField(null=True)
+
+    class Meta:
+        table_name = 'contact_rollups'
+        primary_key = CompositeKey('user_id', 'contact_id')
+
+
+class UserRollup(BaseModel):
+    """Running message totals per user, maintained by triggers on messages (see ROLLUP_TRIGGERS)"""
+    user_id = CharField(primary_key=True)
+    message_count = IntegerField(default=0)
+    scored_count = IntegerField(default=0)
+    healing_score_sum = IntegerField(default=0)
+    transform_count = IntegerField(default=0)
+    interpret_count = IntegerField(default=0)
+    positive_count = IntegerField(default=0)
+    neutral_count = IntegerField(default=0)
+    negative_count = IntegerField(default=0)
+    unknown_count = IntegerField(default=0)
+    last_message_date = DateTimeField(null=True)
+
+    class Meta:
+        table_name = 'user_rollups'
+
+
 # All models for database operations
-MODELS = [User, Contact, Message, AIResponseCache, Feedback, DemoUsage]
+MODELS = [User, Contact, Message, AIResponseCache, Feedback, DemoUsage, ContactRollup, UserRollup]
+ROLLUP_MODELS = [ContactRollup, UserRollup]
+
+
+# Rollups are kept in SQLite triggers so every write path (write-behind batches, direct inserts,
+# contact/user deletes) updates them in the same transaction as the message row itself.
+# "IS" rather than "=" so a NULL type/sentiment counts as 0, not NULL.
+_ROLLUP_COUNTERS = (
+    ("message_count", "1"),
+    ("scored_count", "{row}.healing_score IS NOT NULL"),
+    ("healing_score_sum", "IFNULL({row}.healing_score, 0)"),
+    ("transform_count", "{row}.type IS 'transform'"),
+    ("interpret_count", "{row}.type IS 'interpret'"),
+    ("positive_count", "{row}.sentiment IS 'positive'"),
+    ("neutral_count", "{row}.sentiment IS 'neutral'"),
+    ("negative_count", "{row}.sentiment IS 'negative'"),
+    ("unknown_count", "{row}.sentiment IS 'unknown'"),
+)
+# (table, key columns) for each rollup level
+_ROLLUP_LEVELS = (("contact_rollups", ("user_id", "contact_id")), ("user_rollups", ("user_id",)))
+
+
+def _rollup_add_sql(table: str, keys, row: str) -> str:
+    columns = list(keys) + [name for name, _ in _ROLLUP_COUNTERS] + ["last_message_date"]
+    values = [f"{row}.{key}" for key in keys] + [expr.format(row=row) for _, expr in _ROLLUP_COUNTERS] + [f"{row}.created_at"]
+    updates = [f"{name} = {name} + excluded.{name}" for name, _ in _ROLLUP_COUNTERS]
+    updates.append("last_message_date = MAX(IFNULL(last_message_date, excluded.last_message_date), excluded.last_message_date)")
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(values)}) "
+        f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {', '.join(updates)};"
+    )
+
+
+def _rollup_remove_sql(table: str, keys, row: str) -> str:
+    match = " AND ".join(f"{key} = {row}.{key}" for key in keys)
+    updates = [f"{name} = {name} - ({expr.format(row=row)})" for name, expr in _ROLLUP_COUNTERS]
+    updates.append(f"last_message_date = (SELECT MAX(created_at) FROM messages WHERE {match})")
+    return (
+        f"UPDATE {table} SET {', '.join(updates)} WHERE {match}; "
+        f"DELETE FROM {table} WHERE {match} AND message_count <= 0;"
+    )
+
+
+def _rollup_triggers():
+    add_new = " ".join(_rollup_add_sql(table, keys, "NEW") for table, keys in _ROLLUP_LEVELS)
+    remove_old = " ".join(_rollup_remove_sql(table, keys, "OLD") for table, keys in _ROLLUP_LEVELS)
+    # A user purge drops the rollup rows first, so its message deletes skip the per-row upkeep
+    has_rollup = "WHEN EXISTS (SELECT 1 FROM user_rollups WHERE user_id = OLD.user_id)"
+    return {
+        "messages_rollup_insert": f"AFTER INSERT ON messages BEGIN {add_new} END",
+        "messages_rollup_delete": f"AFTER DELETE ON messages {has_rollup} BEGIN {remove_old} END",
+        "messages_rollup_update": f"AFTER UPDATE ON messages BEGIN {remove_old} {add_new} END",
+    }
+
+
+ROLLUP_TRIGGERS = _rollup_triggers()
+
+
+def rebuild_rollups(user_id: str = None):
+    """Recompute rollup rows from the messages table (initial backfill or repair), for one user or all"""
+    counters = ", ".join(
+        f"SUM({expr.format(row='messages')})" if name != "message_count" else "COUNT(*)"
+        for name, expr in _ROLLUP_COUNTERS
+    )
+    names = ", ".join(name for name, _ in _ROLLUP_COUNTERS)
+    where, params = ("WHERE user_id = ?", (user_id,)) if user_id is not None else ("", ())
+    with database.atomic():
+        for table, keys in _ROLLUP_LEVELS:
+            database.execute_sql(f"DELETE FROM {table} {where}", params)
+            database.execute_sql(
+                f"INSERT INTO {table} ({', '.join(keys)}, {names}, last_message_date) "
+                f"SELECT {', '.join(keys)}, {counters}, MAX(created_at) FROM messages {where} "
+                f"GROUP BY {', '.join(keys)}",
+                params
+            )
 
 
 @contextmanager
 def get_db_context():
-    """Context manager for database connections"""
+    """Context manager for database connections
+    
+    Connections are persistent and thread-local: the first use on a thread (event loop or
+    DB executor worker) opens one and later calls reuse it, so there is no connect/close per
+    query and nested contexts never close a connection underneath their caller.
+    """
     try:
         database.connect(reuse_if_open=True)
         yield database
     except Exception as e:
         print(f"Database error: {e}")
         raise
-    finally:
-        if not database.is_closed():
-            database.close()
+
+
+def close_db_connection():
+    """Close the calling thread's connection (e.g. on shutdown)"""
+    if not database.is_closed():
+        database.close()
 
 
 def create_tables():
     """Create all database tables"""
     try:
         with get_db_context():
-            database.create_tables(MODELS, safe=True)
+            new_rollups = not all(database.table_exists(model._meta.table_name) for model in ROLLUP_MODELS)
+            with database.atomic():
+                database.create_tables(MODELS, safe=True)
+                _add_missing_columns()
+                # Replaced on every start so trigger changes reach existing databases
+                for name, trigger in ROLLUP_TRIGGERS.items():
+                    database.execute_sql(f"DROP TRIGGER IF EXISTS {name}")
+                    database.execute_sql(f"CREATE TRIGGER {name} {trigger}")
+                if new_rollups:
+                    rebuild_rollups()
+                    print("📊 Message rollups backfilled")
             print("✅ Database tables created successfully")
     except Exception as e:
         print(f"❌ Error creating tables: {e}")
         raise
 
 
+def _add_missing_columns():
+    """Add columns introduced after a table was first created (SQLite won't do it for us)"""
+    migrator = SqliteMigrator(database)
+    operations = []
+    for model in MODELS:
+        table = model._meta.table_name
+        existing = {column.name for column in database.get_columns(table)}
+        for field in model._meta.sorted_fields:
+            if field.column_name not in existing:
+                print(f"🔧 Adding column {table}.{field.column_name}")
+                operations.append(migrator.add_column(table, field.column_name, field))
+    if operations:
+        migrate(*operations)
+
+
 def drop_tables():
     """Drop all database tables (for development)"""
     try:
@@ -0,0 +1,183 @@
+# backend/src/data/user_purge.py
+"""
+Account erasure (GDPR) for The Third Voice
+One DELETE per table inside a single transaction; accounts larger than PURGE_CHUNK_SIZE rows are
+erased in bounded chunks, one short transaction each, so other writers are never locked out for
+long. Erasures run as background jobs whose progress can be polled.
+"""
+
+import asyncio
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Set
+
+from .executor import run_in_db_executor
+from .memory_cache import ai_response_l1
+from .peewee_models import (
+    AIResponseCache, Contact, ContactRollup, Feedback, Message, User, UserRollup,
+    database, get_db_context, rebuild_rollups
+)
+from .write_behind import write_behind
+from ..core.config import settings
+
+# Children before parents; the users row goes last
+PURGE_TABLES = (Message, AIResponseCache, Contact, Feedback)
+
+Progress = Callable[[Dict[str, int], Dict[str, int]], None]
+
+
+def _is_demo_user(user_id: str) -> bool:
+    return user_id.startswith('demo-user-')
+
+
+def count_user_rows(user_id: str) -> Dict[str, int]:
+    """Rows the user owns per table (index-only counts)"""
+    with get_db_context():
+        totals = {
+            model._meta.table_name: model.select().where(model.user_id == user_id).count()
+            for model in PURGE_TABLES
+        }
+        if not _is_demo_user(user_id):
+            totals[User._meta.table_name] = User.select().where(User.id == user_id).count()
+    return totals
+
+
+def _delete_rollups(user_id: str):
+    # Derived data; with these rows gone the message delete trigger does no per-row upkeep
+    ContactRollup.delete().where(ContactRollup.user_id == user_id).execute()
+    UserRollup.delete().where(UserRollup.user_id == user_id).execute()
+
+
+def purge_user_data(user_id: str, chunk_size: Optional[int] = None,
+                    progress: Optional[Progress] = None) -> Dict[str, int]:
+    """
+    Delete everything the user owns (and the user row, unless demo); returns rows deleted per table.
+    progress(deleted, totals) is called after every statement.
+    """
+    chunk_size = settings.PURGE_CHUNK_SIZE if chunk_size is None else chunk_size
+    # Buffered inserts must land before the delete, not after it
+    write_behind.flush_now()
+
+    totals = count_user_rows(user_id)
+    deleted = {table: 0 for table in totals}
+
+    def report(table: str, count: int):
+        deleted[table] += count
+        if progress is not None:
+            progress(dict(deleted), totals)
+
+    with get_db_context():
+        if chunk_size <= 0 or sum(totals.values()) <= chunk_size:
+            with database.atomic():
+                _delete_rollups(user_id)
+                for model in PURGE_TABLES:
+                    report(model._meta.table_name, model.delete().where(model.user_id == user_id).execute())
+                if not _is_demo_user(user_id):
+                    report(User._meta.table_name, User.delete().where(User.id == user_id).execute())
+        else:
+            try:
+                with database.atomic():
+                    _delete_rollups(user_id)
+                for model in PURGE_TABLES:
+                    while True:
+                        with database.atomic():
+                            batch = model.select(model.id).where(model.user_id == user_id).limit(chunk_size)
+                            count = model.delete().where(model.id.in_(batch)).execute()
+                        report(model._meta.table_name, count)
+                        if count < chunk_size:
+                            break
+                if not _is_demo_user(user_id):
+                    report(User._meta.table_name, User.delete().where(User.id == user_id).execute())
+            except Exception:
+                # Committed chunks stay deleted; give the rows that are left their rollups back
+                rebuild_rollups(user_id)
+                raise
+
+    ai_response_l1.invalidate_where(lambda key, entry: entry.user_id == user_id)
+    print(f"✅ All data deleted for user: {user_id} ({sum(deleted.values())} rows)")
+    return deleted
+
+
+class PurgeJob:
+    """State of one background erasure, updated from the database thread as it goes"""
+
+    def __init__(self, user_id: str):
+        self.id = str(uuid.uuid4())
+        self.user_id = user_id
+        self.status = "queued"
+        self.totals: Dict[str, int] = {}
+        self.deleted: Dict[str, int] = {}
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def update(self, deleted: Dict[str, int], totals: Dict[str, int]):
+        self.deleted, self.totals = deleted, totals
+
+    def to_dict(self) -> Dict[str, Any]:
+        total_rows = sum(self.totals.values())
+        deleted_rows = sum(self.deleted.values())
+        if self.status == "completed":
+            percent = 100.0
+        else:
+            percent = round(100.0 * deleted_rows / total_rows, 1) if total_rows else 0.0
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "progress": min(percent, 100.0),
+            "deleted_rows": deleted_rows,
+            "total_rows": total_rows,
+            "deleted": self.deleted,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class PurgeJobs:
+    """Runs erasures on the database executor and keeps the most recent jobs for polling"""
+
+    def __init__(self, keep: int = 100):
+        self.keep = keep
+        self._jobs: "OrderedDict[str, PurgeJob]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def start(self, user_id: str, purge: Callable[..., Any] = purge_user_data) -> PurgeJob:
+        """Start erasing the user's data (or return their erasure already in progress)"""
+        for job in self._jobs.values():
+            if job.user_id == user_id and job.active:
+                return job
+
+        job = PurgeJob(user_id)
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.keep:
+            self._jobs.popitem(last=False)
+
+        task = asyncio.create_task(self._run(job, purge))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, job: PurgeJob, purge: Callable[..., Any]):
+        job.status = "running"
+        try:
+            await run_in_db_executor(purge, job.user_id, progress=job.update)
+            job.status = "completed"
+        except Exception as e:
+            print(f"❌ Data purge failed for user {job.user_id}: {e}")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = datetime.now()
+
+    def get(self, job_id: str) -> Optional[PurgeJob]:
+        return self._jobs.get(job_id)
+
+
+# Global erasure job registry
+purge_jobs = PurgeJobs()
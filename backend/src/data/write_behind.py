@@ -0,0 +1,177 @@
+# backend/src/data/write_behind.py
+"""
+Write-behind queue for The Third Voice AI
+Collects append-only inserts (messages, cache entries, feedback, demo usage) and writes them
+in batched transactions off the request path, flushing on size or interval
+"""
+
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Type
+
+from peewee import Model, chunked
+
+from .peewee_models import database, get_db_context
+from .executor import run_in_db_executor
+from ..core.config import settings
+
+# Stay under SQLite's bound-variable limit for multi-row INSERTs
+SQLITE_MAX_VARIABLES = 900
+
+
+class WriteBehindQueue:
+    """Buffers rows per model and flushes them with insert_many inside one transaction"""
+
+    def __init__(self, batch_size: int, flush_interval: float, max_pending: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._buffers: "OrderedDict[Type[Model], List[Dict[str, Any]]]" = OrderedDict()
+        self._pending = 0
+        self._lock = threading.Lock()
+        # Held for a whole flush (swap and write), so flush_now() also waits for a batch already in flight
+        self._flush_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.flushed_rows = 0
+        self.flushes = 0
+        self.dropped_rows = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the background flusher on the running event loop (app lifespan)"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        print(f"🗃️ Write-behind queue started (batch {self.batch_size}, every {self.flush_interval}s)")
+
+    async def drain(self):
+        """Stop the flusher and write everything still buffered (app shutdown)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        written = await run_in_db_executor(self.flush_now)
+        print(f"🗃️ Write-behind queue drained ({written} rows)")
+
+    def enqueue(self, model_class: Type[Model], row: Dict[str, Any]) -> bool:
+        """Buffer a row for insertion; returns False when the caller must write it directly"""
+        if not self.running:
+            return False
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                return False
+            self._buffers.setdefault(model_class, []).append(row)
+            self._pending += 1
+            full = self._pending >= self.batch_size
+
+        if full:
+            # May be called from a DB executor thread, so wake the flusher through the loop
+            self._loop.call_soon_threadsafe(self._wake.set)
+        return True
+
+    def write(self, model_class: Type[Model], **fields) -> Model:
+        """
+        Build a model instance (defaults such as id/created_at applied) and queue its insert.
+        Falls back to a direct insert when the queue is stopped or full.
+        """
+        instance = model_class(**fields)
+        if not self.enqueue(model_class, dict(instance.__data__)):
+            with get_db_context():
+                instance.save(force_insert=True)
+        return instance
+
+    async def awrite(self, model_class: Type[Model], **fields) -> Model:
+        """Async write(): enqueues on the event loop, only hops to the DB executor for a direct insert"""
+        if self.running:
+            instance = model_class(**fields)
+            if self.enqueue(model_class, dict(instance.__data__)):
+                return instance
+        return await run_in_db_executor(self.write, model_class, **fields)
+
+    def flush_now(self) -> int:
+        """
+        Write every buffered row in one transaction; returns the number of rows written.
+        When it returns, every row enqueued before the call is in SQLite (deletes rely on this).
+        """
+        with self._flush_lock:
+            return self._flush()
+
+    def _flush(self) -> int:
+        with self._lock:
+            buffers, self._buffers = self._buffers, OrderedDict()
+            self._pending = 0
+
+        if not buffers:
+            return 0
+
+        try:
+            with get_db_context():
+                with database.atomic():
+                    for model_class, rows in buffers.items():
+                        for batch in chunked(rows, max(1, SQLITE_MAX_VARIABLES // len(rows[0]))):
+                            model_class.insert_many(batch).execute()
+            written = sum(len(rows) for rows in buffers.values())
+        except Exception as e:
+            print(f"⚠️ Batched write failed, retrying row by row: {e}")
+            written = self._write_rows_individually(buffers)
+
+        self.flushes += 1
+        self.flushed_rows += written
+        return written
+
+    def _write_rows_individually(self, buffers: Dict[Type[Model], List[Dict[str, Any]]]) -> int:
+        """Fallback so one bad row doesn't lose the whole batch"""
+        written = 0
+        with get_db_context():
+            for model_class, rows in buffers.items():
+                for row in rows:
+                    try:
+                        model_class.insert(row).execute()
+                        written += 1
+                    except Exception as e:
+                        self.dropped_rows += 1
+                        print(f"❌ Dropped {model_class.__name__} row {row.get('id')}: {e}")
+        return written
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await run_in_db_executor(self.flush_now)
+            except Exception as e:
+                print(f"⚠️ Write-behind flush error: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "pending": self._pending,
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+            "flushes": self.flushes,
+            "flushed_rows": self.flushed_rows,
+            "dropped_rows": self.dropped_rows
+        }
+
+
+# Global write-behind queue (started/drained in the app lifespan when enabled)
+write_behind = WriteBehindQueue(
+    batch_size=settings.WRITE_BEHIND_BATCH_SIZE,
+    flush_interval=settings.WRITE_BEHIND_FLUSH_INTERVAL,
+    max_pending=settings.WRITE_BEHIND_MAX_PENDING
+)
@@ -2,24 +2,24 @@
 Menu API Router
 Handles menu items, categories, and options
 """
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from typing import Any, Callable, Hashable, List, Optional
 from pydantic import BaseModel
 from datetime import datetime
-import os
-from supabase import create_client, Client
 from dotenv import load_dotenv
+import gzip
+import hashlib
+import json
+
+# Menu data is served from an in-memory snapshot; Supabase is only hit on refresh
+from ..data.menu_store import menu_store, MenuSnapshot
+from ..core.config import settings
 
 load_dotenv()
 
 router = APIRouter()
 
-# Supabase client
-def get_supabase() -> Client:
-    url = os.getenv("SUPABASE_URL")
-    key = os.getenv("SUPABASE_KEY")
-    return create_client(url, key)
-
 # Pydantic models
 class MenuItemOption(BaseModel):
     id: str
@@ -38,54 +38,128 @@ class MenuItem(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+# HTTP caching: bodies are rendered once per snapshot and revalidated with ETags
+CACHE_CONTROL = (
+    f"public, max-age={settings.MENU_CACHE_MAX_AGE}, "
+    f"stale-while-revalidate={settings.MENU_STALE_WHILE_REVALIDATE}"
+)
+
+class EncodedBody:
+    """Compact JSON body with a strong ETag and a lazily built gzip variant"""
+
+    def __init__(self, payload: Any, version: int):
+        self.body = json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode()
+        self.etag = f'"m{version}-{hashlib.sha256(self.body).hexdigest()[:16]}"'
+        self.gzip_etag = self.etag[:-1] + '-gz"'
+        self._gzipped: Optional[bytes] = None
+
+    @property
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=6)
+        return self._gzipped
+
+def _etag_matches(if_none_match: Optional[str], encoded: EncodedBody) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return encoded.etag in tags or encoded.gzip_etag in tags
+
+def _accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() == "gzip":
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+def _menu_response(request: Request, snapshot: MenuSnapshot, key: Hashable,
+                   build: Callable[[], Any]) -> Response:
+    """Serve a memoized snapshot body, answering If-None-Match with 304 and gzip when accepted"""
+    encoded = snapshot.memo(key, lambda: EncodedBody(build(), snapshot.version))
+    use_gzip = (len(encoded.body) >= settings.MENU_GZIP_MIN_BYTES
+                and _accepts_gzip(request.headers.get("accept-encoding")))
+    headers = {
+        "ETag": encoded.gzip_etag if use_gzip else encoded.etag,
+        "Cache-Control": CACHE_CONTROL,
+        "Vary": "Accept-Encoding"
+    }
+
+    if _etag_matches(request.headers.get("if-none-match"), encoded):
+        return Response(status_code=304, headers=headers)
+
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=encoded.gzipped, media_type="application/json", headers=headers)
+    return Response(content=encoded.body, media_type="application/json", headers=headers)
+
 @router.get("/", response_model=List[MenuItem])
 async def get_menu_items(
+    request: Request,
     category: Optional[str] = None,
-    available: Optional[bool] = None,
-    supabase: Client = Depends(get_supabase)
+    available: Optional[bool] = None
 ):
     """
     Get all menu items, optionally filtered by category and availability
     """
     try:
-        query = supabase.table("menu_items").select("*")
-        
-        if category:
-            query = query.eq("category", category)
-        if available is not None:
-            query = query.eq("available", available)
-            
-        response = query.order("code").execute()
-        return response.data
+        snapshot = await menu_store.get()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    # Unknown categories all share one (empty) body so arbitrary input can't grow the memo
+    category_key = category if not category or category in snapshot.by_category else "?"
+    return _menu_response(
+        request, snapshot, ("items", category_key, available),
+        lambda: [MenuItem(**item) for item in snapshot.filter(category=category, available=available)]
+    )
 
 @router.get("/categories")
-async def get_categories(supabase: Client = Depends(get_supabase)):
+async def get_categories(request: Request):
     """
     Get all unique menu categories
     """
     try:
-        response = supabase.table("menu_items").select("category").execute()
-        categories = list(set(item["category"] for item in response.data))
-        return {"categories": sorted(categories)}
+        snapshot = await menu_store.get()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return _menu_response(request, snapshot, "categories", lambda: {"categories": snapshot.categories})
+
+@router.post("/refresh")
+async def refresh_menu():
+    """
+    Reload the menu snapshot from Supabase (e.g. after editing the menu)
+    """
+    try:
+        snapshot = await menu_store.refresh(force=True)
+        return snapshot.stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/code/{code}", response_model=MenuItem)
+async def get_menu_item_by_code(request: Request, code: str):
+    """
+    Get a specific menu item by its menu code (e.g. G1)
+    """
+    try:
+        snapshot = await menu_store.get()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    item = snapshot.by_code.get(code.upper())
+    if item is None:
+        raise HTTPException(status_code=404, detail="Menu item not found")
+    return _menu_response(request, snapshot, ("item", item["id"]), lambda: MenuItem(**item))
 
 @router.get("/{item_id}", response_model=MenuItem)
-async def get_menu_item(
-    item_id: str,
-    supabase: Client = Depends(get_supabase)
-):
+async def get_menu_item(request: Request, item_id: str):
     """
     Get a specific menu item by ID
     """
     try:
-        response = supabase.table("menu_items").select("*").eq("id", item_id).execute()
-        if not response.data:
-            raise HTTPException(status_code=404, detail="Menu item not found")
-        return response.data[0]
-    except HTTPException:
-        raise
+        snapshot = await menu_store.get()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    item = snapshot.by_id.get(item_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail="Menu item not found")
+    return _menu_response(request, snapshot, ("item", item_id), lambda: MenuItem(**item))
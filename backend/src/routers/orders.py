@@ -0,0 +1,240 @@
+"""
+Orders API Router
+Order placement validated against the cached menu, and the kitchen queue for the staff dashboard
+"""
+from fastapi import APIRouter, Depends, HTTPException, Header, Request
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Union
+from pydantic import BaseModel, Field
+import json
+import uuid
+
+from ..auth.auth_manager import get_current_user
+from ..data.menu_store import menu_store, MenuSnapshot
+from ..data.order_store import order_service, ACTIVE_STATUSES
+from ..data.schemas import UserResponse
+from ..core.config import settings
+
+router = APIRouter()
+
+OrderStatus = Literal["pending", "preparing", "ready", "completed", "cancelled"]
+
+# Pydantic models
+class OrderLineCreate(BaseModel):
+    item_id: Optional[str] = None
+    code: Optional[str] = None
+    option_id: Optional[str] = None
+    quantity: int = Field(1, ge=1, le=50)
+
+class OrderCreate(BaseModel):
+    customer_name: str = Field(..., min_length=1, max_length=100)
+    order_type: Literal["dine-in", "takeout"] = "dine-in"
+    table_number: Optional[str] = Field(None, max_length=20)
+    payment_method: str = Field("cash", max_length=20)
+    items: List[OrderLineCreate] = Field(..., min_length=1, max_length=100)
+
+class OrderLine(BaseModel):
+    item_id: Optional[str] = None
+    code: Optional[str] = None
+    name: str
+    option: Optional[str] = None
+    option_id: Optional[str] = None
+    price: float
+    quantity: int
+
+class Order(BaseModel):
+    id: str
+    customer_name: str
+    order_type: str
+    table_number: Optional[Union[str, int]] = None
+    items: List[OrderLine]
+    subtotal: float
+    tax: float = 0
+    total: float
+    status: str
+    payment_method: Optional[str] = None
+    payment_status: Optional[str] = None
+    created_at: Optional[str] = None
+
+class OrderStatusUpdate(BaseModel):
+    status: OrderStatus
+
+class OrderQueueResponse(BaseModel):
+    orders: List[Order]
+    counts: Dict[str, int]
+
+
+def _price_lines(lines: List[OrderLineCreate], snapshot: MenuSnapshot) -> List[Dict[str, Any]]:
+    """Resolve each line against the menu and take prices from the menu, never from the client"""
+    priced = []
+    for index, line in enumerate(lines):
+        if line.item_id:
+            item = snapshot.by_id.get(line.item_id)
+        else:
+            item = snapshot.by_code.get((line.code or "").upper())
+        if item is None:
+            raise HTTPException(status_code=422, detail=f"Item {index + 1}: unknown menu item")
+        if not item.get("available", True):
+            raise HTTPException(status_code=422, detail=f"Item {index + 1}: {item['name']} is not available")
+
+        option = None
+        if line.option_id:
+            option = snapshot.options_by_id.get(line.option_id)
+            if option is None or option["menu_item_id"] != item["id"]:
+                raise HTTPException(status_code=422, detail=f"Item {index + 1}: invalid option for {item['name']}")
+        elif item.get("options"):
+            raise HTTPException(status_code=422, detail=f"Item {index + 1}: choose an option for {item['name']}")
+
+        priced.append({
+            "item_id": item["id"],
+            "code": item["code"],
+            "name": item["name"],
+            "option": option["label"] if option else None,
+            "option_id": option["id"] if option else None,
+            "price": float(option["price"] if option else item["base_price"]),
+            "quantity": line.quantity,
+        })
+    return priced
+
+
+@router.post("/", response_model=Order, status_code=201)
+async def create_order(order_data: OrderCreate):
+    """
+    Place an order; line items and prices are checked against the current menu
+    """
+    if order_data.order_type == "dine-in" and not order_data.table_number:
+        raise HTTPException(status_code=422, detail="Table number is required for dine-in orders")
+
+    try:
+        snapshot = await menu_store.get()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Menu unavailable: {e}")
+
+    lines = _price_lines(order_data.items, snapshot)
+    subtotal = round(sum(line["price"] * line["quantity"] for line in lines), 2)
+    order = {
+        "id": str(uuid.uuid4()),
+        "customer_name": order_data.customer_name.strip(),
+        "order_type": order_data.order_type,
+        "table_number": order_data.table_number if order_data.order_type == "dine-in" else None,
+        "items": lines,
+        "subtotal": subtotal,
+        "tax": 0,
+        "total": subtotal,
+        "status": "pending",
+        "payment_method": order_data.payment_method.lower(),
+        "payment_status": "pending",
+    }
+
+    try:
+        return await order_service.create_order(order)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Could not store order: {e}")
+
+@router.get("/queue", response_model=OrderQueueResponse)
+async def get_order_queue(
+    status: Optional[OrderStatus] = None,
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Kitchen queue from memory: active orders by default, or a single status (staff only)
+    """
+    statuses = (status,) if status else ACTIVE_STATUSES
+    return {"orders": order_service.queue.list(statuses), "counts": order_service.queue.counts()}
+
+def _sse_event(event: str, data: Dict[str, Any], event_id: Optional[str] = None) -> str:
+    """Format one Server-Sent Event; the id doubles as the client's resume cursor"""
+    prefix = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{prefix}event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+async def _order_event_stream(request: Request, cursor: Optional[str]) -> AsyncIterator[str]:
+    """Replay from the cursor (or send a snapshot), then relay live order diffs"""
+    events = order_service.events
+    # Subscribe before reading the replay log so nothing published in between is lost
+    subscription = events.subscribe()
+    try:
+        position = events.parse_event_id(cursor) if cursor else None
+        replay = events.replay_since(position[1], epoch=position[0]) if position else None
+        if replay is None:
+            last_seq = events.seq
+            yield _sse_event("snapshot", {
+                "orders": order_service.queue.list(),
+                "counts": order_service.queue.counts()
+            }, events.event_id(last_seq))
+        else:
+            last_seq = position[1]
+            for event in replay:
+                last_seq = event["seq"]
+                yield _sse_event(event["type"], event["data"], events.event_id(last_seq))
+
+        while not await request.is_disconnected():
+            event = await subscription.next(timeout=settings.ORDER_EVENTS_HEARTBEAT_SECONDS)
+            if event is None:
+                if subscription.overflowed:
+                    break  # Fell too far behind; the client reconnects with Last-Event-ID
+                yield ": keep-alive\n\n"
+                continue
+            if event["seq"] <= last_seq:
+                continue  # Already sent as part of the replay/snapshot
+            last_seq = event["seq"]
+            yield _sse_event(event["type"], event["data"], events.event_id(last_seq))
+    finally:
+        events.unsubscribe(subscription)
+
+@router.get("/events")
+async def stream_order_events(
+    request: Request,
+    since: Optional[str] = None,
+    last_event_id: Optional[str] = Header(None),
+    current_user: UserResponse = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Server-Sent Events stream of order diffs for staff dashboards (authenticated)
+
+    Every event has "<epoch>:<seq>" as its SSE id. Reconnect with `?since=<id>` (or the browser's
+    automatic Last-Event-ID header) to resume; without a cursor, or when the cursor can't be
+    replayed (too old, or from before a restart or another worker), the stream starts with a
+    `snapshot` event of all active orders.
+    """
+    cursor = since or last_event_id
+    return StreamingResponse(
+        _order_event_stream(request, cursor),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/stats")
+async def get_order_stats():
+    """
+    Running order counters for the staff dashboard: per status, today's totals, per hour and per category
+    (cancelled orders are excluded from revenue)
+    """
+    return order_service.aggregator.snapshot()
+
+@router.get("/{order_id}", response_model=Order)
+async def get_order(order_id: str):
+    """
+    Get a specific order from the queue
+    """
+    order = order_service.queue.get(order_id)
+    if order is None:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return order
+
+@router.patch("/{order_id}/status", response_model=Order)
+async def update_order_status(
+    order_id: str,
+    update: OrderStatusUpdate,
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Move an order through pending → preparing → ready → completed (or cancelled); staff only
+    """
+    try:
+        return await order_service.set_status(order_id, update.status)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Order not found")
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Could not update order: {e}")
@@ -602,6 +602,243 @@ async def test_basic_functionality(fast_ai_engine):
     print("✅ Basic functionality test passed")
 
 
+@pytest.mark.skipif(not AI_ENGINE_AVAILABLE, reason="AI Engine dependencies not available")
+@pytest.mark.asyncio
+async def test_hedged_race_returns_fastest_model(fast_ai_engine, monkeypatch):
+    """A slow primary model is hedged and the faster backup wins the race"""
+    from src.ai.ai_engine import settings as engine_settings, ModelResult
+    monkeypatch.setattr(engine_settings, "AI_RACE_MODE", "hedged")
+    monkeypatch.setattr(engine_settings, "AI_RACE_WIDTH", 2)
+    monkeypatch.setattr(engine_settings, "AI_HEDGE_DELAY", 0.05)
+
+    slow_model = fast_ai_engine.models[0]["id"]
+    cancelled = []
+
+    async def fake_try_model(model_info, system_prompt, user_prompt, max_tokens=1000):
+        if model_info["id"] == slow_model:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(model_info["id"])
+                raise
+        return ModelResult(data=MOCK_OPENROUTER_RESPONSE)
+
+    monkeypatch.setattr(fast_ai_engine, "_try_model", fake_try_model)
+
+    response = await asyncio.wait_for(
+        fast_ai_engine._race_models(fast_ai_engine.models, "system", ["prompt"], 100, "interpret", "quick"),
+        timeout=2.0
+    )
+    await asyncio.sleep(0)
+
+    assert response is not None
+    assert response.model_id == fast_ai_engine.models[1]["id"]
+    assert cancelled == [slow_model]
+
+
+@pytest.mark.skipif(not AI_ENGINE_AVAILABLE, reason="AI Engine dependencies not available")
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status_code,text,failure,expected_calls", [
+    (429, "Rate limit exceeded", "rate_limited", 1),
+    (503, "Service unavailable", "server_error", 1),
+    (400, '{"error": {"message": "Input was flagged by moderation"}}', "filtered", 2),
+])
+async def test_sanitized_retry_only_on_content_filter(fast_ai_engine, status_code, text, failure, expected_calls):
+    """Rate limits and server errors move on to the next model; only filter rejections retry sanitized"""
+    calls = []
+
+    async def failing_post(*args, **kwargs):
+        calls.append(kwargs["json"]["messages"][1]["content"])
+        return MockHttpxResponse(status_code=status_code, text=text)
+
+    fast_ai_engine.client.post = failing_post
+    model_info = {"id": "test/model:free", "name": "Test"}
+
+    result = await fast_ai_engine._try_model(model_info, "system", "raw")
+    assert not result
+    assert result.failure.value == failure
+
+    calls.clear()
+    fast_ai_engine.model_health = type(fast_ai_engine.model_health)()
+    response = await fast_ai_engine._try_model_prompts(
+        model_info, "system", ["raw", "sanitized"], 100, "interpret", "quick"
+    )
+    assert response is None
+    assert calls == ["raw", "sanitized"][:expected_calls]
+
+
+@pytest.mark.skipif(not AI_ENGINE_AVAILABLE, reason="AI Engine dependencies not available")
+def test_http_client_uses_phase_timeouts_and_sized_pool(monkeypatch):
+    """The shared client gets per-phase timeouts from settings and a pool sized for concurrent races"""
+    engine_module = sys.modules["src.ai.ai_engine"]  # src.ai re-exports the ai_engine instance under this name
+    fake_httpx = MagicMock()
+    monkeypatch.setattr(engine_module, "httpx", fake_httpx)
+    monkeypatch.setattr(engine_module.settings, "API_TIMEOUT", 12.0)
+    monkeypatch.setattr(engine_module.settings, "MAX_BACKGROUND_TASKS", 4)
+    monkeypatch.setattr(engine_module.settings, "AI_RACE_WIDTH", 2)
+    monkeypatch.setattr(engine_module.settings, "AI_HTTP2", False)
+
+    engine_module._build_http_client()
+
+    timeout = fake_httpx.Timeout.call_args.kwargs
+    assert timeout["read"] == 12.0
+    assert timeout["connect"] == engine_module.settings.AI_CONNECT_TIMEOUT
+    limits = fake_httpx.Limits.call_args.kwargs
+    assert limits["max_connections"] == 8
+    assert limits["max_keepalive_connections"] == 4
+    assert fake_httpx.AsyncClient.call_args.kwargs["http2"] is False
+
+
+@pytest.mark.skipif(not AI_ENGINE_AVAILABLE, reason="AI Engine dependencies not available")
+def test_model_health_breaker_and_ordering():
+    """Failing models trip their breaker and faster models move to the front"""
+    from src.ai.model_health import ModelHealthTracker, BreakerState
+    from src.ai.ai_engine import settings as engine_settings
+
+    models = [
+        {"id": "slow/model:free", "name": "Slow"},
+        {"id": "fast/model:free", "name": "Fast"},
+        {"id": "down/model:free", "name": "Down"},
+    ]
+    tracker = ModelHealthTracker()
+
+    tracker.record_success("slow/model:free", 4.0)
+    tracker.record_success("fast/model:free", 0.5)
+    for _ in range(engine_settings.AI_BREAKER_FAILURE_THRESHOLD):
+        tracker.record_failure("down/model:free", "server_error_503")
+
+    assert [m["id"] for m in tracker.ordered_models(models)] == ["fast/model:free", "slow/model:free"]
+    assert not tracker.allow_request("down/model:free")
+
+    # Cooldown elapsed: one half-open probe is allowed, and a success closes the breaker
+    tracker._get("down/model:free").opened_at -= engine_settings.AI_BREAKER_COOLDOWN
+    assert tracker.allow_request("down/model:free")
+    assert not tracker.allow_request("down/model:free")
+    tracker.record_success("down/model:free", 1.0)
+    assert tracker._get("down/model:free").state == BreakerState.CLOSED
+
+    snapshot = tracker.snapshot(models)
+    assert [entry["state"] for entry in snapshot] == ["closed", "closed", "closed"]
+
+
+@pytest.mark.skipif(not AI_ENGINE_AVAILABLE, reason="AI Engine dependencies not available")
+@pytest.mark.asyncio
+async def test_identical_requests_share_one_upstream_call(fast_ai_engine, monkeypatch):
+    """Concurrent identical prompts are coalesced into a single model race"""
+    calls = []
+
+    async def fake_race(models, system_prompt, user_prompts, max_tokens, message_type, analysis_depth):
+        calls.append(user_prompts[0])
+        await asyncio.sleep(0.05)
+        return AIResponse(transformed_message="shared", explanation="shared", model_used="Mock Model")
+
+    monkeypatch.setattr(fast_ai_engine, "_race_models", fake_race)
+
+    responses = await asyncio.gather(*[
+        fast_ai_engine.process_message("same text", "friend", "transform", "anonymous", "anonymous")
+        for _ in range(5)
+    ])
+
+    assert len(calls) == 1
+    assert all(r.transformed_message == "shared" for r in responses)
+    assert len({id(r) for r in responses}) == 5
+    assert fast_ai_engine._inflight == {}
+
+
+@pytest.mark.skipif(not AI_ENGINE_AVAILABLE, reason="AI Engine dependencies not available")
+@pytest.mark.asyncio
+async def test_stream_message_emits_partials_then_result(fast_ai_engine, monkeypatch):
+    """Streaming yields tokens, the closed transformed_message early, and the full result last"""
+    chunks = ['{"transformed_message": "I feel ', 'hurt\\" too", "healing', '_score": 8, "alternatives": ["a"]}']
+
+    async def fake_stream(model_info, system_prompt, user_prompt, max_tokens=1000, outcome=None):
+        for chunk in chunks:
+            yield chunk
+
+    monkeypatch.setattr(fast_ai_engine, "_stream_model", fake_stream)
+
+    events = [event async for event in fast_ai_engine.stream_message(
+        "you never listen", "friend", "transform", "anonymous", "anonymous"
+    )]
+    names = [name for name, _ in events]
+
+    assert names.count("token") == len(chunks)
+    assert ("partial", {"transformed_message": 'I feel hurt" too'}) in events
+    assert names.index("partial") < len(names) - 1
+    assert names[-1] == "result"
+    assert events[-1][1]["healing_score"] == 8
+    assert events[-1][1]["alternatives"] == ["a"]
+
+
+@pytest.mark.skipif(not AI_ENGINE_AVAILABLE, reason="AI Engine dependencies not available")
+@pytest.mark.asyncio
+async def test_stream_records_truncated_completion(fast_ai_engine, monkeypatch):
+    """A stream that ends on finish_reason "length" tells the output-length tracker it was cut off"""
+    async def fake_stream(model_info, system_prompt, user_prompt, max_tokens=1000, outcome=None):
+        yield '{"transformed_message": "ok", "healing_score": 7}'
+        outcome.update(finish_reason="length", usage={"completion_tokens": 120})
+
+    monkeypatch.setattr(fast_ai_engine, "_stream_model", fake_stream)
+
+    events = [event async for event in fast_ai_engine.stream_message(
+        "stream budget check", "friend", "transform", "anonymous", "anonymous"
+    )]
+
+    assert events[-1][0] == "result"
+    assert fast_ai_engine.output_lengths.truncated == 1
+
+
+@pytest.mark.skipif(not AI_ENGINE_AVAILABLE, reason="AI Engine dependencies not available")
+@pytest.mark.asyncio
+async def test_truncated_responses_are_served_but_not_cached(fast_ai_engine, monkeypatch):
+    """An answer repaired from cut-off output is returned once, never stored for the cache TTL"""
+    engine_module = sys.modules["src.ai.ai_engine"]
+    cache_crud = MagicMock()
+    monkeypatch.setattr(engine_module, "CacheCRUD", cache_crud)
+    model = fast_ai_engine.models[0]
+
+    truncated = fast_ai_engine._build_ai_response(
+        fast_ai_engine._parse_ai_text('{"transformed_message": "I feel', "transform", "quick"),
+        model, "transform", "quick"
+    )
+    assert truncated.truncated and truncated.transformed_message == "I feel"
+    await fast_ai_engine._cache_ai_response(truncated, "hash-cut", "anonymous", "anonymous", "friend")
+    assert not cache_crud.cache_response.called
+
+    complete = fast_ai_engine._build_ai_response(
+        fast_ai_engine._parse_ai_text('{"transformed_message": "I feel hurt"}', "transform", "quick"),
+        model, "transform", "quick"
+    )
+    await fast_ai_engine._cache_ai_response(complete, "hash-whole", "anonymous", "anonymous", "friend")
+    assert cache_crud.cache_response.called
+
+
+@pytest.mark.skipif(not AI_ENGINE_AVAILABLE, reason="AI Engine dependencies not available")
+@pytest.mark.asyncio
+async def test_cache_hit_restores_full_payload(fast_ai_engine):
+    """A cached response comes back with its list fields, not just the summary columns"""
+    from types import SimpleNamespace
+    from src.data.cache_payload import pack_payload
+    from src.data.memory_cache import ai_response_l1, ai_response_key
+
+    original = AIResponse(
+        transformed_message="I miss you", explanation="softer", healing_score=8, model_used="Mock Model",
+        suggested_responses=["I hear you", "Tell me more"], alternatives=["I've missed you", "Miss you"]
+    )
+    entry = SimpleNamespace(payload=pack_payload(original.to_dict()), response="I miss you", healing_score=8,
+                            sentiment="positive", emotional_state="caring", model="Mock Model")
+    ai_response_l1.set(ai_response_key("hash-payload", "contact-payload"), entry)
+    try:
+        cached = await fast_ai_engine._get_cached_response("hash-payload", "contact-payload", "deep")
+    finally:
+        ai_response_l1.invalidate_where(lambda key, value: value is entry)
+
+    assert cached.suggested_responses == ["I hear you", "Tell me more"]
+    assert cached.alternatives == ["I've missed you", "Miss you"]
+    assert cached.explanation == "softer"
+    assert cached.analysis_depth == "deep"
+
+
 def run_integration_tests():
     """Run integration tests that don't require external APIs"""
     print("🧪 Running AI Engine Integration Tests...")
@@ -0,0 +1,45 @@
+"""Tests for tolerant JSON extraction from model output"""
+from src.ai.json_extract import TRUNCATED, extract_json
+
+
+def test_fenced_json_with_prose_and_trailing_comma():
+    """Code fences and surrounding prose are stripped, trailing commas repaired"""
+    text = 'Sure! Here you go:\n```json\n{"transformed_message": "Let\'s talk", "alternatives": ["a", "b",],}\n```\nHope it helps {:'
+    data = extract_json(text, "transform", "quick")
+    assert data["transformed_message"] == "Let's talk"
+    assert data["alternatives"] == ["a", "b"]
+
+
+def test_picks_the_object_matching_the_schema():
+    """With several objects, the first one valid for the message type wins; braces in strings are ignored"""
+    text = '{"note": "thinking {hard}"} then {"explanation": "They feel unheard }", "suggested_responses": "I hear you\\n- Tell me more"}'
+    data = extract_json(text, "interpret", "quick")
+    assert data["explanation"] == "They feel unheard }"
+    assert data["suggested_responses"] == ["I hear you", "Tell me more"]
+
+
+def test_truncated_object_is_closed():
+    """Output cut off by max_tokens keeps the fields that did arrive, flagged as truncated"""
+    text = '{"explanation": "They are tired", "suggested_responses": ["Rest up", "Can I he'
+    data = extract_json(text, "interpret", "deep")
+    assert data["explanation"] == "They are tired"
+    assert data["suggested_responses"] == ["Rest up", "Can I he"]
+    assert data[TRUNCATED] is True
+
+    data = extract_json('{"explanation": "They are tired", "subt', "interpret", "quick")
+    assert data == {"explanation": "They are tired", TRUNCATED: True}
+    assert TRUNCATED not in extract_json('{"explanation": "They are tired"}', "interpret", "quick")
+
+
+def test_healing_score_normalized():
+    """Scores like "8/10" become clamped ints"""
+    assert extract_json('{"explanation": "x", "healing_score": "8/10"}', "interpret", "quick")["healing_score"] == 8
+    assert extract_json('{"explanation": "x", "healing_score": 42}', "interpret", "quick")["healing_score"] == 10
+
+
+def test_prose_and_unusable_output_are_rejected():
+    """Prose (a refusal, a cut-off sentence) and JSON without a valid object are parse errors"""
+    assert extract_json("I can't help with that request.", "transform", "quick") is None
+    assert extract_json("Try saying: I miss you, and then maybe", "interpret", "quick") is None
+    assert extract_json('{"sentiment": "neutral"}', "interpret", "quick") is None
+    assert extract_json("   ", "interpret", "quick") is None
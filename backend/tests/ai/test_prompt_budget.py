@@ -0,0 +1,37 @@
+"""Tests for prompt token budgeting and adaptive max_tokens"""
+from src.ai.prompt_budget import OutputLengthTracker, estimate_tokens, fit_message, ELISION
+
+
+def test_fit_message_keeps_head_and_tail():
+    """Oversized messages keep their start and end within the budget; short ones are untouched"""
+    assert fit_message("short and sweet", 50) == "short and sweet"
+
+    message = "Opening words " + "filler " * 500 + "and the real ask at the end"
+    trimmed = fit_message(message, 60)
+    assert trimmed.startswith("Opening words")
+    assert trimmed.endswith("real ask at the end")
+    assert ELISION in trimmed
+    assert estimate_tokens(trimmed) <= 60
+
+
+def test_max_tokens_adapts_to_observed_lengths():
+    """Defaults apply until enough samples exist, then the percentile plus headroom, within bounds"""
+    tracker = OutputLengthTracker(window=50, min_samples=5, percentile=0.9, headroom=1.25, floor=100, ceiling=2000)
+    assert tracker.max_tokens("interpret", "deep") == 1500
+
+    for tokens in (200, 220, 240, 260, 300):
+        tracker.record("interpret", "deep", tokens)
+    assert tracker.max_tokens("interpret", "deep") == 375
+    assert tracker.max_tokens("transform", "quick") == 800  # Other kinds keep their default
+
+    for _ in range(5):
+        tracker.record("transform", "quick", 10)
+    assert tracker.max_tokens("transform", "quick") == 100  # Floor
+
+
+def test_truncated_completions_raise_the_budget():
+    """A completion cut off at max_tokens is recorded as needing more"""
+    tracker = OutputLengthTracker(window=10, min_samples=1, percentile=1.0, headroom=1.5, floor=1, ceiling=900)
+    tracker.record("transform", "quick", 400, truncated=True)
+    assert tracker.max_tokens("transform", "quick") == 900
+    assert tracker.truncated == 1
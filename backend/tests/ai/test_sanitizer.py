@@ -0,0 +1,32 @@
+"""Tests for the precompiled retry sanitizer"""
+from src.ai.sanitizer import MessageSanitizer, DEFAULT_LEXICON
+
+
+def test_whole_words_only_and_case_insensitive():
+    """Lexicon words are replaced in any case, but never inside other words"""
+    sanitizer = MessageSanitizer(DEFAULT_LEXICON)
+    assert sanitizer.sanitize("I could KILL him, I'd rather Die") == "I could harm him, I'd rather pass away"
+    assert sanitizer.sanitize("My diet needs skill and studies") == "My diet needs skill and studies"
+
+
+def test_wildcard_entries_cover_word_forms():
+    """Prefix/suffix wildcard entries catch inflections and compounds"""
+    sanitizer = MessageSanitizer(DEFAULT_LEXICON)
+    assert sanitizer.sanitize("This is fucking bullshit, motherfucker") == \
+        "This is [strong expletive] [expletive], [strong expletive]"
+    assert sanitizer.sanitize("they killed it") == "they harmed it"
+
+
+def test_custom_lexicon():
+    """A configured lexicon is used as-is; an empty one leaves text untouched"""
+    assert MessageSanitizer({"darn": "[mild]"}).sanitize("Darn it") == "[mild] it"
+    assert MessageSanitizer({}).sanitize("kill") == "kill"
+
+
+def test_every_form_of_deport_is_softened():
+    """Specific forms keep their grammar; any other form falls back to the deport* stem"""
+    sanitizer = MessageSanitizer(DEFAULT_LEXICON)
+    assert sanitizer.sanitize("Deportation scares me") == "removal from country scares me"
+    assert sanitizer.sanitize("He deports people, they deported her") == \
+        "He removes from country people, they removed from country her"
+    assert sanitizer.sanitize("deportees") == "remove from country"
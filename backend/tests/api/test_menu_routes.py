@@ -0,0 +1,71 @@
+"""Tests for menu HTTP caching (ETag / 304 / gzip) served from the snapshot"""
+import gzip
+import json
+import time
+
+import pytest
+from starlette.requests import Request
+
+from src.data.menu_store import MenuSnapshot, menu_store
+from src.routers import menu
+
+
+def make_item(item_id, code, category):
+    return {
+        "id": item_id, "code": code, "name": f"Item {code}", "category": category,
+        "description": "x" * 200, "base_price": 100, "available": True,
+        "created_at": "2025-01-01T00:00:00", "updated_at": "2025-01-01T00:00:00"
+    }
+
+
+def make_request(**headers):
+    raw = [(name.replace("_", "-").lower().encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/api/menu/", "headers": raw, "query_string": b""})
+
+
+@pytest.fixture(autouse=True)
+def snapshot():
+    previous = menu_store.snapshot, menu_store._refreshed_at
+    menu_store.snapshot = MenuSnapshot(
+        [make_item(str(i), f"G{i}", "grilled") for i in range(10)] + [make_item("s", "S1", "soup")],
+        version=1
+    )
+    menu_store._refreshed_at = time.monotonic()
+    yield
+    menu_store.snapshot, menu_store._refreshed_at = previous
+
+
+@pytest.mark.asyncio
+async def test_etag_revalidation_returns_304():
+    """A matching If-None-Match gets an empty 304 with the same ETag"""
+    first = await menu.get_categories(make_request())
+    assert first.status_code == 200
+    assert json.loads(first.body) == {"categories": ["grilled", "soup"]}
+    assert "stale-while-revalidate" in first.headers["cache-control"]
+
+    etag = first.headers["etag"]
+    second = await menu.get_categories(make_request(if_none_match=etag))
+    assert second.status_code == 304
+    assert second.body == b""
+    assert second.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_menu_is_gzipped_and_etag_changes_with_version():
+    """Large bodies are gzip-encoded on request; a new snapshot invalidates old ETags"""
+    response = await menu.get_menu_items(make_request(accept_encoding="gzip, br"))
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"].endswith('-gz"')
+    assert len(json.loads(gzip.decompress(response.body))) == 11
+
+    identity = await menu.get_menu_items(make_request(accept_encoding="gzip;q=0"))
+    assert "content-encoding" not in identity.headers
+    assert len(response.body) < len(identity.body)
+
+    etag = response.headers["etag"]
+    assert (await menu.get_menu_items(make_request(if_none_match=etag))).status_code == 304
+
+    menu_store.snapshot = MenuSnapshot([make_item("1", "G1", "grilled")], version=2)
+    refreshed = await menu.get_menu_items(make_request(if_none_match=etag))
+    assert refreshed.status_code == 200
+    assert len(json.loads(refreshed.body)) == 1
@@ -0,0 +1,88 @@
+"""Tests for the AI message routes: what they ask the model for"""
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from starlette.requests import Request
+
+from src.api.routes import messages
+
+MODEL_REPLY = ('{"transformed_message": "I feel unheard", "explanation": "They feel unheard", '
+               '"suggested_responses": ["I hear you"], "healing_score": 7}')
+
+
+def make_request(path):
+    return Request({"type": "http", "method": "POST", "path": path, "headers": [],
+                    "query_string": b"", "client": ("127.0.0.1", 1234)})
+
+
+class RecordingClient:
+    """Stands in for the OpenRouter httpx client and keeps every request body"""
+
+    def __init__(self):
+        self.bodies = []
+
+    async def post(self, url, headers=None, json=None):
+        self.bodies.append(json)
+        completion = {"choices": [{"message": {"content": MODEL_REPLY}, "finish_reason": "stop"}],
+                      "usage": {"completion_tokens": 40}}
+        return SimpleNamespace(status_code=200, json=lambda: completion, text="")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    engine = messages.ai_engine
+    client = RecordingClient()
+    monkeypatch.setattr(engine, "client", client)
+    monkeypatch.setattr(engine, "_prewarmed", True)
+    monkeypatch.setattr(engine, "output_lengths", type(engine.output_lengths).from_settings())
+
+    async def no_cache(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(engine, "_get_cached_response", no_cache)
+    monkeypatch.setattr(engine, "_cache_ai_response", no_cache)
+    return client
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("endpoint, deep, expected_max_tokens", [
+    ("quick_transform", False, 800),
+    ("quick_interpret", False, 1000),
+    ("quick_interpret", True, 1500),
+])
+async def test_routes_send_the_budget_for_their_depth(client, endpoint, deep, expected_max_tokens):
+    """The AnalysisDepth enum picked by the route selects the (type, depth) budget and prompt"""
+    body = messages.QuickMessageRequest(message=f"you never listen {uuid.uuid4()}", use_deep_analysis=deep)
+
+    await getattr(messages, endpoint)(make_request(f"/api/messages/{endpoint}"), body)
+
+    assert client.bodies[0]["max_tokens"] == expected_max_tokens
+    system_prompt = client.bodies[0]["messages"][0]["content"]
+    deep_prompt, _ = messages.ai_engine._get_deep_analysis_prompts("x", "friend")
+    assert (system_prompt == deep_prompt) == deep
+    assert messages.ai_engine.output_lengths.stats() == {
+        f"{endpoint.split('_')[1]}/{'deep' if deep else 'quick'}": {"samples": 1, "p50": 40, "max_tokens": expected_max_tokens}
+    }
+
+
+@pytest.mark.asyncio
+async def test_blocking_and_streaming_routes_share_cache_keys(monkeypatch):
+    """The same request hashes identically whichever endpoint it arrives on"""
+    engine = messages.ai_engine
+    hashes = []
+
+    async def cached(message_hash, contact_id, analysis_depth):
+        hashes.append((message_hash, analysis_depth))
+        return messages.AIResponse(transformed_message="cached", explanation="cached")
+
+    monkeypatch.setattr(engine, "_get_cached_response", cached)
+    monkeypatch.setattr(engine, "_prewarmed", True)
+    body = messages.QuickMessageRequest(message="you never listen", use_deep_analysis=True)
+
+    await messages.quick_transform(make_request("/api/messages/quick-transform"), body)
+    events = [event async for event in messages._stream_ai_events(body, "transform")]
+
+    assert events[-1].startswith("event: result")
+    assert hashes[0] == hashes[1]
+    assert hashes[0][1] == "deep"
@@ -0,0 +1,115 @@
+"""Tests for order line validation against the menu snapshot"""
+import pytest
+from fastapi import HTTPException
+
+from src.data.menu_store import MenuSnapshot
+from src.routers.orders import OrderLineCreate, _price_lines
+
+
+@pytest.fixture
+def snapshot():
+    return MenuSnapshot([
+        {"id": "g1", "code": "G1", "name": "Hungarian", "category": "grilled", "base_price": 95,
+         "available": True, "options": [{"id": "rice", "label": "With Rice", "price": 115, "sort_order": 2}]},
+        {"id": "s1", "code": "SOP1", "name": "Sinigang", "category": "soup", "base_price": 360,
+         "available": True, "options": []},
+        {"id": "x1", "code": "X1", "name": "Sold out", "category": "soup", "base_price": 10,
+         "available": False, "options": []},
+    ], version=1)
+
+
+def test_prices_come_from_the_menu(snapshot):
+    """Option and base prices are resolved server-side, by id or by code"""
+    lines = _price_lines([
+        OrderLineCreate(item_id="g1", option_id="rice", quantity=2),
+        OrderLineCreate(code="sop1"),
+    ], snapshot)
+
+    assert [(line["code"], line["option"], line["price"], line["quantity"]) for line in lines] == [
+        ("G1", "With Rice", 115.0, 2),
+        ("SOP1", None, 360.0, 1),
+    ]
+
+
+@pytest.mark.parametrize("line", [
+    OrderLineCreate(item_id="nope"),
+    OrderLineCreate(item_id="x1"),
+    OrderLineCreate(item_id="g1"),
+    OrderLineCreate(item_id="s1", option_id="rice"),
+])
+def test_invalid_lines_are_rejected(snapshot, line):
+    """Unknown, unavailable, missing-option and foreign-option lines get a 422"""
+    with pytest.raises(HTTPException) as error:
+        _price_lines([line], snapshot)
+    assert error.value.status_code == 422
+
+
+class ConnectedRequest:
+    """Stand-in for a client that stays connected for a fixed number of checks"""
+
+    def __init__(self, checks):
+        self.checks = checks
+
+    async def is_disconnected(self):
+        self.checks -= 1
+        return self.checks < 0
+
+
+@pytest.mark.asyncio
+async def test_event_stream_resumes_from_cursor():
+    """A reconnect with a cursor gets only the missed events, each tagged with its sequence id"""
+    from src.data.order_events import OrderEventBroadcaster
+    from src.data.order_store import order_service
+    from src.routers.orders import _order_event_stream
+
+    previous = order_service.events
+    order_service.events = OrderEventBroadcaster(replay_size=10, subscriber_queue_size=10)
+    try:
+        for order_id in ("a", "b", "c"):
+            order_service.events.publish("order.created", {"id": order_id})
+        epoch = order_service.events.epoch
+        chunks = [chunk async for chunk in _order_event_stream(ConnectedRequest(0), cursor=f"{epoch}:1")]
+        assert [chunk.split("\n")[0] for chunk in chunks] == [f"id: {epoch}:2", f"id: {epoch}:3"]
+
+        fresh = [chunk async for chunk in _order_event_stream(ConnectedRequest(0), cursor=None)]
+        assert fresh[0].startswith(f"id: {epoch}:3\nevent: snapshot")
+    finally:
+        order_service.events = previous
+
+
+@pytest.mark.asyncio
+async def test_event_stream_resyncs_a_cursor_from_before_a_restart():
+    """A cursor higher than the current seq (or from another epoch) gets a snapshot, then live events"""
+    from src.data.order_events import OrderEventBroadcaster
+    from src.data.order_store import order_service
+    from src.routers.orders import _order_event_stream
+
+    previous = order_service.events
+    order_service.events = OrderEventBroadcaster(replay_size=10, subscriber_queue_size=10)
+    try:
+        order_service.events.publish("order.created", {"id": "a"})
+        for cursor in ("old-epoch:40", "40"):
+            stream = _order_event_stream(ConnectedRequest(1), cursor=cursor)
+            first = await stream.__anext__()
+            assert "event: snapshot" in first
+            order_service.events.publish("order.created", {"id": cursor})
+            live = await stream.__anext__()
+            assert f'"id": "{cursor}"' in live
+            await stream.aclose()
+    finally:
+        order_service.events = previous
+
+
+def test_staff_routes_require_authentication():
+    """Queue, event stream and status changes are staff operations; placing an order is not"""
+    from src.auth.auth_manager import get_current_user
+    from src.routers.orders import router
+
+    def authenticated(path, method):
+        route = next(route for route in router.routes if route.path == path and method in route.methods)
+        return any(dependency.call is get_current_user for dependency in route.dependant.dependencies)
+
+    assert authenticated("/queue", "GET")
+    assert authenticated("/events", "GET")
+    assert authenticated("/{order_id}/status", "PATCH")
+    assert not authenticated("/", "POST")
@@ -0,0 +1,26 @@
+"""Tests for cached AI response payload encoding"""
+from src.data.cache_payload import pack_payload, unpack_payload
+
+
+def test_small_payload_round_trips_uncompressed(monkeypatch):
+    monkeypatch.setattr("src.data.cache_payload.settings.AI_CACHE_COMPRESS_MIN_BYTES", 10_000)
+    payload = {"transformed_message": "I feel hurt 💔", "alternatives": ["a", "b"], "healing_score": 7}
+
+    blob = pack_payload(payload)
+    assert blob[:1] == b"j"
+    assert unpack_payload(blob) == payload
+
+
+def test_large_payload_round_trips_compressed(monkeypatch):
+    monkeypatch.setattr("src.data.cache_payload.settings.AI_CACHE_COMPRESS_MIN_BYTES", 64)
+    payload = {"explanation": "why this helps " * 50, "suggested_responses": ["one", "two", "three"]}
+
+    blob = pack_payload(payload)
+    assert blob[:1] == b"z"
+    assert len(blob) < len(payload["explanation"])
+    assert unpack_payload(blob) == payload
+
+
+def test_missing_or_corrupt_payload_decodes_to_none():
+    assert unpack_payload(None) is None
+    assert unpack_payload(b"z not zlib") is None
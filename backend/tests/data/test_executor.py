@@ -0,0 +1,34 @@
+"""Tests for the database executor that keeps SQLite calls off the event loop"""
+import asyncio
+import threading
+
+import pytest
+
+from src.data.executor import DatabaseExecutor
+
+
+@pytest.mark.asyncio
+async def test_calls_run_on_database_threads():
+    """Blocking work runs on the db pool, not the event loop thread"""
+    executor = DatabaseExecutor(max_workers=2, max_queue=2, queue_timeout=1.0)
+    try:
+        thread_name = await executor.run(lambda: threading.current_thread().name)
+        assert thread_name.startswith("db")
+        assert executor.stats()["in_flight"] == 0
+    finally:
+        executor.shutdown()
+
+
+def test_shutdown_runs_exit_hook_on_every_worker():
+    """on_thread_exit lets each worker close its thread-local connection"""
+    executor = DatabaseExecutor(max_workers=3, max_queue=0, queue_timeout=1.0)
+    seen = set()
+    lock = threading.Lock()
+
+    def record():
+        with lock:
+            seen.add(threading.current_thread().name)
+
+    asyncio.run(executor.run(lambda: None))
+    executor.shutdown(on_thread_exit=record)
+    assert len(seen) == 3
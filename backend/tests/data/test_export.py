@@ -0,0 +1,63 @@
+"""Tests for the streaming user data export"""
+import io
+import json
+import uuid
+import zipfile
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.data.export import database_batches, export_header, ndjson_stream, zip_stream
+from src.data.peewee_models import Contact, Feedback, Message, create_tables
+
+
+@pytest.fixture
+def user_id():
+    create_tables()
+    user_id = f"export-test-{uuid.uuid4()}"
+    yield user_id
+    Message.delete().where(Message.user_id == user_id).execute()
+    Contact.delete().where(Contact.user_id == user_id).execute()
+    Feedback.delete().where(Feedback.user_id == user_id).execute()
+
+
+def _seed(user_id):
+    base = datetime(2025, 3, 1, 9, 0, 0)
+    contact = Contact.create(name="Sam", context="romantic", user_id=user_id)
+    for index in range(5):
+        Message.create(contact_id=contact.id, contact_name="Sam", type="transform", original=f"msg {index}",
+                       healing_score=7, user_id=user_id, created_at=base + timedelta(minutes=index))
+    Feedback.create(user_id=user_id, rating=5, feature_context="general")
+    return contact
+
+
+async def _collect(stream):
+    return b"".join([chunk async for chunk in stream])
+
+
+@pytest.mark.asyncio
+async def test_ndjson_export_streams_every_row_in_batches(user_id):
+    """Header first, then every contact, message and feedback row across several batches"""
+    contact = _seed(user_id)
+
+    body = await _collect(ndjson_stream(await export_header(user_id), database_batches(user_id, batch_size=2)))
+    records = [json.loads(line) for line in body.decode().splitlines()]
+
+    assert records[0]["type"] == "export"
+    assert records[0]["data"]["user_id"] == user_id
+    assert records[0]["data"]["stats"]["total_messages"] == 5
+    assert [record["type"] for record in records[1:]] == ["contact"] + ["message"] * 5 + ["feedback"]
+    assert records[1]["data"]["id"] == contact.id
+    assert records[1]["data"]["message_count"] == 5
+    assert [record["data"]["original"] for record in records[2:7]] == [f"msg {index}" for index in range(4, -1, -1)]
+
+
+@pytest.mark.asyncio
+async def test_zip_export_has_manifest_and_one_file_per_table(user_id):
+    _seed(user_id)
+
+    body = await _collect(zip_stream(await export_header(user_id), database_batches(user_id, batch_size=2)))
+    with zipfile.ZipFile(io.BytesIO(body)) as archive:
+        assert archive.namelist() == ["manifest.json", "contacts.ndjson", "messages.ndjson", "feedback.ndjson"]
+        assert json.loads(archive.read("manifest.json"))["user_id"] == user_id
+        assert len(archive.read("messages.ndjson").splitlines()) == 5
@@ -0,0 +1,44 @@
+"""Tests for the in-process L1 AI response cache"""
+import time
+
+from src.data.memory_cache import LRUCache
+
+
+def test_lru_evicts_least_recently_used():
+    """Oldest untouched entry is evicted once the cache is full"""
+    cache = LRUCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" is now most recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_entries_expire_after_ttl():
+    """Entries are dropped once their TTL has passed"""
+    cache = LRUCache(max_size=10, ttl_seconds=60)
+    cache.set("short", "value", ttl_seconds=0.01)
+    cache.set("expired", "value", ttl_seconds=-1)
+    time.sleep(0.02)
+
+    assert cache.get("short") is None
+    assert cache.get("expired") is None
+    assert len(cache) == 0
+
+
+def test_invalidate_where():
+    """Predicate invalidation removes only matching entries"""
+    cache = LRUCache(max_size=10, ttl_seconds=60)
+    cache.set(("h1", "contact-1"), {"user_id": "u1"})
+    cache.set(("h2", "contact-2"), {"user_id": "u1"})
+    cache.set(("h3", "contact-3"), {"user_id": "u2"})
+
+    removed = cache.invalidate_where(lambda key, value: value["user_id"] == "u1")
+
+    assert removed == 2
+    assert cache.get(("h3", "contact-3")) == {"user_id": "u2"}
+    assert cache.stats()["size"] == 1
@@ -0,0 +1,58 @@
+"""Tests for the in-memory menu snapshot store"""
+import pytest
+
+from src.data.menu_store import MenuSnapshot, MenuStore
+
+
+def make_item(item_id, code, category, available=True, price=100):
+    return {
+        "id": item_id, "code": code, "name": code, "category": category,
+        "base_price": price, "available": available,
+        "created_at": "2025-01-01T00:00:00", "updated_at": "2025-01-01T00:00:00"
+    }
+
+
+class FakeMenuStore(MenuStore):
+    """MenuStore fed from a list instead of Supabase"""
+
+    def __init__(self, items):
+        super().__init__(refresh_seconds=300, min_refresh_gap=0)
+        self.items = items
+        self.fetches = 0
+
+    def _fetch_items(self):
+        self.fetches += 1
+        return list(self.items)
+
+
+def test_snapshot_indexes():
+    """Items are sorted by code and indexed by id, code and category"""
+    snapshot = MenuSnapshot([
+        make_item("2", "S1", "seafood"),
+        make_item("1", "G1", "grilled"),
+        make_item("3", "G2", "grilled", available=False),
+    ], version=1)
+
+    assert [item["code"] for item in snapshot.items] == ["G1", "G2", "S1"]
+    assert snapshot.by_id["2"]["code"] == "S1"
+    assert snapshot.by_code["G2"]["id"] == "3"
+    assert snapshot.categories == ["grilled", "seafood"]
+    assert [item["code"] for item in snapshot.filter(category="grilled", available=True)] == ["G1"]
+    assert snapshot.filter(category="drinks") == []
+
+
+@pytest.mark.asyncio
+async def test_store_loads_once_and_versions_on_change():
+    """Reads reuse the snapshot; a refresh bumps the version only when the menu changed"""
+    store = FakeMenuStore([make_item("1", "G1", "grilled")])
+
+    first = await store.get()
+    assert await store.get() is first
+    assert store.fetches == 1 and first.version == 1
+
+    assert await store.refresh(force=True) is first
+
+    store.items.append(make_item("2", "G2", "grilled"))
+    updated = await store.refresh(force=True)
+    assert updated.version == 2
+    assert len(updated.by_id) == 2
@@ -0,0 +1,86 @@
+"""Tests for SQL-side message statistics"""
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from src.data.message_stats import MessageStats, contacts_with_rollup
+from src.data.peewee_models import Contact, ContactRollup, Message, create_tables
+from src.data.schemas import MessageType, SentimentType
+
+
+@pytest.fixture
+def user_id():
+    create_tables()
+    user_id = f"stats-test-{uuid.uuid4()}"
+    yield user_id
+    Message.delete().where(Message.user_id == user_id).execute()
+
+
+def _message(user_id, contact_id, message_type, sentiment, score, created_at):
+    Message.create(contact_id=contact_id, contact_name="Sam", type=message_type, original="hi",
+                   sentiment=sentiment, healing_score=score, user_id=user_id, created_at=created_at)
+
+
+def test_aggregate_counts_averages_and_breakdowns(user_id):
+    """Totals, per-type/per-sentiment counts and the score average come from one grouped query"""
+    now = datetime.now()
+    _message(user_id, "c1", "transform", "positive", 8, now - timedelta(hours=1))
+    _message(user_id, "c1", "transform", "positive", 6, now - timedelta(hours=2))
+    _message(user_id, "c1", "interpret", None, None, now)
+    _message(user_id, "c2", "interpret", "negative", 4, now - timedelta(days=40))
+
+    stats = MessageStats.aggregate(user_id, contact_id="c1")
+    assert stats["total_messages"] == 3
+    assert stats["messages_with_scores"] == 2
+    assert stats["avg_healing_score"] == 7.0
+    assert stats["type_breakdown"] == {"transform": 2, "interpret": 1}
+    assert stats["sentiment_breakdown"] == {"positive": 2}
+    assert stats["last_message_date"] == now
+
+    recent = MessageStats.aggregate(user_id, since=now - timedelta(days=30))
+    assert recent["total_messages"] == 3
+    assert MessageStats.aggregate(user_id)["avg_healing_score"] == 6.0
+
+
+def test_in_memory_messages_match_sql_shape():
+    """Demo users' in-memory messages (enum fields) produce the same stats dict"""
+    now = datetime.now()
+    messages = [
+        SimpleNamespace(type=MessageType.TRANSFORM, sentiment=SentimentType.POSITIVE, healing_score=9, created_at=now),
+        SimpleNamespace(type=MessageType.INTERPRET, sentiment=None, healing_score=None, created_at=now - timedelta(days=1)),
+    ]
+    stats = MessageStats.from_messages(messages)
+    assert stats["total_messages"] == 2
+    assert stats["avg_healing_score"] == 9.0
+    assert stats["type_breakdown"] == {"transform": 1, "interpret": 1}
+    assert stats["sentiment_breakdown"] == {"positive": 1}
+    assert stats["last_message_date"] == now
+    assert MessageStats.from_messages([])["total_messages"] == 0
+
+
+def test_rollups_follow_inserts_and_deletes(user_id):
+    """Rollup rows are maintained on write, so all-time stats and contact listings need no scan"""
+    contact = Contact.create(name="Sam", context="friend", user_id=user_id)
+    now = datetime.now()
+    Message.insert_many([
+        {"contact_id": contact.id, "contact_name": "Sam", "type": "transform", "original": "a",
+         "sentiment": "neutral", "healing_score": 5, "user_id": user_id, "created_at": now - timedelta(days=1)},
+        {"contact_id": contact.id, "contact_name": "Sam", "type": "interpret", "original": "b",
+         "sentiment": None, "healing_score": 9, "user_id": user_id, "created_at": now},
+    ]).execute()
+
+    listed = contacts_with_rollup().where(Contact.id == contact.id).get()
+    assert listed.message_count == 2
+    assert listed.last_message_date == now
+
+    Message.delete().where((Message.user_id == user_id) & (Message.original == "b")).execute()
+    stats = MessageStats.aggregate(user_id, contact_id=contact.id)
+    assert stats["total_messages"] == 1
+    assert stats["avg_healing_score"] == 5.0
+    assert stats["last_message_date"] == now - timedelta(days=1)
+
+    Message.delete().where(Message.user_id == user_id).execute()
+    assert ContactRollup.get_or_none(ContactRollup.user_id == user_id) is None
+    contact.delete_instance()
@@ -0,0 +1,46 @@
+"""Tests for the sequenced order event broadcaster"""
+import pytest
+
+from src.data.order_events import OrderEventBroadcaster
+
+
+def test_replay_from_cursor_and_expired_cursor():
+    """Events after a cursor are replayed; a cursor older than the log needs a resync"""
+    events = OrderEventBroadcaster(replay_size=3, subscriber_queue_size=10)
+    for i in range(5):
+        events.publish("order.updated", {"id": str(i)})
+
+    assert [event["seq"] for event in events.replay_since(3)] == [4, 5]
+    assert events.replay_since(5) == []
+    assert [event["seq"] for event in events.replay_since(2)] == [3, 4, 5]
+    assert events.replay_since(1) is None
+
+
+def test_cursor_from_another_process_needs_a_resync():
+    """A cursor ahead of seq (restart) or from another epoch (other worker) is stale, not up to date"""
+    events = OrderEventBroadcaster(replay_size=10, subscriber_queue_size=10)
+    events.publish("order.created", {"id": "a"})
+
+    assert events.replay_since(7) is None
+    assert events.replay_since(0, epoch="elsewhere") is None
+    assert events.replay_since(1, epoch=events.epoch) == []
+    assert events.parse_event_id(events.event_id(1)) == (events.epoch, 1)
+    assert events.parse_event_id("12") == (None, 12)
+    assert events.parse_event_id("nope") is None
+
+
+@pytest.mark.asyncio
+async def test_fan_out_and_slow_subscriber_is_dropped():
+    """Every subscriber gets each event; one that falls behind is cut loose without blocking others"""
+    events = OrderEventBroadcaster(replay_size=10, subscriber_queue_size=2)
+    fast, slow = events.subscribe(), events.subscribe()
+
+    events.publish("order.created", {"id": "a"})
+    assert (await fast.next(timeout=0.1))["data"] == {"id": "a"}
+    events.publish("order.created", {"id": "b"})
+    events.publish("order.created", {"id": "c"})
+
+    assert slow.overflowed
+    assert not fast.overflowed
+    assert [(await fast.next(timeout=0.1))["seq"] for _ in range(2)] == [2, 3]
+    assert events.stats()["subscribers"] == 1
@@ -0,0 +1,39 @@
+"""Tests for the incremental order stats aggregator"""
+from datetime import datetime, timezone
+
+from src.data.order_stats import OrderStatsAggregator
+
+
+def make_order(order_id, total, status="pending", hour=20):
+    created = datetime.now(timezone.utc).replace(hour=hour, minute=15)
+    return {
+        "id": order_id, "status": status, "total": total, "created_at": created.isoformat(),
+        "items": [{"item_id": "unknown", "price": total, "quantity": 1}]
+    }
+
+
+def test_counters_follow_status_changes():
+    """Counts and revenue move with each event; cancelling takes the order back out of revenue"""
+    stats = OrderStatsAggregator()
+    stats.handle({"type": "order.created", "data": make_order("a", 100)})
+    stats.handle({"type": "order.created", "data": make_order("b", 250, hour=21)})
+    stats.handle({"type": "order.updated", "data": {"id": "a", "status": "preparing"}})
+    stats.handle({"type": "order.updated", "data": {"id": "b", "status": "cancelled"}})
+
+    snapshot = stats.snapshot()
+    assert snapshot["by_status"] == {"preparing": 1, "cancelled": 1}
+    assert snapshot["today"] == {"orders": 1, "revenue": 100.0}
+    assert snapshot["hourly"] == {20: {"orders": 1, "revenue": 100.0}}
+    assert snapshot["categories"] == {"other": {"quantity": 1, "revenue": 100.0}}
+
+
+def test_resynced_order_replaces_its_previous_contribution():
+    """Seeing the same order again (e.g. from a resync) never double counts it"""
+    stats = OrderStatsAggregator()
+    stats.add(make_order("a", 100))
+    stats.add(make_order("a", 120, status="ready"))
+    stats.remove("a")
+
+    snapshot = stats.snapshot()
+    assert snapshot["today"] == {"orders": 1, "revenue": 120.0}
+    assert snapshot["by_status"] == {}
@@ -0,0 +1,84 @@
+"""Tests for the in-memory kitchen queue and batched order writes"""
+import asyncio
+import time
+
+import pytest
+
+from src.data.order_store import OrderQueue, OrderService, OrderWriter
+
+
+class FakeWriter(OrderWriter):
+    """OrderWriter that records batches instead of calling Supabase"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.inserted = []
+
+    def _insert(self, rows):
+        self.inserted.append([row["id"] for row in rows])
+
+
+class FakeService(OrderService):
+    def _update_status(self, order_id, status):
+        pass
+
+
+def make_order(order_id, status="pending", created_at="2025-01-01T20:00:00"):
+    return {"id": order_id, "status": status, "created_at": created_at, "customer_name": "Ana"}
+
+
+def test_queue_indexes_by_status_and_trims_finished():
+    """Orders move between buckets; completed ones are capped at recent_limit"""
+    queue = OrderQueue(recent_limit=2)
+    queue.put(make_order("a", created_at="1"))
+    queue.put(make_order("b", "preparing", created_at="2"))
+    assert [o["id"] for o in queue.list()] == ["b", "a"]
+
+    for order_id in ("a", "b", "c"):
+        queue.put(make_order(order_id, "completed"))
+    assert queue.counts()["pending"] == 0
+    assert queue.counts()["completed"] == 2
+    assert queue.get("a") is None
+
+
+def test_reconcile_keeps_local_changes_made_during_the_read():
+    """A resync drops vanished orders but never overwrites a newer local status change"""
+    queue = OrderQueue(recent_limit=10)
+    queue.put(make_order("gone"))
+    started_at = time.monotonic()
+    queue.put(make_order("local", "ready"))
+
+    queue.reconcile_active([make_order("local", "pending"), make_order("new")], started_at)
+
+    assert queue.get("gone") is None
+    assert queue.get("local")["status"] == "ready"
+    assert queue.get("new")["status"] == "pending"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_orders_share_one_insert():
+    """Orders submitted together are group-committed in a single batch"""
+    writer = FakeWriter(batch_size=10, linger=0.01)
+    service = FakeService(writer=writer, queue=OrderQueue(recent_limit=10), resync_seconds=60)
+    writer.start()
+    try:
+        await asyncio.gather(*(service.create_order(make_order(str(i))) for i in range(5)))
+    finally:
+        await writer.stop()
+
+    assert writer.inserted == [["0", "1", "2", "3", "4"]]
+    assert len(service.queue.list()) == 5
+
+
+@pytest.mark.asyncio
+async def test_status_transitions_are_enforced():
+    """Only the kitchen workflow moves are allowed"""
+    service = FakeService(writer=FakeWriter(batch_size=10, linger=0), queue=OrderQueue(recent_limit=10),
+                          resync_seconds=60)
+    await service.create_order(make_order("x"))
+
+    with pytest.raises(ValueError):
+        await service.set_status("x", "completed")
+    assert (await service.set_status("x", "preparing"))["status"] == "preparing"
+    with pytest.raises(KeyError):
+        await service.set_status("missing", "ready")
@@ -0,0 +1,62 @@
+"""Tests for keyset (cursor) pagination"""
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.exceptions import ValidationException
+from src.data.pagination import decode_cursor, encode_cursor, keyset_page, keyset_slice
+from src.data.peewee_models import Feedback, create_tables
+
+
+@pytest.fixture
+def user_id():
+    create_tables()
+    user_id = f"page-test-{uuid.uuid4()}"
+    yield user_id
+    Feedback.delete().where(Feedback.user_id == user_id).execute()
+
+
+def test_pages_walk_every_row_once_including_timestamp_ties(user_id):
+    """Rows sharing a created_at are split across pages by id without gaps or repeats"""
+    base = datetime(2025, 1, 1, 12, 0, 0)
+    ids = []
+    for index in range(7):
+        created_at = base + timedelta(minutes=index // 2)  # Pairs of identical timestamps
+        ids.append(Feedback.create(user_id=user_id, rating=3, feature_context="x", created_at=created_at).id)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        query = Feedback.select().where(Feedback.user_id == user_id)
+        rows, cursor = keyset_page(query, Feedback, limit=3, cursor=cursor)
+        seen.extend(row.id for row in rows)
+        pages += 1
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert sorted(seen) == sorted(ids)
+    assert len(seen) == len(set(seen))
+    created = [Feedback.get_by_id(row_id).created_at for row_id in seen]
+    assert created == sorted(created, reverse=True)
+
+
+def test_in_memory_slice_matches_cursor_format():
+    """Demo rows page the same way and share the cursor encoding"""
+    now = datetime.now()
+    items = [SimpleNamespace(id=str(index), created_at=now - timedelta(seconds=index)) for index in range(5)]
+
+    page, cursor = keyset_slice(items, limit=2)
+    assert [item.id for item in page] == ["0", "1"]
+    assert decode_cursor(cursor) == (items[1].created_at, "1")
+
+    page, cursor = keyset_slice(items, limit=3, cursor=cursor)
+    assert [item.id for item in page] == ["2", "3", "4"]
+    assert cursor is None
+
+
+def test_malformed_cursor_is_rejected():
+    assert decode_cursor(encode_cursor(datetime(2025, 5, 1), "abc")) == (datetime(2025, 5, 1), "abc")
+    with pytest.raises(ValidationException):
+        decode_cursor("not-a-cursor")
@@ -0,0 +1,74 @@
+"""Tests for set-based account erasure"""
+import asyncio
+import uuid
+
+import pytest
+
+from src.data.message_stats import MessageStats
+from src.data.peewee_models import (
+    AIResponseCache, Contact, ContactRollup, Feedback, Message, User, UserRollup, create_tables
+)
+from src.data.user_purge import PurgeJobs, purge_user_data
+
+
+@pytest.fixture
+def user_ids():
+    create_tables()
+    ids = [str(uuid.uuid4()) for _ in range(2)]
+    yield ids
+    for user_id in ids:
+        for model in (Message, AIResponseCache, Contact, Feedback):
+            model.delete().where(model.user_id == user_id).execute()
+        User.delete().where(User.id == user_id).execute()
+
+
+def _seed(user_id, messages=5):
+    User.create(id=user_id, email=f"{user_id}@example.com", hashed_password="x")
+    contact = Contact.create(name="Sam", context="romantic", user_id=user_id)
+    for index in range(messages):
+        Message.create(contact_id=contact.id, contact_name="Sam", type="transform", original=f"msg {index}",
+                       healing_score=6, user_id=user_id)
+    AIResponseCache.create(contact_id=contact.id, message_hash="h", context="romantic", response="r",
+                           model="m", user_id=user_id)
+    Feedback.create(user_id=user_id, rating=4, feature_context="general")
+
+
+def _remaining(user_id):
+    return sum(model.select().where(model.user_id == user_id).count()
+               for model in (Message, AIResponseCache, Contact, Feedback, ContactRollup, UserRollup))
+
+
+@pytest.mark.parametrize("chunk_size", [0, 2])
+def test_purge_deletes_only_that_user_in_one_pass_or_in_chunks(user_ids, chunk_size):
+    """Same result whether the account fits one transaction or is erased two rows at a time"""
+    doomed, kept = user_ids
+    _seed(doomed)
+    _seed(kept, messages=3)
+    reports = []
+
+    deleted = purge_user_data(doomed, chunk_size=chunk_size, progress=lambda done, totals: reports.append(done))
+
+    assert deleted == {"messages": 5, "ai_response_cache": 1, "contacts": 1, "feedback": 1, "users": 1}
+    assert _remaining(doomed) == 0
+    assert User.get_or_none(User.id == doomed) is None
+    assert MessageStats.aggregate(kept)["total_messages"] == 3
+    assert reports[-1] == deleted
+    if chunk_size:
+        assert len(reports) > len(deleted)  # Messages were deleted over several chunks
+
+
+@pytest.mark.asyncio
+async def test_purge_job_reports_progress_until_completed(user_ids):
+    user_id = user_ids[0]
+    _seed(user_id)
+    jobs = PurgeJobs()
+
+    job = jobs.start(user_id)
+    assert jobs.start(user_id) is job  # A second request joins the running erasure
+    while job.active:
+        await asyncio.sleep(0.01)
+
+    status = jobs.get(job.id).to_dict()
+    assert status["status"] == "completed"
+    assert status["progress"] == 100.0
+    assert status["deleted_rows"] == status["total_rows"] == 9
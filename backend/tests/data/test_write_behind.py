@@ -0,0 +1,102 @@
+"""Tests for the batched write-behind insert queue"""
+import sys
+import threading
+import uuid
+
+import pytest
+
+from src.data.peewee_models import Feedback, create_tables
+from src.data.write_behind import WriteBehindQueue
+
+
+@pytest.fixture
+def user_id():
+    create_tables()
+    user_id = f"wb-test-{uuid.uuid4()}"
+    yield user_id
+    Feedback.delete().where(Feedback.user_id == user_id).execute()
+
+
+def test_write_inserts_directly_when_stopped(user_id):
+    """Without a running flusher, write() falls back to a plain insert"""
+    queue = WriteBehindQueue(batch_size=10, flush_interval=60, max_pending=100)
+    feedback = queue.write(Feedback, user_id=user_id, rating=5, feature_context="transform")
+
+    assert Feedback.get_by_id(feedback.id).rating == 5
+    assert queue.stats()["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_rows_are_buffered_then_flushed_in_one_batch(user_id):
+    """Queued rows are invisible until a flush, and drain() writes them all"""
+    queue = WriteBehindQueue(batch_size=100, flush_interval=60, max_pending=100)
+    queue.start()
+    try:
+        rows = [
+            await queue.awrite(Feedback, user_id=user_id, rating=rating, feature_context="interpret")
+            for rating in range(1, 6)
+        ]
+        assert all(row.id for row in rows)
+        assert queue.stats()["pending"] == 5
+        assert Feedback.select().where(Feedback.user_id == user_id).count() == 0
+    finally:
+        await queue.drain()
+
+    assert Feedback.select().where(Feedback.user_id == user_id).count() == 5
+    assert queue.stats()["flushes"] == 1
+    assert not queue.running
+
+
+@pytest.mark.asyncio
+async def test_full_queue_falls_back_to_direct_insert(user_id):
+    """Once max_pending is reached, writes bypass the buffer instead of growing it"""
+    queue = WriteBehindQueue(batch_size=100, flush_interval=60, max_pending=1)
+    queue.start()
+    try:
+        await queue.awrite(Feedback, user_id=user_id, rating=1, feature_context="transform")
+        await queue.awrite(Feedback, user_id=user_id, rating=2, feature_context="transform")
+        assert Feedback.select().where(Feedback.user_id == user_id).count() == 1
+    finally:
+        await queue.drain()
+    assert Feedback.select().where(Feedback.user_id == user_id).count() == 2
+
+
+@pytest.mark.asyncio
+async def test_flush_now_waits_for_a_batch_already_in_flight(user_id, monkeypatch):
+    """A delete after flush_now() must not commit before rows the background flusher has taken"""
+    write_behind_module = sys.modules[WriteBehindQueue.__module__]
+    taken, release = threading.Event(), threading.Event()
+    real_chunked = write_behind_module.chunked
+
+    def paused_chunked(rows, size):
+        taken.set()
+        release.wait(timeout=5)
+        return real_chunked(rows, size)
+
+    queue = WriteBehindQueue(batch_size=100, flush_interval=60, max_pending=100)
+    queue.start()
+    try:
+        await queue.awrite(Feedback, user_id=user_id, rating=3, feature_context="transform")
+        monkeypatch.setattr(write_behind_module, "chunked", paused_chunked)
+
+        background = threading.Thread(target=queue.flush_now)
+        background.start()
+        assert taken.wait(timeout=5)
+
+        def flush_then_delete():
+            queue.flush_now()
+            Feedback.delete().where(Feedback.user_id == user_id).execute()
+
+        deleter = threading.Thread(target=flush_then_delete)
+        deleter.start()
+        deleter.join(timeout=0.2)
+        assert deleter.is_alive()  # Blocked behind the in-flight batch
+
+        release.set()
+        background.join(timeout=5)
+        deleter.join(timeout=5)
+    finally:
+        release.set()
+        await queue.drain()
+
+    assert Feedback.select().where(Feedback.user_id == user_id).count() == 0
@@ -0,0 +1,47 @@
+"""Tests for the diff-based menu seeding plan"""
+from scripts.seed_menu import plan_menu_sync
+
+MENU = [
+    {"code": "G1", "name": "Hungarian", "category": "grilled", "description": "Sausage", "base_price": 95,
+     "options": [{"label": "Plain", "price": 95, "sort_order": 1},
+                 {"label": "With Rice", "price": 120, "sort_order": 2}]},
+    {"code": "S1", "name": "Sinigang", "category": "soup", "description": "Sour soup", "base_price": 360,
+     "options": []},
+]
+
+
+def test_unchanged_menu_needs_no_writes():
+    """Re-seeding an identical menu is a no-op"""
+    items = [
+        {"id": "g1", "code": "G1", "name": "Hungarian", "category": "grilled", "description": "Sausage", "base_price": 95},
+        {"id": "s1", "code": "S1", "name": "Sinigang", "category": "soup", "description": "Sour soup", "base_price": 360},
+    ]
+    options = [
+        {"id": "o1", "menu_item_id": "g1", "label": "Plain", "price": 95, "sort_order": 1},
+        {"id": "o2", "menu_item_id": "g1", "label": "With Rice", "price": 120, "sort_order": 2},
+    ]
+    plan = plan_menu_sync(MENU, items, options)
+    assert all(not rows for rows in plan.values())
+
+
+def test_diff_by_code_and_label():
+    """New, changed and removed items/options each land in the right bulk operation"""
+    items = [
+        {"id": "g1", "code": "G1", "name": "Hungarian", "category": "grilled", "description": "Sausage", "base_price": 90},
+        {"id": "old", "code": "X9", "name": "Retired", "category": "soup", "description": "", "base_price": 1},
+    ]
+    options = [
+        {"id": "o1", "menu_item_id": "g1", "label": "Plain", "price": 95, "sort_order": 1},
+        {"id": "o2", "menu_item_id": "g1", "label": "With Rice", "price": 115, "sort_order": 2},
+        {"id": "o3", "menu_item_id": "g1", "label": "With Fries", "price": 175, "sort_order": 3},
+        {"id": "o4", "menu_item_id": "old", "label": "Large", "price": 2, "sort_order": 1},
+    ]
+    plan = plan_menu_sync(MENU, items, options)
+
+    assert [item["code"] for item in plan["insert_items"]] == ["S1"]
+    assert plan["update_items"] == [{"id": "g1", "code": "G1", "name": "Hungarian", "category": "grilled",
+                                     "description": "Sausage", "base_price": 95}]
+    assert [(o["id"], o["price"]) for o in plan["update_options"]] == [("o2", 120)]
+    assert plan["insert_options"] == []
+    assert sorted(plan["delete_options"]) == ["o3", "o4"]
+    assert plan["delete_items"] == ["old"]